@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Measure server-side rendering time of post cards.
+
+Renders a batch of posts the way the review page does, three ways:
+
+    uncached     builds and serializes every card's component tree
+    cached       the same cards served from the fragment cache
+    badges only  the out-of-band status badges returned when posts are approved
+
+Usage:
+    python benchmarks/bench_card_render.py --posts 500 --rounds 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    from fasthtml.common import to_xml
+    from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+    from src.app import _build_post_card, render_status_badges
+    from src.utils.fragment_cache import FragmentCache
+
+    platforms = list(SocialPlatform)
+    posts = [
+        GeneratedPost(
+            platforms[i % len(platforms)],
+            f"Post {i}: the city tenders new public infrastructure https://example.com/{i} Bids close soon. #tenders",
+            PostStatus.PENDING_APPROVAL,
+            metadata={"subreddit": "python"} if i % 3 == 2 else {},
+            id=f"post-{i}",
+            style="professional",
+        )
+        for i in range(args.posts)
+    ]
+    cache = FragmentCache(max_entries=args.posts * 2)
+
+    def uncached():
+        return "".join(to_xml(_build_post_card(post)) for post in posts)
+
+    def cached():
+        return "".join(str(cache.render(post, "card", _build_post_card)) for post in posts)
+
+    def badges():
+        return "".join(to_xml(render_status_badges(post, oob=True)) for post in posts)
+
+    cached()
+    print(f"{args.posts} posts, {args.rounds} rounds")
+    for name, render in (("uncached", uncached), ("cached", cached), ("badges only", badges)):
+        started = time.perf_counter()
+        for _ in range(args.rounds):
+            render()
+        elapsed = (time.perf_counter() - started) / args.rounds
+        print(f"{name:<12} {elapsed * 1000:8.2f} ms/batch  {elapsed / args.posts * 1e6:8.1f} µs/post")
+
+
+if __name__ == "__main__":
+    main()
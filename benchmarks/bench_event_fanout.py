@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Measure fan-out of live post events to connected clients.
+
+Each client is a task reading its subscription like the /events stream
+does. Post events are published to the post event bus, rendered once by the
+app's listener and delivered to every client. Reports the time spent in
+publish (rendering plus queueing, on the publisher's side) and the time
+until the last client has received each event.
+
+Usage:
+    python benchmarks/bench_event_fanout.py --clients 500 --events 200
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def run(clients: int, events: int):
+    from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+    from src.app import live_updates
+    from src.utils.events import PostEvent, post_events
+    from src.utils.metrics import percentile
+
+    received = [0] * events
+    delivered = [0.0] * events
+    published = [0.0] * events
+
+    async def client():
+        subscription = live_updates.subscribe()
+        try:
+            for _ in range(events):
+                message = await subscription.get()
+                index = int(message.split("post-", 1)[1].split(" ", 1)[0])
+                received[index] += 1
+                if received[index] == clients:
+                    delivered[index] = time.perf_counter() - published[index]
+        finally:
+            subscription.close()
+
+    tasks = [asyncio.create_task(client()) for _ in range(clients)]
+    await asyncio.sleep(0)
+
+    publish_times = []
+    for i in range(events):
+        post = GeneratedPost(SocialPlatform.TWITTER, f"Post {i}", PostStatus.APPROVED, id=f"p{i}")
+        published[i] = time.perf_counter()
+        post_events.publish(PostEvent(f"post-{i} approved", post.id, post))
+        publish_times.append(time.perf_counter() - published[i])
+        # Let clients drain between events, as with events spread over time
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+
+    print(f"{clients} clients, {events} events")
+    print(f"publish          p50 {percentile(publish_times, 0.5) * 1000:7.3f} ms  "
+          f"p99 {percentile(publish_times, 0.99) * 1000:7.3f} ms")
+    print(f"all delivered    p50 {percentile(delivered, 0.5) * 1000:7.3f} ms  "
+          f"p99 {percentile(delivered, 0.99) * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.events))
+
+
+if __name__ == "__main__":
+    main()
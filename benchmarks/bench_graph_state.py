@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Measure the cost of graph state updates on large documents.
+
+Runs the generate post graph with a fake scraper and generator on articles
+of increasing size, with and without a checkpointer, in two modes:
+
+    full     nodes return the whole state, as they did before reducers
+             (every channel, including the article, is rewritten each step)
+    partial  nodes return partial updates merged by the state reducers
+
+With checkpointing, the bytes serialized per run show how often the
+article is written. The state only holds the article's content hash
+(the article is written once to a temporary content store), so what is
+left is the condensed content and the posts.
+
+Usage:
+    python benchmarks/bench_graph_state.py --sizes-kb 100,1000,5000 --runs 20
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, TypedDict
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FullState(TypedDict):
+    """The graph state without reducers."""
+    input: dict
+    content_hash: str
+    duplicate_of: Optional[dict]
+    posts: list
+    errors: list
+    human_feedback: str
+    is_approved: bool
+
+
+def full_state_node(node):
+    """Wrap a node so it mutates and returns the whole state."""
+    async def run(state):
+        update = await node(state)
+        state["errors"] = state["errors"] + update.pop("errors", [])
+        state.update(update)
+        return state
+    return run
+
+
+def build_graph(mode: str, checkpointer):
+    from langgraph.graph import StateGraph, START, END
+    from src.agents import generate_post_graph as g
+
+    if mode == "partial":
+        return g.create_generate_post_graph(checkpointer=checkpointer)
+
+    graph = StateGraph(FullState)
+    graph.add_node("scrape_content", full_state_node(g.scrape_content_node))
+    graph.add_node("generate_posts", full_state_node(g.generate_posts_node))
+    graph.add_node("human_approval", full_state_node(g.human_approval_node))
+    graph.add_edge(START, "scrape_content")
+    graph.add_edge("scrape_content", "generate_posts")
+    graph.add_edge("generate_posts", "human_approval")
+    graph.add_edge("human_approval", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+async def run_mode(mode: str, article: str, runs: int, checkpointing: bool) -> dict:
+    from langgraph.checkpoint.memory import InMemorySaver
+    from src.agents.generate_post_graph import graph_config
+    from src.utils.content_store import ContentStore
+    from src.utils.serialization import StateSerializer
+
+    serializer = StateSerializer(compression="none")
+    written = [0]
+    dumps_typed = serializer.dumps_typed
+
+    def counting_dumps_typed(obj):
+        typed = dumps_typed(obj)
+        written[0] += len(typed[1])
+        return typed
+
+    serializer.dumps_typed = counting_dumps_typed
+    graph = build_graph(mode, InMemorySaver(serde=serializer) if checkpointing else None)
+
+    async def scrape(url):
+        # A distinct document per run, so no outputs are reused
+        return {"content": f"{url}\n\n{article}", "content_hash": None}
+
+    async def variants(platform, content, styles):
+        return {style: f"{platform} post in a {style} style" for style in styles}
+
+    async def summarize(content, max_length=500):
+        return content[:max_length]
+
+    async def key_points(content):
+        return ["First point", "Second point"]
+
+    async def no_duplicate(url, content, content_hash):
+        return None
+
+    store = tempfile.TemporaryDirectory()
+    started = time.perf_counter()
+    with store, patch("src.agents.generate_post_graph.content_store", ContentStore(store.name)), \
+            patch("src.agents.generate_post_graph.scraper.scrape_url", scrape), \
+            patch("src.agents.generate_post_graph.find_near_duplicate", no_duplicate), \
+            patch("src.agents.generate_post_graph.condense_content", lambda content: content[:20000]), \
+            patch("src.agents.generate_post_graph.content_generator.generate_variants", variants), \
+            patch("src.agents.generate_post_graph.content_generator.summarize_content", summarize), \
+            patch("src.agents.generate_post_graph.content_generator.extract_key_points", key_points):
+        for i in range(runs):
+            await graph.ainvoke({
+                "input": {"url": f"https://example.com/{i}", "platforms": ["twitter", "linkedin"],
+                          "styles": ["professional", "casual"]},
+                "posts": [],
+                "errors": [],
+                "human_feedback": None,
+                "is_approved": False
+            }, config=graph_config())
+    elapsed = time.perf_counter() - started
+    return {"ms_per_run": elapsed / runs * 1000, "kb_written_per_run": written[0] / runs / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-kb", default="100,1000,5000")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    for size_kb in [int(size) for size in args.sizes_kb.split(",")]:
+        article = ("The tender covers design, construction and maintenance of public infrastructure. "
+                   * (size_kb * 1024 // 84 + 1))[:size_kb * 1024]
+        print(f"\n{size_kb} KB article, {args.runs} runs")
+        for checkpointing in (False, True):
+            for mode in ("full", "partial"):
+                row = asyncio.run(run_mode(mode, article, args.runs, checkpointing))
+                label = f"{mode} ({'checkpointed' if checkpointing else 'no checkpointer'})"
+                written = f"  {row['kb_written_per_run']:10.1f} KB serialized/run" if checkpointing else ""
+                print(f"{label:<28} {row['ms_per_run']:8.2f} ms/run{written}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Measure the memory of holding many posts, and post store serialization speed.
+
+Each mode runs in its own process and builds the same posts (distinct ids
+and contents) in a different representation:
+
+Modes:
+    dict       plain dicts with string statuses, as the web app stored posts before
+    dataclass  the previous GeneratedPost: a regular dataclass with a per-instance
+               __dict__, an empty media list and style/ids kept in metadata
+    slotted    the current slotted GeneratedPost record
+
+The store benchmark writes posts to an in-memory PostStore and reads them
+back as GeneratedPost records.
+
+Usage:
+    python benchmarks/bench_post_memory.py --posts 1000000 --store-posts 100000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MODES = ("dict", "dataclass", "slotted")
+STYLES = ("professional", "casual", "technical")
+
+
+@dataclass
+class LegacyPost:
+    """GeneratedPost before it was slotted."""
+    platform: Any
+    content: str
+    status: Any
+    scheduled_time: Optional[str] = None
+    media_urls: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def make_posts(mode: str, count: int) -> list:
+    """Build ``count`` posts in the representation of a mode."""
+    from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+
+    posts = []
+    for i in range(count):
+        post_id = str(uuid.uuid4())
+        content = f"Post {i}: the city approves new protected bike lanes downtown. #cycling"
+        style = STYLES[i % 3]
+        if mode == "dict":
+            posts.append({
+                "id": post_id, "platform": "twitter", "style": style, "content": content,
+                "status": "Pending Review", "source_url": "https://example.com/article",
+                "created_at": time.time(), "updated_at": time.time(),
+            })
+        elif mode == "dataclass":
+            posts.append(LegacyPost(
+                SocialPlatform.TWITTER, content, PostStatus.PENDING_APPROVAL,
+                metadata={"style": style, "store_id": post_id}
+            ))
+        else:
+            posts.append(GeneratedPost(
+                SocialPlatform.TWITTER, content, PostStatus.PENDING_APPROVAL, id=post_id, style=style,
+                source_url="https://example.com/article", created_at=time.time(), updated_at=time.time()
+            ))
+    return posts
+
+
+def run_mode(mode: str, count: int) -> dict:
+    make_posts(mode, 10)  # warm up imports
+    tracemalloc.start()
+    posts = make_posts(mode, count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    content = sum(sys.getsizeof(post["content"] if mode == "dict" else post.content) for post in posts)
+    return {
+        "mode": mode,
+        "total_mb": round(current / 1024 / 1024, 1),
+        "bytes_per_post": round(current / count),
+        "overhead_per_post": round((current - content) / count),
+    }
+
+
+def run_store(count: int) -> dict:
+    from src.utils.post_store import PostStore
+
+    store = PostStore(":memory:")
+    posts = make_posts("slotted", count)
+    for post in posts:
+        post.id = None
+    started = time.perf_counter()
+    for post in posts:
+        store.add(post)
+    written = time.perf_counter() - started
+
+    started = time.perf_counter()
+    loaded = store.list()
+    read = time.perf_counter() - started
+    assert len(loaded) == count
+    store.close()
+    return {
+        "write_us_per_post": round(written / count * 1e6, 1),
+        "read_us_per_post": round(read / count * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--store-posts", type=int, default=100_000)
+    parser.add_argument("--mode", choices=MODES + ("store",), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode == "store":
+        print(json.dumps(run_store(args.store_posts)))
+        return
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.posts)))
+        return
+
+    print(f"Memory of {args.posts:,} posts")
+    for mode in MODES + ("store",):
+        child = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--posts", str(args.posts),
+             "--store-posts", str(args.store_posts)],
+            capture_output=True, text=True
+        )
+        if child.returncode != 0:
+            print(f"{mode:<10} failed:\n{child.stderr}")
+            continue
+        row = json.loads(child.stdout.strip().splitlines()[-1])
+        if mode == "store":
+            print(
+                f"\nPostStore round trip of {args.store_posts:,} posts: "
+                f"write {row['write_us_per_post']} µs/post, read {row['read_us_per_post']} µs/post"
+            )
+        else:
+            print(
+                f"{row['mode']:<10} total {row['total_mb']:8.1f} MB  "
+                f"{row['bytes_per_post']:5d} B/post  "
+                f"{row['overhead_per_post']:5d} B/post excluding content"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measure review-queue paging and counting on a large post store.
+
+Fills a temporary store with posts across platforms and statuses, then
+compares, for a page deep into the review queue:
+
+    offset   LIMIT/OFFSET paging, which walks every skipped row
+    keyset   PostStore.page with the cursor of the previous page
+
+and counting the review queue with COUNT(*) against PostStore.count, which
+reads the trigger-maintained count table.
+
+Usage:
+    python benchmarks/bench_queue.py --posts 200000 --page-size 25
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def timed(fn, repeat: int = 20) -> float:
+    """Return the mean time of a call in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=25)
+    args = parser.parse_args()
+
+    from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+    from src.utils.post_store import PostStore, _COLUMNS
+
+    platforms = list(SocialPlatform)
+    statuses = [PostStatus.PENDING_APPROVAL, PostStatus.APPROVED, PostStatus.PUBLISHED, PostStatus.EDITED]
+    review = (PostStatus.PENDING_APPROVAL.value, PostStatus.EDITED.value)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = PostStore(str(Path(directory) / "posts.sqlite3"))
+        started = time.perf_counter()
+        with store._lock:
+            store._db.executemany(
+                "INSERT INTO posts (id, platform, style, content, status, source_url, metadata, media_urls, "
+                "scheduled_time, version, created_at, updated_at, published_at, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    PostStore._to_row(GeneratedPost(
+                        platforms[i % len(platforms)], f"Post {i} about public infrastructure tenders. #tenders",
+                        statuses[i % len(statuses)], id=f"post-{i}", style="professional",
+                        source_url=f"https://example.com/{i // 9}", created_at=1.0, updated_at=1.0
+                    ))
+                    for i in range(args.posts)
+                )
+            )
+            store._db.commit()
+        print(f"{args.posts:,d} posts inserted in {time.perf_counter() - started:.1f} s")
+
+        review_total = store.count(status=review)
+        depth = review_total // 2
+        cursor = store.page(status=review, limit=depth)[1]
+
+        def offset_page():
+            with store._lock:
+                return store._db.execute(
+                    f"SELECT {_COLUMNS} FROM posts WHERE status IN (?, ?) ORDER BY seq LIMIT ? OFFSET ?",
+                    (*review, args.page_size, depth)
+                ).fetchall()
+
+        def keyset_page():
+            return store.page(status=review, after=cursor, limit=args.page_size)
+
+        def scan_count():
+            with store._lock:
+                return store._db.execute(
+                    "SELECT COUNT(*) FROM posts WHERE status IN (?, ?)", review
+                ).fetchone()[0]
+
+        assert [row[6] for row in offset_page()] == [post.id for post in keyset_page()[0]]
+        assert scan_count() == store.count(status=review)
+
+        print(f"Page of {args.page_size} at depth {depth:,d} of {review_total:,d} posts in review")
+        print(f"offset paging   {timed(offset_page):8.3f} ms")
+        print(f"keyset paging   {timed(keyset_page):8.3f} ms")
+        print(f"COUNT(*)        {timed(scan_count):8.3f} ms")
+        print(f"count table     {timed(lambda: store.count(status=review)):8.3f} ms")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
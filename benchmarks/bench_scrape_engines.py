@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scrape engines against fixture pages served by a local HTTP server.
+
+Measures end-to-end latency and throughput of the local engine (pooled httpx
+fetch plus local extraction), the extraction cost on its own, and optionally
+FireCrawl on a public URL for comparison.
+
+Usage:
+    python benchmarks/bench_scrape_engines.py --requests 200 --concurrency 20
+    python benchmarks/bench_scrape_engines.py --firecrawl-url https://example.com/article
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils.html_extract import extract_article
+from src.utils.metrics import percentile
+from src.utils.scrape_engines import FirecrawlEngine, LocalEngine
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / "src" / "tests" / "fixtures" / "pages"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without request logging."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    """Threaded server with a listen backlog large enough for the benchmark."""
+
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def start_server():
+    """Serve the fixture pages on a free local port."""
+    handler = functools.partial(QuietHandler, directory=str(PAGES_DIR))
+    server = Server(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def report(name, latencies, elapsed):
+    """Print latency percentiles and throughput."""
+    print(
+        f"{name:<22} n={len(latencies):<5} "
+        f"p50={percentile(latencies, 0.5) * 1000:8.2f}ms "
+        f"p95={percentile(latencies, 0.95) * 1000:8.2f}ms "
+        f"p99={percentile(latencies, 0.99) * 1000:8.2f}ms "
+        f"throughput={len(latencies) / elapsed:8.1f}/s"
+    )
+
+
+async def bench_engine(engine, urls, requests, concurrency):
+    """Scrape URLs round-robin with bounded concurrency."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(index):
+        async with semaphore:
+            started = time.perf_counter()
+            await engine.scrape(urls[index % len(urls)])
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    return latencies, time.perf_counter() - started
+
+
+def bench_extraction(iterations):
+    """Time extraction alone on every fixture page."""
+    pages = [path.read_text() for path in sorted(PAGES_DIR.glob("*.html"))]
+    latencies = []
+    started = time.perf_counter()
+    for index in range(iterations):
+        begin = time.perf_counter()
+        extract_article(pages[index % len(pages)])
+        latencies.append(time.perf_counter() - begin)
+    return latencies, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--firecrawl-url", help="Public URL to scrape with FireCrawl for comparison")
+    args = parser.parse_args()
+
+    server = start_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/{path.name}" for path in sorted(PAGES_DIR.glob("*.html"))]
+
+    try:
+        report("extract only", *bench_extraction(args.requests))
+
+        engine = LocalEngine()
+        await engine.scrape(urls[0])  # warm the connection pool
+        report("local engine", *await bench_engine(engine, urls, args.requests, args.concurrency))
+        await engine.aclose()
+
+        if args.firecrawl_url:
+            if not os.environ.get("FIRECRAWL_API_KEY"):
+                print("FIRECRAWL_API_KEY is not set; skipping FireCrawl")
+            else:
+                requests = min(args.requests, 20)
+                latencies, elapsed = await bench_engine(
+                    FirecrawlEngine(), [args.firecrawl_url], requests, min(args.concurrency, 5)
+                )
+                report("firecrawl engine", latencies, elapsed)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
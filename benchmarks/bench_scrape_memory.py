@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Measure peak memory of concurrent local scrapes with different scrape options.
+
+Each mode runs in its own process (peak RSS is a per-process high-water mark)
+and scrapes a large generated page concurrently, keeping every result alive
+as in-flight requests and the scrape cache would.
+
+Modes:
+    legacy   markdown + raw HTML kept, no effective size cap (previous behaviour)
+    lean     markdown only, default size cap
+    capped   markdown only, 256 KB size cap
+
+Usage:
+    python benchmarks/bench_scrape_memory.py --concurrency 20 --page-kb 1000
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import tracemalloc
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MODES = ("legacy", "lean", "capped")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without request logging."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Server(ThreadingHTTPServer):
+    """Threaded server with a listen backlog large enough for the benchmark."""
+
+    request_queue_size = 256
+    daemon_threads = True
+
+
+def write_page(directory: Path, size_kb: int) -> Path:
+    """Write an article-like page of roughly ``size_kb`` kilobytes."""
+    paragraph = (
+        '<div class="content-block"><p class="para" data-track="view">The tender covers design, '
+        'construction and maintenance of <a href="/x">public infrastructure</a>, with detailed '
+        'requirements, evaluation criteria, and timelines for all bidders.</p></div>\n'
+    )
+    nav = '<nav>' + "".join(f'<a href="/n/{i}">Section {i}</a>' for i in range(50)) + '</nav>'
+    body = paragraph * (size_kb * 1024 // len(paragraph))
+    html = f"<html><head><title>Large page</title></head><body>{nav}<article>{body}</article></body></html>"
+    path = directory / "large.html"
+    path.write_text(html)
+    return path
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_mode(mode: str, url: str, concurrency: int) -> dict:
+    from src.utils.scrape_engines import LocalEngine, ScrapeOptions
+
+    options = {
+        "legacy": ScrapeOptions(formats=("markdown", "html"), max_document_bytes=1 << 40),
+        "lean": ScrapeOptions(formats=("markdown",)),
+        "capped": ScrapeOptions(formats=("markdown",), max_document_bytes=256 * 1024),
+    }[mode]
+
+    engine = LocalEngine()
+    await engine.scrape(url, options=options)  # warm up imports and the pool
+    baseline = peak_rss_mb()
+
+    tracemalloc.start()
+    results = await asyncio.gather(*[engine.scrape(url, options=options) for _ in range(concurrency)])
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await engine.aclose()
+
+    retained = sum(len(r["content"]) + len(r.get("html", "")) for r in results)
+    return {
+        "mode": mode,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - baseline, 1),
+        "traced_peak_mb": round(traced_peak / 1024 / 1024, 1),
+        "retained_chars_mb": round(retained / 1024 / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--page-kb", type=int, default=1000)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(asyncio.run(run_mode(args.mode, args.url, args.concurrency))))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_page(Path(directory), args.page_kb)
+        server = Server(("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/large.html"
+
+        print(f"{args.concurrency} concurrent scrapes of a {args.page_kb} KB page")
+        try:
+            for mode in MODES:
+                child = subprocess.run(
+                    [sys.executable, __file__, "--mode", mode, "--url", url,
+                     "--concurrency", str(args.concurrency)],
+                    capture_output=True, text=True
+                )
+                if child.returncode != 0:
+                    print(f"{mode:<8} failed:\n{child.stderr}")
+                    continue
+                row = json.loads(child.stdout.strip().splitlines()[-1])
+                print(
+                    f"{row['mode']:<8} peak RSS {row['peak_rss_mb']:7.1f} MB  "
+                    f"growth {row['rss_growth_mb']:7.1f} MB  "
+                    f"traced peak {row['traced_peak_mb']:7.1f} MB  "
+                    f"retained {row['retained_chars_mb']:6.1f} MB"
+                )
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compare size and encode/decode time of graph state serializers.
+
+The state holds a generated article of the given size and a set of posts,
+like a graph run after generation. Formats:
+
+    json          json.dumps with posts as dicts (decoding does not restore posts or enums)
+    pickle        pickle, highest protocol
+    msgpack       StateSerializer without compression
+    msgpack+zstd  StateSerializer with zstd compression of the article
+
+Usage:
+    python benchmarks/bench_serialization.py --article-kb 50 --posts 9
+"""
+
+import argparse
+import dataclasses
+import json
+import pickle
+import sys
+import timeit
+from enum import Enum
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_state(article_kb: int, post_count: int) -> dict:
+    """Build a graph state with an article and generated posts."""
+    from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+
+    sentences = [
+        f"Section {i}: the tender covers design, construction and maintenance of public "
+        f"infrastructure, with evaluation criteria and timelines for lot {i % 7}. "
+        for i in range(article_kb * 1024 // 150 + 1)
+    ]
+    article = "".join(sentences)[:article_kb * 1024]
+    platforms = list(SocialPlatform)
+    posts = [
+        GeneratedPost(
+            platforms[i % len(platforms)],
+            f"Post {i}: the city tenders new public infrastructure. Bids close next month. #tenders",
+            PostStatus.PENDING_APPROVAL,
+            metadata={"reused": i % 2 == 0},
+            style=("professional", "casual", "technical")[i % 3],
+            source_url="https://example.com/article",
+        )
+        for i in range(post_count)
+    ]
+    return {
+        "input": {"url": "https://example.com/article", "platforms": platforms, "styles": ["professional"]},
+        "content": article,
+        "content_hash": "0" * 64,
+        "duplicate_of": None,
+        "posts": posts,
+        "errors": [],
+        "human_feedback": None,
+        "is_approved": False,
+    }
+
+
+def _json_default(obj):
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(type(obj).__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--article-kb", type=int, default=50)
+    parser.add_argument("--posts", type=int, default=9)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    from src.utils.serialization import StateSerializer
+
+    state = make_state(args.article_kb, args.posts)
+    plain = StateSerializer(compression="none")
+    zstd = StateSerializer(compression="zstd")
+    formats = {
+        "json": (lambda s: json.dumps(s, default=_json_default).encode(), json.loads),
+        "pickle": (lambda s: pickle.dumps(s, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+        "msgpack": (plain.dumps, plain.loads),
+        "msgpack+zstd": (zstd.dumps, zstd.loads),
+    }
+
+    print(f"State with a {args.article_kb} KB article and {args.posts} posts")
+    for name, (dumps, loads) in formats.items():
+        data = dumps(state)
+        encode = timeit.timeit(lambda: dumps(state), number=args.number) / args.number
+        decode = timeit.timeit(lambda: loads(data), number=args.number) / args.number
+        print(
+            f"{name:<13} {len(data):8,d} bytes  "
+            f"encode {encode * 1e6:8.1f} µs  decode {decode * 1e6:8.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
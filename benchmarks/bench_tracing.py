@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Measure the overhead of tracing instrumentation.
+
+Times an empty async function called directly, through ``traced`` and
+inside ``tracer.span``, with tracing disabled and enabled (in-memory
+buffer only).
+
+Usage:
+    python benchmarks/bench_tracing.py --calls 200000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+async def run(calls: int, enabled: bool):
+    from src.utils import tracing
+
+    tracer = tracing.Tracer(enabled=enabled, buffer_size=10000)
+
+    async def work():
+        return None
+
+    traced_work = tracing.traced("work")(work)
+
+    async def with_span():
+        with tracer.span("work", index=1):
+            return await work()
+
+    results = {}
+    with patch.object(tracing, "tracer", tracer):
+        for name, fn in (("direct", work), ("traced", traced_work), ("span", with_span)):
+            started = time.perf_counter()
+            for _ in range(calls):
+                await fn()
+            results[name] = (time.perf_counter() - started) / calls * 1e9
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    for enabled in (False, True):
+        results = asyncio.run(run(args.calls, enabled))
+        label = "enabled " if enabled else "disabled"
+        print(f"tracing {label}  " + "  ".join(f"{name} {ns:7.0f} ns/call" for name, ns in results.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Local stand-ins for the FireCrawl and Anthropic APIs, used by the load test.
+
+Both are threaded HTTP servers with configurable latency. The FireCrawl
+stand-in answers ``POST /v2/scrape`` with a generated article that is
+deterministic per URL (so distinct URLs are not near duplicates). The
+Anthropic stand-in answers ``POST /v1/messages``, either as one JSON message
+or, with ``"stream": true``, as server-sent events paced at a fixed token
+rate; both report usage, including prompt-cache reads and writes.
+"""
+
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    "agent analysis api architecture benchmark browser cache cloud cluster compiler "
+    "container data database deploy design developer distributed edge engine event "
+    "feature framework graph index inference kernel latency library model memory "
+    "metric network open pipeline platform protocol query queue release runtime "
+    "scale schema search security server service storage stream system team test "
+    "throughput tool traffic update user version workflow workload"
+).split()
+
+
+class FakeServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog large enough for load tests."""
+
+    request_queue_size = 1024
+    daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "FakeServer":
+        """Serve requests on a background thread."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    """Request handler with JSON helpers and without request logging."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, body: dict, status: int = 200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def fake_article(url: str, size_bytes: int) -> str:
+    """Generate article markdown of about ``size_bytes``, the same for the same URL."""
+    rng = random.Random(url)
+    paragraphs = [f"# Notes on {' '.join(rng.sample(WORDS, 3))}"]
+    size = len(paragraphs[0])
+    while size < size_bytes:
+        paragraph = " ".join(rng.choice(WORDS) for _ in range(60)).capitalize() + "."
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)
+
+
+class _FirecrawlHandler(_JsonHandler):
+    def do_POST(self):
+        if self.path != "/v2/scrape":
+            return self.send_json({"success": False, "error": "Not found"}, 404)
+        url = self.read_json().get("url", "")
+        time.sleep(self.server.latency)
+        markdown = fake_article(url, self.server.article_bytes)
+        self.send_json({
+            "success": True,
+            "data": {
+                "markdown": markdown,
+                "metadata": {
+                    "title": markdown.split("\n", 1)[0].lstrip("# "),
+                    "description": "Generated article for load testing",
+                    "sourceURL": url,
+                    "statusCode": 200,
+                },
+            },
+        })
+
+
+def fake_firecrawl(latency: float = 0.3, article_bytes: int = 20_000) -> FakeServer:
+    """
+    Create a FireCrawl stand-in.
+
+    Args:
+        latency: Seconds each scrape takes
+        article_bytes: Approximate size of the returned markdown
+    """
+    server = FakeServer(("127.0.0.1", 0), _FirecrawlHandler)
+    server.latency = latency
+    server.article_bytes = article_bytes
+    return server
+
+
+class _AnthropicHandler(_JsonHandler):
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/messages":
+            return self.send_json({"type": "error", "error": {"type": "not_found_error", "message": "Not found"}}, 404)
+        request = self.read_json()
+        server = self.server
+
+        cached = uncached = 0
+        system = request.get("system") or []
+        blocks = system if isinstance(system, list) else [{"type": "text", "text": system}]
+        for block in blocks:
+            tokens = len(block.get("text", "")) // 4
+            if "cache_control" in block:
+                cached += tokens
+            else:
+                uncached += tokens
+        for message in request.get("messages", []):
+            content = message.get("content")
+            uncached += len(content if isinstance(content, str) else json.dumps(content)) // 4
+
+        words = [random.choice(WORDS) for _ in range(min(server.output_tokens, request.get("max_tokens", 1024)))]
+        usage = {
+            "input_tokens": uncached,
+            "cache_read_input_tokens": cached,
+            "cache_creation_input_tokens": 0,
+            "output_tokens": len(words),
+        }
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "fake"),
+            "content": [],
+            "stop_reason": None,
+            "stop_sequence": None,
+            "usage": usage,
+        }
+
+        time.sleep(server.time_to_first_token)
+        if not request.get("stream"):
+            time.sleep(len(words) / server.tokens_per_second)
+            message["content"] = [{"type": "text", "text": " ".join(words)}]
+            message["stop_reason"] = "end_turn"
+            return self.send_json(message)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        self._event("message_start", {"type": "message_start", "message": {**message, "usage": {**usage, "output_tokens": 1}}})
+        self._event("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+        for index, word in enumerate(words):
+            self._event("content_block_delta", {
+                "type": "content_block_delta",
+                "index": 0,
+                "delta": {"type": "text_delta", "text": word if index == 0 else f" {word}"},
+            })
+            time.sleep(1 / server.tokens_per_second)
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": len(words)},
+        })
+        self._event("message_stop", {"type": "message_stop"})
+
+    def _event(self, name: str, data: dict):
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+        self.wfile.flush()
+
+
+def fake_anthropic(
+    time_to_first_token: float = 0.3,
+    tokens_per_second: float = 200.0,
+    output_tokens: int = 60
+) -> FakeServer:
+    """
+    Create an Anthropic Messages API stand-in.
+
+    Args:
+        time_to_first_token: Seconds before the first token
+        tokens_per_second: Output rate after the first token
+        output_tokens: Words returned per message (capped at the request's max_tokens)
+    """
+    server = FakeServer(("127.0.0.1", 0), _AnthropicHandler)
+    server.time_to_first_token = time_to_first_token
+    server.tokens_per_second = tokens_per_second
+    server.output_tokens = output_tokens
+    return server
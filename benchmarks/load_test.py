@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Load test the FastHTML routes against local stand-ins for every upstream.
+
+Boots ``src.app`` under uvicorn in a subprocess, with FireCrawl and Anthropic
+replaced by the local servers in ``fake_upstreams`` and Arcade by
+``ArcadeMockClient``. Virtual users then drive a weighted mix of
+generate, batch (one URL for every platform and style), edit, approve and
+approve-all requests through stages of increasing concurrency.
+
+For each stage the test reports throughput, latency percentiles (overall and
+per operation) and the error rate. A request fails on a transport error, an
+HTTP error status or an error fragment in the response. The saturation
+point is the first stage where added concurrency no longer raises
+throughput, or where too many requests fail.
+
+Results are written as JSON (``benchmarks/results/`` by default), and
+``--compare`` checks a run against an earlier result file. It exits with
+status 1 if any stage regressed.
+
+The LLM rate limits are raised by default, so the test measures the app
+rather than the limiter. Use ``--env`` to override any app setting.
+
+Usage:
+    python benchmarks/load_test.py --stages 1,2,4,8,16,32 --stage-seconds 20
+    python benchmarks/load_test.py --mix generate=1,edit=4,approve=4 --llm-ttft-ms 800
+    python benchmarks/load_test.py --compare benchmarks/results/baseline.json
+    python benchmarks/load_test.py --env LLM_REQUESTS_PER_MINUTE=50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict, deque
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from fake_upstreams import fake_anthropic, fake_firecrawl
+from src.utils.metrics import percentile
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+POST_ID = re.compile(r'id="post-([^"]+)"')
+ERROR_FRAGMENT = 'class="error"'
+OPERATIONS = ("generate", "batch", "edit", "approve", "approve_all")
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def app_environment(args, firecrawl_url: str, anthropic_url: str, workdir: Path) -> dict:
+    """Build the environment of the app process."""
+    env = {
+        **os.environ,
+        "ANTHROPIC_API_KEY": "load-test",
+        "ANTHROPIC_BASE_URL": anthropic_url,
+        "FIRECRAWL_API_KEY": "fc-load-test",
+        "FIRECRAWL_API_URL": firecrawl_url,
+        "SCRAPE_ENGINE": "firecrawl",
+        "SCRAPE_STRATEGY": "single",
+        "ARCADE_API_KEY": "load-test",
+        "ARCADE_USER_ID": "load-test",
+        "ARCADE_USE_MOCK": "true",
+        "POST_STORE_PATH": str(workdir / "posts.sqlite3"),
+        "CONTENT_STORE_PATH": str(workdir / "content"),
+        "FEED_WATCHER_ENABLED": "false",
+        "LANGSMITH_TRACING_V2": "false",
+        "LLM_REQUESTS_PER_MINUTE": "1000000",
+        "LLM_TOKENS_PER_MINUTE": "1000000000",
+        "LLM_MAX_CONCURRENCY": "256",
+    }
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def start_app(env: dict, port: int, log_path: Path) -> subprocess.Popen:
+    """Start the app under uvicorn and wait until it answers health checks."""
+    log = open(log_path, "w")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            break
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"App did not start; log:\n{log_path.read_text()[-3000:]}")
+
+
+class LoadDriver:
+    """Runs virtual users against the app and records every request."""
+
+    def __init__(self, client: httpx.AsyncClient, mix: dict, run_id: str, seed: int):
+        self.client = client
+        self.mix = mix
+        self.run_id = run_id
+        self.rng = random.Random(seed)
+        self.post_ids: deque = deque(maxlen=2000)
+        self.urls = 0
+
+    def next_url(self) -> str:
+        """Return a URL not requested before in this run (so scrapes miss the cache)."""
+        self.urls += 1
+        return f"https://loadtest.example/{self.run_id}/articles/{self.urls}"
+
+    def pick(self) -> str:
+        """Pick an operation by weight, generating first while no posts exist."""
+        operation = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        if operation in ("edit", "approve") and not self.post_ids:
+            return "generate"
+        return operation
+
+    async def generate(self, form: dict) -> httpx.Response:
+        response = await self.client.post("/generate", data={"url": self.next_url(), **form})
+        self.post_ids.extend(POST_ID.findall(response.text))
+        return response
+
+    async def run_operation(self, operation: str) -> httpx.Response:
+        if operation == "generate":
+            return await self.generate({"twitter": "on", "linkedin": "on", "professional": "on"})
+        if operation == "batch":
+            return await self.generate({
+                "twitter": "on", "linkedin": "on", "reddit": "on", "subreddit": "loadtest",
+                "professional": "on", "casual": "on", "technical": "on",
+            })
+        if operation == "edit":
+            post_id = self.rng.choice(self.post_ids)
+            response = await self.client.get(f"/edit/{post_id}")
+            if response.status_code >= 400 or ERROR_FRAGMENT in response.text:
+                return response
+            return await self.client.post(f"/save/{post_id}", data={"content": f"Edited by load test {uuid.uuid4().hex[:8]}"})
+        if operation == "approve":
+            return await self.client.post(f"/approve/{self.rng.choice(self.post_ids)}")
+        return await self.client.post("/approve-all")
+
+    async def user(self, deadline: float, records: list):
+        """Issue requests back to back until the deadline."""
+        while time.monotonic() < deadline:
+            operation = self.pick()
+            started = time.perf_counter()
+            try:
+                response = await self.run_operation(operation)
+                ok = response.status_code < 400 and ERROR_FRAGMENT not in response.text
+            except httpx.HTTPError:
+                ok = False
+            records.append((operation, time.perf_counter() - started, ok))
+
+    async def stage(self, concurrency: int, seconds: float) -> dict:
+        """Run ``concurrency`` users for ``seconds`` and summarize the stage."""
+        records = []
+        started = time.monotonic()
+        await asyncio.gather(*[self.user(started + seconds, records) for _ in range(concurrency)])
+        return summarize_stage(concurrency, records, time.monotonic() - started)
+
+
+def latency_summary(latencies: list) -> dict:
+    """Latency percentiles in milliseconds."""
+    return {
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "max_ms": round(max(latencies, default=0.0) * 1000, 1),
+    }
+
+
+def summarize_stage(concurrency: int, records: list, elapsed: float) -> dict:
+    """Summarize the requests of one stage."""
+    by_operation = defaultdict(list)
+    for record in records:
+        by_operation[record[0]].append(record)
+    errors = sum(1 for _, _, ok in records if not ok)
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests": len(records),
+        "errors": errors,
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "throughput": round((len(records) - errors) / elapsed, 2),
+        **latency_summary([latency for _, latency, _ in records]),
+        "operations": {
+            operation: {
+                "requests": len(items),
+                "errors": sum(1 for _, _, ok in items if not ok),
+                **latency_summary([latency for _, latency, _ in items]),
+            }
+            for operation, items in sorted(by_operation.items())
+        },
+    }
+
+
+def find_saturation(stages: list, min_gain: float = 0.1, max_error_rate: float = 0.05):
+    """
+    Find the first stage where more concurrency stopped paying off.
+
+    Returns:
+        The saturating stage's concurrency, the peak throughput before it and
+        the reason, or None if throughput still scaled at the last stage
+    """
+    for previous, stage in zip(stages, stages[1:]):
+        if stage["error_rate"] > max_error_rate:
+            reason = f"error rate {stage['error_rate']:.1%}"
+        elif stage["throughput"] < previous["throughput"] * (1 + min_gain):
+            reason = f"throughput gained less than {min_gain:.0%}"
+        else:
+            continue
+        return {
+            "concurrency": stage["concurrency"],
+            "peak_throughput": max(s["throughput"] for s in stages[:stages.index(stage)]),
+            "reason": reason,
+        }
+    return None
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Compare stages with the same concurrency against a baseline run.
+
+    Returns:
+        Descriptions of the regressions found
+    """
+    regressions = []
+    baseline_stages = {stage["concurrency"]: stage for stage in baseline["stages"]}
+    print(f"\nCompared with {baseline.get('started_at_iso', 'baseline')} ({baseline.get('git_commit') or 'unknown commit'}):")
+    for stage in result["stages"]:
+        before = baseline_stages.get(stage["concurrency"])
+        if before is None:
+            continue
+        throughput = stage["throughput"] / before["throughput"] - 1 if before["throughput"] else 0.0
+        p95 = stage["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        print(
+            f"  c={stage['concurrency']:<4} throughput {throughput:+7.1%}  p95 {p95:+7.1%}  "
+            f"errors {before['error_rate']:.1%} -> {stage['error_rate']:.1%}"
+        )
+        if throughput < -tolerance:
+            regressions.append(f"c={stage['concurrency']}: throughput {throughput:+.1%}")
+        if p95 > tolerance:
+            regressions.append(f"c={stage['concurrency']}: p95 latency {p95:+.1%}")
+        if stage["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append(f"c={stage['concurrency']}: error rate {stage['error_rate']:.1%}")
+    return regressions
+
+
+def git_commit() -> str:
+    """Return the current commit, or an empty string outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        return ""
+
+
+def parse_mix(text: str) -> dict:
+    """Parse ``operation=weight`` pairs."""
+    mix = {}
+    for item in text.split(","):
+        operation, _, weight = item.partition("=")
+        if operation not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {operation!r}; expected one of {', '.join(OPERATIONS)}")
+        mix[operation] = float(weight or 1)
+    return mix
+
+
+async def run(args, base_url: str) -> dict:
+    """Run every stage against the app and collect the results."""
+    limits = httpx.Limits(max_connections=max(args.stages) * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        driver = LoadDriver(client, args.mix, uuid.uuid4().hex[:8], args.seed)
+        stages = []
+        for concurrency in args.stages:
+            stage = await driver.stage(concurrency, args.stage_seconds)
+            stages.append(stage)
+            print(
+                f"c={concurrency:<4} n={stage['requests']:<6} "
+                f"throughput={stage['throughput']:8.2f}/s "
+                f"p50={stage['p50_ms']:8.1f}ms p95={stage['p95_ms']:8.1f}ms p99={stage['p99_ms']:8.1f}ms "
+                f"errors={stage['error_rate']:.1%}"
+            )
+        app_metrics = (await client.get("/metrics")).json()
+    return {"stages": stages, "app_metrics": app_metrics}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", type=lambda s: [int(c) for c in s.split(",")], default=[1, 2, 4, 8, 16, 32],
+                        help="Concurrency of each stage")
+    parser.add_argument("--stage-seconds", type=float, default=20.0)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("generate=3,batch=1,edit=3,approve=3,approve_all=1"),
+                        help="Operation weights")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--firecrawl-latency-ms", type=float, default=300.0)
+    parser.add_argument("--article-kb", type=float, default=20.0)
+    parser.add_argument("--llm-ttft-ms", type=float, default=300.0, help="Stand-in time to first token")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--llm-output-tokens", type=int, default=60)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="App setting override")
+    parser.add_argument("--output", type=Path, help="Result file (default: benchmarks/results/load_test-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed throughput drop / p95 increase against --compare")
+    args = parser.parse_args()
+
+    firecrawl = fake_firecrawl(args.firecrawl_latency_ms / 1000, int(args.article_kb * 1024)).start()
+    anthropic = fake_anthropic(args.llm_ttft_ms / 1000, args.llm_tokens_per_second, args.llm_output_tokens).start()
+    with tempfile.TemporaryDirectory() as workdir:
+        env = app_environment(args, firecrawl.url, anthropic.url, Path(workdir))
+        port = free_port()
+        started_at = time.time()
+        app = start_app(env, port, Path(workdir) / "app.log")
+        try:
+            outcome = asyncio.run(run(args, f"http://127.0.0.1:{port}"))
+        finally:
+            app.terminate()
+            app.wait(timeout=10)
+    firecrawl.stop()
+    anthropic.stop()
+
+    result = {
+        "started_at": started_at,
+        "started_at_iso": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started_at)),
+        "git_commit": git_commit(),
+        "config": {
+            "stages": args.stages,
+            "stage_seconds": args.stage_seconds,
+            "mix": args.mix,
+            "firecrawl_latency_ms": args.firecrawl_latency_ms,
+            "article_kb": args.article_kb,
+            "llm_ttft_ms": args.llm_ttft_ms,
+            "llm_tokens_per_second": args.llm_tokens_per_second,
+            "llm_output_tokens": args.llm_output_tokens,
+            "env": args.env,
+        },
+        "stages": outcome["stages"],
+        "saturation": find_saturation(outcome["stages"]),
+        "app_metrics": outcome["app_metrics"],
+    }
+
+    saturation = result["saturation"]
+    if saturation:
+        print(
+            f"Saturated at c={saturation['concurrency']} ({saturation['reason']}); "
+            f"peak throughput {saturation['peak_throughput']:.2f}/s"
+        )
+    else:
+        print("Throughput still scaled at the last stage; add higher stages to find saturation")
+
+    output = args.output or RESULTS_DIR / f"load_test-{time.strftime('%Y%m%d-%H%M%S', time.localtime(started_at))}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
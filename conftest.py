@@ -0,0 +1,55 @@
+"""
+Test-suite setup that must run before ``src`` is imported, and the suite's
+command-line options (registered here so they work from the repository root).
+"""
+
+import os
+import tempfile
+import pytest
+
+# Keep the global post and content stores out of the working directory during tests
+os.environ.setdefault("POST_STORE_PATH", ":memory:")
+os.environ.setdefault("CONTENT_STORE_PATH", tempfile.mkdtemp(prefix="content-store-"))
+
+_LOOP_MONITOR = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--fail-on-blocking",
+        type=float,
+        metavar="MS",
+        help="Fail tests in which an event-loop callback blocks for longer than MS milliseconds",
+    )
+
+
+def pytest_configure(config):
+    threshold = config.getoption("--fail-on-blocking")
+    if threshold:
+        from src.utils.loop_monitor import LoopMonitor
+
+        monitor = LoopMonitor(block_threshold=threshold / 1000)
+        monitor.start_detector()
+        config.stash[_LOOP_MONITOR] = monitor
+
+
+def pytest_unconfigure(config):
+    monitor = config.stash.get(_LOOP_MONITOR, None)
+    if monitor is not None:
+        monitor.stop()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Fail the test if it blocked the event loop (with ``--fail-on-blocking``)."""
+    monitor = item.config.stash.get(_LOOP_MONITOR, None)
+    if monitor is None or item.get_closest_marker("allow_blocking"):
+        return (yield)
+    before = monitor.block_count
+    result = yield
+    blocks = monitor.blocks_since(before)
+    if blocks:
+        from src.utils.loop_monitor import format_blocks
+
+        pytest.fail(f"Event loop blocked:\n{format_blocks(blocks)}", pytrace=False)
+    return result
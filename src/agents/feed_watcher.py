@@ -0,0 +1,298 @@
+"""Watcher that polls RSS/Atom feeds and sitemaps and ingests new URLs."""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+from src.config import settings
+from src.utils.feed_parser import parse_feed
+from src.utils.metrics import metrics
+from src.utils.seen_index import SeenIndex
+
+
+@dataclass
+class FeedSource:
+    """A polled feed or sitemap and its revalidation state."""
+    url: str
+    interval: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+    failures: int = 0
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for the next poll."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+async def ingest_url(url: str) -> Dict[str, Any]:
+    """
+    Run the generate post graph for a newly discovered URL.
+
+    Args:
+        url: The article URL
+
+    Returns:
+        The final graph state
+    """
+    from src.agents.generate_post_graph import generate_post_graph, graph_config
+
+    return await generate_post_graph.ainvoke({
+        "input": {"url": url},
+        "posts": [],
+        "errors": [],
+        "human_feedback": None,
+        "is_approved": False
+    }, config=graph_config())
+
+
+class FeedWatcher:
+    """
+    Polls feeds on a schedule and enqueues unseen entry URLs for ingestion.
+
+    Feeds are kept in a heap ordered by their next poll time, so each tick
+    only touches the feeds that are due. Polls use conditional GETs, and a
+    200 whose body is unchanged is not parsed again; feeds that stay
+    unchanged are polled less often, up to ``max_poll_interval``. New URLs
+    are filtered through the seen index and processed by a fixed number of
+    ingest workers. A URL only counts as ingested once its ingest succeeds:
+    when it fails, the URL is forgotten and its feed's validators are
+    dropped, so the feed's next poll (on its usual schedule) fetches and
+    parses it in full and queues the URL again, even if the feed has not
+    changed. URLs still queued at shutdown are queued again when the
+    watcher next runs.
+    """
+
+    def __init__(
+        self,
+        feeds: Optional[List[str]] = None,
+        seen: Optional[SeenIndex] = None,
+        ingest: Optional[Callable[[str], Awaitable[Any]]] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        poll_interval: Optional[float] = None,
+        max_poll_interval: Optional[float] = None,
+        fetch_concurrency: Optional[int] = None,
+        ingest_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None
+    ):
+        """
+        Initialize the watcher.
+
+        Args:
+            feeds: Feed and sitemap URLs to watch (defaults to settings)
+            seen: Index of already ingested URLs
+            ingest: Coroutine function called with each new URL
+            client: Optional HTTP client; by default a pooled client is created on first use
+            poll_interval: Seconds between polls of a feed that has new entries
+            max_poll_interval: Upper bound of the backed-off poll interval
+            fetch_concurrency: Maximum number of feeds fetched at once
+            ingest_concurrency: Number of ingest workers
+            queue_size: Maximum number of URLs waiting for ingestion
+        """
+        self.seen = seen if seen is not None else SeenIndex()
+        self.ingest = ingest or ingest_url
+        self.poll_interval = poll_interval or settings.feed_poll_interval_seconds
+        self.max_poll_interval = max_poll_interval or settings.feed_max_poll_interval_seconds
+        self.fetch_concurrency = fetch_concurrency or settings.feed_fetch_concurrency
+        self.ingest_concurrency = ingest_concurrency or settings.feed_ingest_concurrency
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or settings.feed_queue_size)
+        self.sources: Dict[str, FeedSource] = {}
+        self._schedule: list = []
+        self._counter = itertools.count()
+        self._client = client
+        self._fetch_slots = asyncio.Semaphore(self.fetch_concurrency)
+        self._workers: List[asyncio.Task] = []
+        self._stopped = asyncio.Event()
+
+        for url in settings.feed_urls if feeds is None else feeds:
+            self.add_feed(url)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client shared by all feed polls."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=settings.scrape_timeout,
+                limits=httpx.Limits(
+                    max_connections=self.fetch_concurrency,
+                    max_keepalive_connections=self.fetch_concurrency
+                ),
+                headers={"User-Agent": settings.scrape_user_agent}
+            )
+        return self._client
+
+    def add_feed(self, url: str, poll_at: Optional[float] = None):
+        """Start watching a feed; it is first polled at ``poll_at`` (default: now)."""
+        if url in self.sources:
+            return
+        self.sources[url] = FeedSource(url=url, interval=self.poll_interval)
+        self._reschedule(url, poll_at if poll_at is not None else time.monotonic())
+
+    def _reschedule(self, url: str, poll_at: float):
+        heapq.heappush(self._schedule, (poll_at, next(self._counter), url))
+
+    def invalidate(self, url: Optional[str]):
+        """Drop a feed's validators and body hash, so its next poll is parsed in full."""
+        source = self.sources.get(url)
+        if source is not None:
+            source.etag = source.last_modified = source.body_hash = None
+
+    def next_poll_at(self) -> Optional[float]:
+        """Monotonic time at which the next feed is due."""
+        return self._schedule[0][0] if self._schedule else None
+
+    async def poll_feed(self, source: FeedSource) -> List[str]:
+        """
+        Fetch a feed and enqueue its unseen entries.
+
+        Args:
+            source: The feed to poll
+
+        Returns:
+            The newly discovered URLs
+        """
+        async with self._fetch_slots:
+            response = await self.client.get(source.url, headers=source.validators or None)
+
+        if response.status_code == 304:
+            metrics.incr("feed_polls_total", status="not_modified")
+            return []
+        response.raise_for_status()
+
+        etag = response.headers.get("etag") or source.etag
+        last_modified = response.headers.get("last-modified") or source.last_modified
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if body_hash == source.body_hash:
+            source.etag, source.last_modified = etag, last_modified
+            metrics.incr("feed_polls_total", status="unchanged")
+            return []
+
+        feed = await asyncio.to_thread(parse_feed, response.content)
+        for sitemap in feed.sitemaps:
+            self.add_feed(sitemap)
+
+        new_urls = await asyncio.to_thread(
+            self.seen.add_new, [entry.url for entry in feed.entries], source.url
+        )
+        # Remember the body only once its entries are recorded, so a body whose
+        # parse or recording failed is fetched and processed again next time
+        source.etag, source.last_modified, source.body_hash = etag, last_modified, body_hash
+        metrics.incr("feed_polls_total", status="changed")
+        metrics.incr("feed_new_urls_total", len(new_urls))
+        for url in new_urls:
+            await self.queue.put(url)
+        metrics.set_gauge("feed_queue_depth", self.queue.qsize())
+        return new_urls
+
+    async def _poll_and_reschedule(self, url: str) -> List[str]:
+        source = self.sources[url]
+        new_urls = []
+        try:
+            new_urls = await self.poll_feed(source)
+            source.failures = 0
+        except Exception:
+            source.failures += 1
+            metrics.incr("feed_polls_total", status="error")
+
+        # Back off feeds that are unchanged or failing; poll active feeds at the base rate
+        if new_urls:
+            source.interval = self.poll_interval
+        else:
+            source.interval = min(source.interval * 2, self.max_poll_interval)
+        self._reschedule(url, time.monotonic() + source.interval)
+        return new_urls
+
+    async def poll_due(self, now: Optional[float] = None) -> List[str]:
+        """
+        Poll every feed whose next poll time has passed.
+
+        Args:
+            now: Monotonic time to compare against (defaults to the current time)
+
+        Returns:
+            The newly discovered URLs across all polled feeds
+        """
+        now = time.monotonic() if now is None else now
+        due = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due.append(heapq.heappop(self._schedule)[2])
+
+        results = await asyncio.gather(*[self._poll_and_reschedule(url) for url in due])
+        return [url for new_urls in results for url in new_urls]
+
+    async def _ingest_worker(self):
+        while True:
+            url = await self.queue.get()
+            try:
+                await self.ingest(url)
+                await asyncio.to_thread(self.seen.mark_ingested, url)
+                metrics.incr("feed_ingested_total")
+            except Exception:
+                metrics.incr("feed_ingest_failures_total")
+                feed_url = await asyncio.to_thread(self.seen.forget, url)
+                self.invalidate(feed_url)
+            finally:
+                self.queue.task_done()
+                metrics.set_gauge("feed_queue_depth", self.queue.qsize())
+
+    def start_workers(self):
+        """Start the ingest workers if they are not running."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._ingest_worker())
+                for _ in range(self.ingest_concurrency)
+            ]
+
+    async def requeue_pending(self) -> List[str]:
+        """
+        Queue the URLs that were discovered but not ingested, e.g. before a restart.
+
+        Returns:
+            The queued URLs
+        """
+        urls = await asyncio.to_thread(self.seen.pending)
+        for url in urls:
+            await self.queue.put(url)
+        metrics.set_gauge("feed_queue_depth", self.queue.qsize())
+        return urls
+
+    async def drain(self):
+        """Wait until every enqueued URL has been ingested."""
+        self.start_workers()
+        await self.queue.join()
+
+    async def run(self):
+        """Poll due feeds until stopped, sleeping until the next feed is due."""
+        self._stopped.clear()
+        self.start_workers()
+        await self.requeue_pending()
+        while not self._stopped.is_set():
+            await self.poll_due()
+            next_poll = self.next_poll_at()
+            delay = self.poll_interval if next_poll is None else max(0.0, next_poll - time.monotonic())
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self):
+        """Stop polling, cancel the ingest workers and close the HTTP client."""
+        self._stopped.set()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._client is not None:
+            await self._client.aclose()
+
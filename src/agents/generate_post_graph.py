@@ -1,113 +1,428 @@
 """LangGraph agent for generating social media posts."""
 
+import asyncio
+import dataclasses
+import operator
+import uuid
+from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import StateGraph, START, END
-from typing import Annotated, TypedDict
-from src.agents.types import AgentState, GeneratedPost, SocialPlatform, PostStatus
+from langgraph.types import Send
+from typing import Annotated, Optional, TypedDict
+from src.config import settings
+from src.agents.platforms import get_platform_handler
+from src.agents.types import AgentState, GeneratedPost, SocialPlatform, PostStatus, PostStyle
+from src.utils.content_store import content_store
 from src.utils.scraper import scraper
-from src.utils.llm import content_generator
-from src.clients.arcade_client import arcade_client
+from src.utils.dedup import content_index, simhash
+from src.utils.llm import content_generator, condense_content
+from src.utils.metrics import metrics
+from src.utils.published_index import find_published_duplicate, record_failed, record_published
+from src.utils.serialization import serializer
+from src.utils.tracing import current_span, traced
+
+
+def post_key(post: GeneratedPost):
+    """Identity of a post within a run: its id, or its platform and style before it has one."""
+    return post.id or (post.platform, post.style)
+
+
+def merge_posts(current: list, update: list) -> list:
+    """
+    Reducer of the ``posts`` channel.
+
+    Posts in the update replace current posts with the same key and are
+    appended otherwise, so branches can each update their own posts.
+    """
+    merged = {post_key(post): post for post in current}
+    for post in update:
+        merged[post_key(post)] = post
+    return list(merged.values())
 
 
 class GeneratePostState(TypedDict):
-    """State for the generate post graph."""
+    """
+    State for the generate post graph.
+
+    Nodes return partial updates; ``errors`` are appended and ``posts`` are
+    merged by platform and style, so concurrent branches cannot overwrite
+    each other. Generated posts get their id up front, which the post store
+    keeps. The scraped article itself is not part of the state: it is kept
+    in the content store and the state holds its ``content_hash``.
+    """
     input: dict
-    content: str
-    posts: list
-    errors: list
+    content_hash: str
+    duplicate_of: Optional[dict]
+    condensed_content: Optional[str]
+    summary: Optional[str]
+    key_points: Optional[list]
+    posts: Annotated[list, merge_posts]
+    errors: Annotated[list, operator.add]
     human_feedback: str
     is_approved: bool
 
 
-async def scrape_content_node(state: GeneratePostState) -> GeneratePostState:
+async def find_near_duplicate(url: str, content: str, content_hash: str) -> Optional[dict]:
+    """
+    Look up previously scraped content that is nearly identical to this content.
+
+    The SimHash is computed over the condensed content, i.e. what the LLM
+    would see. Content without a near duplicate is added to the index.
+
+    Args:
+        url: The scraped URL
+        content: The scraped content
+        content_hash: Hash of the scraped content
+
+    Returns:
+        The duplicate's content hash, URL and Hamming distance, or None
+    """
+    if settings.near_duplicate_action == "off":
+        return None
+
+    fingerprint = await asyncio.to_thread(simhash, condense_content(content))
+    if fingerprint is None:
+        return None
+
+    match = content_index.find(fingerprint, exclude=content_hash)
+    if match is None:
+        content_index.add(content_hash, fingerprint, url)
+        return None
+
+    metrics.incr("near_duplicates_total", action=settings.near_duplicate_action)
+    return {"content_hash": match.key, "url": match.url, "distance": match.distance}
+
+
+@traced("graph.scrape_content")
+async def scrape_content_node(state: GeneratePostState) -> dict:
     """
     Scrape content from the provided URL.
 
+    The content is written to the content store (a known document is only
+    looked up) and the state gets its hash. If the content is a near
+    duplicate of earlier content (e.g. a syndicated copy), it is recorded in
+    ``duplicate_of``; with the ``reuse`` action the earlier content hash is
+    used so its generated posts are reused.
+
     Args:
         state: Current graph state
 
     Returns:
-        Updated state with scraped content
+        State update with the content hash
     """
     try:
         url = state["input"]["url"]
-        content = await scraper.extract_text(url)
-        
-        if not content:
-            state["errors"].append(f"Failed to scrape content from {url}")
-            return state
+        result = await scraper.scrape_url(url)
         
-        state["content"] = content
-        return state
+        if not result or not result.get("content"):
+            return {"errors": [f"Failed to scrape content from {url}"]}
+
+        content_hash = await asyncio.to_thread(content_store.put, result["content"], result.get("content_hash"))
+        duplicate = await find_near_duplicate(url, result["content"], content_hash)
+        if duplicate and settings.near_duplicate_action == "reuse":
+            content_hash = duplicate["content_hash"]
+        return {"content_hash": content_hash, "duplicate_of": duplicate}
     except Exception as e:
-        state["errors"].append(f"Error scraping content: {str(e)}")
-        return state
+        return {"errors": [f"Error scraping content: {str(e)}"]}
 
 
-async def generate_posts_node(state: GeneratePostState) -> GeneratePostState:
+def get_requested_styles(input_data: dict) -> list:
     """
-    Generate posts for each requested platform.
+    Resolve the list of styles requested for a run.
+
+    Accepts either a ``styles`` list or the single ``style`` value, dropping
+    duplicates while keeping the requested order.
+
+    Args:
+        input_data: The graph input
+
+    Returns:
+        List of style names (at least one)
+    """
+    styles = input_data.get("styles") or [input_data.get("style") or PostStyle.PROFESSIONAL.value]
+    resolved = []
+    for style in styles:
+        value = style.value if isinstance(style, PostStyle) else str(style).lower()
+        if value not in resolved:
+            resolved.append(value)
+    return resolved
+
+
+def _post_output_key(platform: SocialPlatform, style: str) -> str:
+    """Key under which a generated post is cached for a content hash."""
+    return f"post:{platform.value}:{style}"
+
+
+async def _generate_platform_variants(
+    platform: SocialPlatform,
+    content: str,
+    styles: list,
+    content_hash: str = None
+) -> dict:
+    """
+    Generate the style variants for one platform, reusing cached posts.
+
+    Posts previously generated from the same content hash are reused and
+    only the missing styles are sent to the LLM.
+
+    Returns:
+        Mapping of style to (post content, reused flag), in requested style order
+    """
+    cached = {}
+    if content_hash:
+        for style in styles:
+            post_content = scraper.cache.get_output(content_hash, _post_output_key(platform, style))
+            if post_content is not None:
+                cached[style] = post_content
+
+    missing = [style for style in styles if style not in cached]
+    generated = {}
+    if missing:
+        generated = await content_generator.generate_variants(platform.value, content, missing)
+        if content_hash:
+            for style, post_content in generated.items():
+                scraper.cache.store_output(content_hash, _post_output_key(platform, style), post_content)
+
+    return {
+        style: (cached[style], True) if style in cached else (generated[style], False)
+        for style in styles
+    }
+
+
+async def _condensed_content(state: GeneratePostState) -> str:
+    """The condensed scraped content, computed once per content hash."""
+    if state.get("condensed_content"):
+        return state["condensed_content"]
+    content_hash = state["content_hash"]
+    content = scraper.cache.get_output(content_hash, "condensed")
+    if content is None:
+        content = condense_content(await asyncio.to_thread(content_store.get, content_hash))
+        scraper.cache.store_output(content_hash, "condensed", content)
+    return content
+
+
+@traced("graph.prepare_content")
+async def prepare_content_node(state: GeneratePostState) -> dict:
+    """
+    Condense the scraped content once for the summary, key point and post branches.
+
+    Args:
+        state: Current graph state
+
+    Returns:
+        State update with the condensed content
+    """
+    if not state.get("content_hash"):
+        return {}
+    return {"condensed_content": await _condensed_content(state)}
+
+
+@traced("graph.summarize_content")
+async def summarize_content_node(state: GeneratePostState) -> dict:
+    """
+    Summarize the condensed content, reusing the summary of earlier runs on the same content.
 
     Args:
         state: Current graph state
 
     Returns:
-        Updated state with generated posts
+        State update with the summary
+    """
+    content_hash = state.get("content_hash")
+    summary = scraper.cache.get_output(content_hash, "summary") if content_hash else None
+    if summary is None:
+        try:
+            summary = await content_generator.summarize_content(
+                await _condensed_content(state),
+                max_length=settings.summary_max_length
+            )
+        except Exception as e:
+            return {"errors": [f"Error summarizing content: {str(e)}"]}
+        if content_hash:
+            scraper.cache.store_output(content_hash, "summary", summary)
+    return {"summary": summary}
+
+
+@traced("graph.extract_key_points")
+async def extract_key_points_node(state: GeneratePostState) -> dict:
+    """
+    Extract the key points of the condensed content, reusing those of earlier runs.
+
+    Args:
+        state: Current graph state
+
+    Returns:
+        State update with the key points
+    """
+    content_hash = state.get("content_hash")
+    key_points = scraper.cache.get_output(content_hash, "key_points") if content_hash else None
+    if key_points is None:
+        try:
+            key_points = await content_generator.extract_key_points(await _condensed_content(state))
+        except Exception as e:
+            return {"errors": [f"Error extracting key points: {str(e)}"]}
+        if content_hash:
+            scraper.cache.store_output(content_hash, "key_points", key_points)
+    return {"key_points": key_points}
+
+
+@traced("graph.generate_posts")
+async def generate_posts_node(state: GeneratePostState) -> dict:
     """
-    if not state.get("content"):
-        state["errors"].append("No content available for post generation")
-        return state
+    Generate posts for each requested platform and style.
 
+    Platforms are resolved through the platform registry. The scraped
+    content is condensed once and shared by every variant, and all variants
+    are generated concurrently. Short-form platforms are generated from the
+    summary when the state has one. When the content hash matches a
+    previous run, the condensed content and generated posts are reused.
+    Posts generated from near-duplicate content are marked ``duplicate_of``.
+
+    Args:
+        state: Current graph state
+
+    Returns:
+        State update with the generated posts
+    """
+    if not state.get("content_hash"):
+        return {"errors": ["No content available for post generation"]}
+
+    errors = []
     try:
         platforms = state["input"].get("platforms", [SocialPlatform.TWITTER, SocialPlatform.LINKEDIN])
-        style = state["input"].get("style", "professional")
-        posts = []
-
+        styles = get_requested_styles(state["input"])
+        span = current_span()
+        if span is not None:
+            span.set(platforms=[getattr(platform, "value", platform) for platform in platforms], styles=styles)
+        content_hash = state.get("content_hash")
+        duplicate = state.get("duplicate_of")
+        content = await _condensed_content(state)
+        summary = state.get("summary") if settings.summarize_for_short_form else None
+
+        supported = []
         for platform in platforms:
-            try:
-                if platform == SocialPlatform.TWITTER:
-                    post_content = await content_generator.generate_twitter_post(
-                        state["content"],
-                        style=style
-                    )
-                elif platform == SocialPlatform.LINKEDIN:
-                    post_content = await content_generator.generate_linkedin_post(
-                        state["content"],
-                        style=style
-                    )
-                else:
-                    continue
+            handler = get_platform_handler(platform)
+            if handler is None:
+                errors.append(f"Unsupported platform: {getattr(platform, 'value', platform)}")
+            elif handler.platform not in supported:
+                supported.append(handler.platform)
+        sources = {
+            platform: "summary" if summary and get_platform_handler(platform).short_form else "content"
+            for platform in supported
+        }
+        results = await asyncio.gather(
+            *[
+                _generate_platform_variants(
+                    platform,
+                    summary if sources[platform] == "summary" else content,
+                    styles,
+                    content_hash
+                )
+                for platform in supported
+            ],
+            return_exceptions=True
+        )
+
+        posts = []
+        for platform, variants in zip(supported, results):
+            if isinstance(variants, Exception):
+                errors.append(f"Error generating {platform.value} post: {str(variants)}")
+                continue
 
+            for style, (post_content, reused) in variants.items():
+                metadata = {"source": sources[platform]}
+                if reused:
+                    metadata["reused"] = True
+                if duplicate:
+                    metadata["duplicate_of"] = duplicate["url"]
                 post = GeneratedPost(
+                    id=str(uuid.uuid4()),
                     platform=platform,
                     content=post_content,
-                    status=PostStatus.PENDING_APPROVAL
+                    status=PostStatus.PENDING_APPROVAL,
+                    metadata=metadata,
+                    style=style,
+                    source_url=state["input"].get("url"),
+                    content_hash=content_hash
                 )
+                handler = get_platform_handler(platform)
+                if handler.prepare:
+                    handler.prepare(post, state["input"])
                 posts.append(post)
-            except Exception as platform_error:
-                state["errors"].append(f"Error generating {platform.value} post: {str(platform_error)}")
-                continue
 
-        state["posts"] = posts
-        return state
+        return {"posts": posts, "errors": errors}
     except Exception as e:
-        state["errors"].append(f"Error generating posts: {str(e)}")
-        return state
+        return {"errors": errors + [f"Error generating posts: {str(e)}"]}
+
+
+def _platform_branch(state: GeneratePostState, platform) -> Send:
+    """Send the state to ``generate_posts`` for a single platform."""
+    return Send("generate_posts", {**state, "input": {**state["input"], "platforms": [platform]}})
+
+
+def _is_short_form(platform) -> bool:
+    handler = get_platform_handler(platform)
+    return handler is not None and handler.short_form
+
+
+def route_content(state: GeneratePostState) -> list:
+    """
+    Fan out the prepared content into parallel branches.
+
+    The summary, the key points and the posts of each platform are
+    generated concurrently. Short-form platforms wait for the summary when
+    they are generated from it.
+
+    Returns:
+        Branches to run
+    """
+    if not state.get("content_hash"):
+        return [Send("generate_posts", state)]
+
+    platforms = state["input"].get("platforms", [SocialPlatform.TWITTER, SocialPlatform.LINKEDIN])
+    from_summary = settings.summarize_for_short_form and any(_is_short_form(p) for p in platforms)
+    branches = []
+    if settings.generate_summary or from_summary:
+        branches.append(Send("summarize_content", state))
+    if settings.generate_key_points:
+        branches.append(Send("extract_key_points", state))
+    branches.extend(
+        _platform_branch(state, platform) for platform in platforms
+        if not (from_summary and _is_short_form(platform))
+    )
+    return branches or ["human_approval"]
+
+
+def route_short_form(state: GeneratePostState) -> list:
+    """
+    Generate the posts of short-form platforms once the summary is available.
 
+    Returns:
+        Branches to run
+    """
+    platforms = state["input"].get("platforms", [SocialPlatform.TWITTER, SocialPlatform.LINKEDIN])
+    if not settings.summarize_for_short_form:
+        return ["human_approval"]
+    branches = [_platform_branch(state, platform) for platform in platforms if _is_short_form(platform)]
+    return branches or ["human_approval"]
 
-async def human_approval_node(state: GeneratePostState) -> GeneratePostState:
+
+@traced("graph.human_approval")
+async def human_approval_node(state: GeneratePostState) -> dict:
     """
     Wait for human approval of generated posts.
 
+    This node is deferred: it joins the content branches and runs once all
+    of them have finished.
+
     Args:
         state: Current graph state
 
     Returns:
-        Updated state with approval status
+        State update with approval status
     """
     # This node would be interrupted for human feedback
     # For now, we'll just mark it as pending
-    state["is_approved"] = False
-    return state
+    return {"is_approved": False}
 
 
 def should_publish(state: GeneratePostState) -> str:
@@ -125,42 +440,90 @@ def should_publish(state: GeneratePostState) -> str:
     return END
 
 
-async def publish_posts_node(state: GeneratePostState) -> GeneratePostState:
+async def _publish_platform_posts(posts: list, input_data: dict) -> list:
+    """
+    Publish the posts of one platform in order.
+
+    Each post is first checked against posts published recently on the same
+    platform, including earlier posts of this run.
+
+    Returns:
+        Error messages
+    """
+    errors = []
+    for post in posts:
+        handler = get_platform_handler(post.platform)
+        duplicate = find_published_duplicate(post.platform.value, post.content, exclude=post.id)
+        if duplicate:
+            post.metadata["duplicate_of"] = duplicate.post_id
+            if settings.published_duplicate_action == "block":
+                record_failed(post)
+                errors.append(
+                    f"Skipped {post.platform.value} post: near duplicate of published post "
+                    f"{duplicate.post_id} ({duplicate.similarity:.0%} similar)"
+                )
+                continue
+
+        try:
+            post_id = await handler.publish(post)
+        except Exception as e:
+            record_failed(post)
+            errors.append(f"Failed to publish {post.platform.value} post: {str(e)}")
+            continue
+
+        if post_id:
+            post.metadata["post_id"] = post_id
+            post.source_url = post.source_url or input_data.get("url")
+            record_published(post)
+        else:
+            record_failed(post)
+            errors.append(f"Failed to publish {post.platform} post")
+    return errors
+
+
+@traced("graph.publish_posts")
+async def publish_posts_node(state: GeneratePostState) -> dict:
     """
     Publish approved posts to social media.
 
+    Platforms are published concurrently; posts of the same platform go out
+    in order. Near duplicates of recently published posts are skipped
+    (``block``) or published with a ``duplicate_of`` mark (``flag``).
+    Published posts are recorded in the post store. The posts in the state
+    are not modified; updated copies are returned.
+
     Args:
         state: Current graph state
 
     Returns:
-        Updated state with published posts
+        State update with the published (or failed) posts
     """
     try:
+        by_platform = {}
         for post in state["posts"]:
-            if post.platform == SocialPlatform.TWITTER:
-                post_id = await arcade_client.post_to_twitter(post.content)
-            elif post.platform == SocialPlatform.LINKEDIN:
-                post_id = await arcade_client.post_to_linkedin(post.content)
-            else:
-                continue
-
-            if post_id:
-                post.status = PostStatus.PUBLISHED
-                post.metadata["post_id"] = post_id
-            else:
-                post.status = PostStatus.FAILED
-                state["errors"].append(f"Failed to publish {post.platform} post")
-
-        return state
+            if get_platform_handler(post.platform) is not None:
+                post = dataclasses.replace(post, metadata=dict(post.metadata))
+                by_platform.setdefault(post.platform, []).append(post)
+
+        results = await asyncio.gather(*[
+            _publish_platform_posts(posts, state["input"]) for posts in by_platform.values()
+        ])
+        return {
+            "posts": [post for posts in by_platform.values() for post in posts],
+            "errors": [error for errors in results for error in errors]
+        }
     except Exception as e:
-        state["errors"].append(f"Error publishing posts: {str(e)}")
-        return state
+        return {"errors": [f"Error publishing posts: {str(e)}"]}
 
 
-def create_generate_post_graph():
+def create_generate_post_graph(checkpointer=None):
     """
     Create the LangGraph for generating social media posts.
 
+    Args:
+        checkpointer: Optional checkpoint saver; with ``graph_checkpointing``
+            enabled, an in-memory saver using the msgpack serializer is used
+
     Returns:
         Compiled graph ready for execution
     """
@@ -168,18 +531,42 @@ def create_generate_post_graph():
 
     # Add nodes
     graph.add_node("scrape_content", scrape_content_node)
+    graph.add_node("prepare_content", prepare_content_node)
+    graph.add_node("summarize_content", summarize_content_node)
+    graph.add_node("extract_key_points", extract_key_points_node)
     graph.add_node("generate_posts", generate_posts_node)
-    graph.add_node("human_approval", human_approval_node)
+    graph.add_node("human_approval", human_approval_node, defer=True)
     graph.add_node("publish_posts", publish_posts_node)
 
-    # Add edges
+    # Add edges; summary, key points and posts are parallel branches joined
+    # by the deferred approval node
     graph.add_edge(START, "scrape_content")
-    graph.add_edge("scrape_content", "generate_posts")
+    graph.add_edge("scrape_content", "prepare_content")
+    graph.add_conditional_edges(
+        "prepare_content", route_content, ["summarize_content", "extract_key_points", "generate_posts", "human_approval"]
+    )
+    graph.add_conditional_edges("summarize_content", route_short_form, ["generate_posts", "human_approval"])
+    graph.add_edge("extract_key_points", "human_approval")
     graph.add_edge("generate_posts", "human_approval")
     graph.add_conditional_edges("human_approval", should_publish)
     graph.add_edge("publish_posts", END)
 
-    return graph.compile()
+    if checkpointer is None and settings.graph_checkpointing:
+        checkpointer = InMemorySaver(serde=serializer)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def graph_config(thread_id: Optional[str] = None) -> dict:
+    """
+    Build the run config of a graph invocation.
+
+    Args:
+        thread_id: Checkpoint thread of the run; a new one by default
+
+    Returns:
+        Config to pass to ``ainvoke``
+    """
+    return {"configurable": {"thread_id": thread_id or str(uuid.uuid4())}}
 
 
 # Create the graph
@@ -0,0 +1,116 @@
+"""Registry of the social platforms posts can be generated for and published to."""
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+from src.config import settings
+from src.agents.types import GeneratedPost, SocialPlatform
+from src.clients.arcade_client import arcade_client
+from src.utils.platform_rules import split_title
+
+
+TWITTER_INSTRUCTIONS = """Based on the article, generate a compelling Twitter post that is:
+- Concise (under 280 characters)
+- Engaging and informative
+- Style: {style}
+- Include relevant hashtags if appropriate
+
+Generate only the tweet text, nothing else."""
+
+LINKEDIN_INSTRUCTIONS = """Based on the article, generate a professional LinkedIn post that:
+- Is engaging and thought-provoking
+- Includes relevant insights or takeaways
+- Style: {style}
+- Can be longer than Twitter (up to 3000 characters)
+- Include relevant hashtags
+
+Generate only the LinkedIn post text, nothing else."""
+
+REDDIT_INSTRUCTIONS = """Based on the article, write a Reddit text post that:
+- Puts the title on the first line (under 300 characters), then a blank line, then the body
+- Reads as a genuine contribution to the discussion, not an advertisement
+- Covers the key points in markdown and mentions the source
+- Style: {style}
+- Uses no hashtags
+
+Generate only the title and body, nothing else."""
+
+
+@dataclass(frozen=True)
+class PlatformHandler:
+    """
+    How posts for one platform are generated, prepared and published.
+
+    The content generator looks the handler up by platform name: it sends
+    ``instructions`` (formatted with the style) after the cached article and
+    routes the call, as the task named after the platform, to
+    ``model_tier`` unless ``LLM_ROUTES`` overrides it. The handler adds
+    platform-specific metadata to generated posts (``prepare``) and sends
+    approved posts (``publish``). Posts of short-form platforms are
+    generated from the content summary.
+    """
+    platform: SocialPlatform
+    label: str
+    publish: Callable[[GeneratedPost], Awaitable[Optional[str]]]
+    instructions: str
+    model_tier: str = "default"
+    prepare: Optional[Callable[[GeneratedPost, dict], None]] = None
+    short_form: bool = False
+
+
+PLATFORM_HANDLERS: Dict[SocialPlatform, PlatformHandler] = {}
+
+
+def register_platform(handler: PlatformHandler) -> PlatformHandler:
+    """Register (or replace) the handler of a platform."""
+    PLATFORM_HANDLERS[handler.platform] = handler
+    return handler
+
+
+def get_platform_handler(platform) -> Optional[PlatformHandler]:
+    """Return the handler of a platform, or None if it is not supported."""
+    try:
+        return PLATFORM_HANDLERS.get(SocialPlatform(platform))
+    except ValueError:
+        return None
+
+
+def supported_platforms() -> List[SocialPlatform]:
+    """Platforms with a registered handler, in registration order."""
+    return list(PLATFORM_HANDLERS)
+
+
+async def _publish_twitter(post: GeneratedPost) -> Optional[str]:
+    return await arcade_client.post_to_twitter(post.content)
+
+
+async def _publish_linkedin(post: GeneratedPost) -> Optional[str]:
+    return await arcade_client.post_to_linkedin(post.content)
+
+
+def _prepare_reddit(post: GeneratedPost, input_data: dict):
+    """Record the title and the target subreddit of a Reddit post."""
+    post.metadata["title"] = split_title(post.content)[0]
+    subreddit = input_data.get("subreddit") or settings.reddit_default_subreddit
+    if subreddit:
+        post.metadata["subreddit"] = subreddit.strip().removeprefix("r/").strip("/")
+
+
+async def _publish_reddit(post: GeneratedPost) -> Optional[str]:
+    subreddit = post.metadata.get("subreddit")
+    if not subreddit:
+        raise ValueError("No subreddit set for Reddit post")
+    title, body = split_title(post.content)
+    return await arcade_client.post_to_reddit(subreddit, title, body)
+
+
+register_platform(PlatformHandler(
+    SocialPlatform.TWITTER, "Twitter", publish=_publish_twitter,
+    instructions=TWITTER_INSTRUCTIONS, model_tier="fast", short_form=True
+))
+register_platform(PlatformHandler(
+    SocialPlatform.LINKEDIN, "LinkedIn", publish=_publish_linkedin, instructions=LINKEDIN_INSTRUCTIONS
+))
+register_platform(PlatformHandler(
+    SocialPlatform.REDDIT, "Reddit", publish=_publish_reddit,
+    instructions=REDDIT_INSTRUCTIONS, prepare=_prepare_reddit
+))
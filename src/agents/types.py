@@ -1,7 +1,7 @@
 """Type definitions for the social media agent."""
 
 from dataclasses import dataclass, field
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from enum import Enum
 
 
@@ -9,11 +9,17 @@ class PostStatus(str, Enum):
     """Status of a generated post."""
     DRAFT = "draft"
     PENDING_APPROVAL = "pending_approval"
+    EDITED = "edited"
     APPROVED = "approved"
     SCHEDULED = "scheduled"
     PUBLISHED = "published"
     FAILED = "failed"
 
+    @property
+    def label(self) -> str:
+        """Human-readable status shown in the review queue."""
+        return "Pending Review" if self is PostStatus.PENDING_APPROVAL else self.value.title()
+
 
 class SocialPlatform(str, Enum):
     """Supported social media platforms."""
@@ -22,27 +28,50 @@ class SocialPlatform(str, Enum):
     REDDIT = "reddit"
 
 
-@dataclass
+class PostStyle(str, Enum):
+    """Writing styles available for generated posts."""
+    PROFESSIONAL = "professional"
+    CASUAL = "casual"
+    TECHNICAL = "technical"
+
+
+@dataclass(slots=True)
 class GeneratedPost:
-    """Represents a generated social media post."""
+    """
+    Represents a generated social media post.
+
+    The same record is used in the graph state and in the post store; ``id``
+    and the timestamps are set once the post is stored, and ``version`` is
+    incremented on every stored change. ``content_hash`` refers to the
+    source document in the content store.
+    """
     platform: SocialPlatform
     content: str
     status: PostStatus = PostStatus.DRAFT
     scheduled_time: Optional[str] = None
-    media_urls: List[str] = field(default_factory=list)
+    media_urls: Tuple[str, ...] = ()
     metadata: Dict[str, Any] = field(default_factory=dict)
+    id: Optional[str] = None
+    style: Optional[str] = None
+    source_url: Optional[str] = None
+    version: int = 1
+    created_at: Optional[float] = None
+    updated_at: Optional[float] = None
+    published_at: Optional[float] = None
+    content_hash: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentInput:
     """Input for content generation."""
     url: str
     platforms: List[SocialPlatform] = field(default_factory=lambda: [SocialPlatform.TWITTER, SocialPlatform.LINKEDIN])
     style: Optional[str] = None
+    styles: List[str] = field(default_factory=list)
     additional_context: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """State for the social media agent graph."""
     input: ContentInput
@@ -2,20 +2,37 @@
 
 from fasthtml.common import *
 from typing import Optional
+from urllib.parse import quote_plus
+import asyncio
 import json
-import uuid
+import time
 from src.config import settings
-from src.agents.generate_post_graph import generate_post_graph
-from src.agents.types import SocialPlatform
+from src.agents.feed_watcher import FeedWatcher, ingest_url
+from src.agents.generate_post_graph import generate_post_graph, get_requested_styles, graph_config
+from src.agents.platforms import get_platform_handler, supported_platforms
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform, PostStyle
+from src.utils.content_store import content_store
+from src.utils.events import DELETED, EventBus, PostEvent, post_events
+from src.utils.fragment_cache import fragment_cache
+from src.utils.loop_monitor import loop_monitor
 from src.utils.mock_llm import mock_content_generator
+from src.utils.metrics import metrics
+from src.utils.platform_rules import get_rules, post_length, validate_post
+from src.utils.post_store import post_store
+from src.utils.profiler import profiling_session
+from src.utils.published_index import find_published_duplicate, published_index
+from src.utils.tracing import TracingMiddleware, tracer
 
 
 # Create FastHTML app
 app, rt = fast_app(
     title="Social Media Agent",
     pico=True,
+    # The event stream stays open for the lifetime of the page; debug pages would trace themselves
+    middleware=[Middleware(TracingMiddleware, exclude=("/events", "/debug/", "/admin/"))],
     hdrs=[
         Meta(name="viewport", content="width=device-width, initial-scale=1"),
+        Script(src="https://cdn.jsdelivr.net/npm/htmx-ext-sse@2.2.2/sse.js"),
         Style("""
             .form-group { margin-bottom: 20px; }
             .post-card { 
@@ -62,6 +79,15 @@ app, rt = fast_app(
             }
             .twitter-badge { background: #1DA1F2; color: white; }
             .linkedin-badge { background: #0A66C2; color: white; }
+            .reddit-badge { background: #FF4500; color: white; }
+            .style-badge {
+                display: inline-block;
+                padding: 5px 10px;
+                border-radius: 3px;
+                font-size: 12px;
+                background: #e0e0e0;
+                color: #333;
+            }
             .status-badge {
                 display: inline-block;
                 padding: 5px 10px;
@@ -69,76 +95,178 @@ app, rt = fast_app(
                 font-size: 12px;
                 margin-left: 10px;
             }
-            .status-pending { background: #fff3cd; color: #856404; }
+            .status-pending_approval, .status-edited { background: #fff3cd; color: #856404; }
             .status-approved { background: #d4edda; color: #155724; }
             .status-published { background: #d1ecf1; color: #0c5460; }
             .status-failed { background: #f8d7da; color: #721c24; }
             .preview-section { margin: 20px 0; }
+            .post-issues { color: #721c24; font-size: 12px; margin: 5px 0; }
+            .duplicate-notice { background: #fff3cd; color: #856404; padding: 10px; border-radius: 3px; }
             .preview-header { font-size: 18px; font-weight: bold; margin-bottom: 15px; }
+            .queue-filters { display: flex; gap: 10px; flex-wrap: wrap; align-items: end; }
+            .queue-count { font-size: 14px; color: #666; }
+            .live-activity { font-size: 12px; color: #666; max-height: 150px; overflow-y: auto; }
+            .trace-row { display: flex; align-items: center; font-size: 12px; font-family: monospace; }
+            .trace-name { width: 320px; flex-shrink: 0; white-space: nowrap; overflow: hidden; }
+            .trace-track { flex-grow: 1; position: relative; height: 14px; }
+            .trace-bar { position: absolute; height: 100%; background: #0A66C2; min-width: 1px; }
+            .trace-error .trace-bar { background: #d32f2f; }
         """)
     ]
 )
 
-# Store for managing posts
-posts_store = {}
+# Client-side approximation of Twitter's weighted length while editing (URLs
+# count 23, wide characters 2); the server recomputes it exactly on save.
+WEIGHTED_LENGTH_JS = (
+    "(function(v){v=v.replace(/https?:\\/\\/\\S+/g,'x'.repeat(23));var n=0;"
+    "for(const c of v){n+=c.codePointAt(0)>0x10FF?2:1}return n})(this.value)"
+)
+
+# Statuses of posts still in the review queue
+REVIEW_STATUSES = (PostStatus.PENDING_APPROVAL, PostStatus.EDITED)
+
+# Rendered post events streamed to every connected browser
+live_updates = EventBus()
+
+
+def render_status_badges(post: GeneratedPost, oob: bool = False) -> Span:
+    """
+    Render the status badges of a post card.
+
+    Args:
+        post: The post
+        oob: Mark the badges for an out-of-band swap, so a status change
+            updates only the badges of a card already on the page
+
+    Returns:
+        The badges, with an id unique to the post
+    """
+    return Span(
+        Span(post.status.label, cls=f"status-badge status-{post.status.value}"),
+        *([Span("Possible duplicate", cls="status-badge status-failed")] if post.metadata.get('duplicate_of') else []),
+        id=f"badges-{post.id}",
+        **({"hx_swap_oob": "true"} if oob else {})
+    )
+
+
+def render_live_event(event: PostEvent) -> str:
+    """
+    Render a post event as a server-sent event message.
+
+    The message adds a line to the live activity list and carries
+    out-of-band swaps of the post's status badges (or removes its card),
+    so cards open in other tabs follow approvals and publishes.
+    """
+    post = event.post
+    subject = f"{get_platform_handler(post.platform).label} post" if post is not None else "Posts"
+    parts = [Li(f"{time.strftime('%H:%M:%S', time.localtime(event.at))} {subject} {event.type}")]
+    if post is not None:
+        parts.append(render_status_badges(post, oob=True))
+    if event.type == DELETED:
+        parts.append(Div(id=f"post-{event.post_id}", hx_swap_oob="delete"))
+    data = "".join(f"data: {line}\n" for line in "".join(to_xml(part) for part in parts).splitlines())
+    return f"event: post\n{data}\n"
+
 
+def publish_live_event(event: PostEvent):
+    """Render a post event once and push it to every connected browser."""
+    if len(live_updates):
+        live_updates.publish(render_live_event(event))
 
-def render_post_card(post_id: str, post: dict) -> Div:
-    """Render a single post card with preview and edit options."""
-    platform = post['platform'].lower()
+
+post_events.add_listener(publish_live_event)
+
+
+def render_live_updates() -> Div:
+    """Live activity list, connected to the post event stream."""
+    return Div(
+        H4("Live activity"),
+        Ul(id="live-activity", cls="live-activity"),
+        hx_ext="sse",
+        sse_connect="/events",
+        sse_swap="post",
+        hx_target="#live-activity",
+        hx_swap="afterbegin"
+    )
+
+
+def render_post_card(post: GeneratedPost) -> NotStr:
+    """Render a single post card with preview and edit options, cached per post version."""
+    return fragment_cache.render(post, "card", _build_post_card)
+
+
+def _build_post_card(post: GeneratedPost) -> Div:
+    post_id = post.id
+    platform = post.platform.value
     platform_class = f"{platform}-badge"
-    status_class = f"status-{post['status'].lower().replace(' ', '-')}"
     
-    char_limit = 280 if platform == "twitter" else 3000
-    char_count = len(post['content'])
-    char_warning = " ⚠️" if platform == "twitter" and char_count > 280 else ""
+    validation = validate_post(platform, post.content)
+    char_warning = " ⚠️" if validation.length > validation.max_length else ""
     
     return Div(
         Div(
-            Span(post['platform'].upper(), cls=f"platform-badge {platform_class}"),
-            Span(post['status'], cls=f"status-badge {status_class}"),
+            Span(platform.upper(), cls=f"platform-badge {platform_class}"),
+            Span((post.style or PostStyle.PROFESSIONAL.value).title(), cls="style-badge"),
+            *([Span(f"r/{post.metadata['subreddit']}", cls="style-badge")] if post.metadata.get('subreddit') else []),
+            render_status_badges(post),
             cls="post-meta"
         ),
-        Div(post['content'], cls="post-content"),
+        Div(post.content, cls="post-content"),
         Div(
-            f"Characters: {char_count}/{char_limit}{char_warning}",
+            f"Characters: {validation.length}/{validation.max_length}{char_warning}",
             cls="char-count"
         ),
+        *([Ul(*[Li(issue) for issue in validation.issues], cls="post-issues")] if validation.issues else []),
         Div(
-            Button("✏️ Edit", hx_get=f"/edit/{post_id}", cls="btn-secondary"),
-            Button("👍 Approve", hx_post=f"/approve/{post_id}", cls="btn-primary"),
-            Button("❌ Reject", hx_post=f"/reject/{post_id}", cls="btn-danger"),
+            Button("✏️ Edit", hx_get=f"/edit/{post_id}", hx_target=f"#post-{post_id}", cls="btn-secondary"),
+            Button("👍 Approve", hx_post=f"/approve/{post_id}", hx_target=f"#notice-{post_id}", cls="btn-primary"),
+            Button(
+                "❌ Reject", hx_post=f"/reject/{post_id}", hx_target=f"#post-{post_id}", hx_swap="outerHTML",
+                cls="btn-danger"
+            ),
             cls="button-group"
         ),
+        Div(id=f"notice-{post_id}"),
         cls="post-card",
         id=f"post-{post_id}"
     )
 
 
-def render_edit_form(post_id: str, post: dict) -> Div:
-    """Render an edit form for a post."""
-    platform = post['platform'].lower()
-    char_limit = 280 if platform == "twitter" else 3000
+def render_edit_form(post: GeneratedPost) -> NotStr:
+    """Render an edit form for a post, cached per post version."""
+    return fragment_cache.render(post, "edit", _build_edit_form)
+
+
+def _build_edit_form(post: GeneratedPost) -> Div:
+    post_id = post.id
+    platform = post.platform.value
+    char_limit = get_rules(platform).max_length
     
     return Div(
-        H4(f"Edit {post['platform']} Post"),
+        H4(f"Edit {get_platform_handler(platform).label} Post"),
         Form(
             Textarea(
-                post['content'],
+                post.content,
                 name="content",
                 cls="edit-textarea",
                 placeholder="Edit your post here...",
-                maxlength=char_limit if platform == "twitter" else None,
-                hx_on__input=f"document.getElementById('char-count-{post_id}').textContent = 'Characters: ' + this.value.length + '/{char_limit}'"
+                hx_on__input=(
+                    f"document.getElementById('char-count-{post_id}').textContent = "
+                    f"'Characters: ' + {WEIGHTED_LENGTH_JS if get_rules(platform).weighted else 'this.value.length'} "
+                    f"+ '/{char_limit}'"
+                )
             ),
             Div(
-                f"Characters: {len(post['content'])}/{char_limit}",
+                f"Characters: {post_length(platform, post.content)}/{char_limit}",
                 id=f"char-count-{post_id}",
                 cls="char-count"
             ),
             Div(
                 Button("💾 Save", type="submit", cls="btn-primary"),
-                Button("❌ Cancel", hx_get=f"/cancel/{post_id}", cls="btn-secondary"),
+                Button(
+                    "❌ Cancel", hx_get=f"/cancel/{post_id}", hx_target=f"#post-{post_id}", hx_swap="outerHTML",
+                    cls="btn-secondary"
+                ),
                 cls="button-group"
             ),
             hx_post=f"/save/{post_id}",
@@ -155,7 +283,8 @@ def index():
     return Titled(
         "Social Media Agent",
         H1("Generate Social Media Posts"),
-        P("Enter a URL to generate Twitter and LinkedIn posts automatically."),
+        P("Enter a URL to generate Twitter, LinkedIn and Reddit posts automatically. "
+          "Select several styles to compare variants from a single run."),
         
         Form(
             Div(
@@ -173,30 +302,52 @@ def index():
             Div(
                 Label("Platforms:"),
                 Div(
-                    Label(
-                        Input(type="checkbox", name="twitter", value="on", checked=True),
-                        " Twitter"
-                    ),
-                    Label(
-                        Input(type="checkbox", name="linkedin", value="on", checked=True),
-                        " LinkedIn"
-                    ),
+                    *[
+                        Label(
+                            Input(
+                                type="checkbox",
+                                name=platform.value,
+                                value="on",
+                                checked=platform != SocialPlatform.REDDIT
+                            ),
+                            f" {get_platform_handler(platform).label}"
+                        )
+                        for platform in supported_platforms()
+                    ],
                     cls="form-group"
                 ),
             ),
             
             Div(
-                Label("Style:", _for="style"),
-                Select(
-                    Option("Professional", value="professional", selected=True),
-                    Option("Casual", value="casual"),
-                    Option("Technical", value="technical"),
-                    name="style",
-                    id="style"
+                Label("Subreddit (for Reddit posts):", _for="subreddit"),
+                Input(
+                    type="text",
+                    name="subreddit",
+                    id="subreddit",
+                    placeholder=settings.reddit_default_subreddit or "python"
                 ),
                 cls="form-group"
             ),
             
+            Div(
+                Label("Styles:"),
+                Div(
+                    *[
+                        Label(
+                            Input(
+                                type="checkbox",
+                                name=style.value,
+                                value="on",
+                                checked=style == PostStyle.PROFESSIONAL
+                            ),
+                            f" {style.value.title()}"
+                        )
+                        for style in PostStyle
+                    ],
+                    cls="form-group"
+                ),
+            ),
+            
             Button("Generate Posts", type="submit", cls="btn-primary"),
             hx_post="/generate",
             hx_target="#results",
@@ -204,19 +355,127 @@ def index():
         ),
         
         Div(id="results"),
+        P(A("Open the review queue →", href="/queue")),
+        render_live_updates(),
     )
 
 
+def _queue_filters(status: Optional[str], platform: Optional[str], source_url: Optional[str]) -> dict:
+    """Convert queue query parameters to post store filters."""
+    if not status or status == "review":
+        statuses = REVIEW_STATUSES
+    elif status == "all":
+        statuses = None
+    else:
+        statuses = PostStatus(status)
+    return {
+        "status": statuses,
+        "platform": SocialPlatform(platform) if platform else None,
+        "source_url": source_url or None,
+    }
+
+
+def render_queue_items(
+    status: Optional[str] = None,
+    platform: Optional[str] = None,
+    source_url: Optional[str] = None,
+    after: Optional[int] = None
+) -> tuple:
+    """
+    Render one page of the review queue.
+
+    The page ends with a loader that fetches the next page when it scrolls
+    into view and replaces itself with it, so the queue loads incrementally.
+    """
+    posts, cursor = post_store.page(after=after, limit=settings.queue_page_size,
+                                    **_queue_filters(status, platform, source_url))
+    items = [render_post_card(post) for post in posts]
+    if cursor is not None:
+        params = {"status": status, "platform": platform, "source_url": source_url, "after": cursor}
+        query = "&".join(f"{key}={quote_plus(str(value))}" for key, value in params.items() if value)
+        items.append(Div(
+            "Loading more posts...",
+            hx_get=f"/queue/items?{query}",
+            hx_trigger="revealed",
+            hx_swap="outerHTML",
+            cls="loading"
+        ))
+    elif after is None and not posts:
+        items.append(P("No posts match these filters."))
+    return tuple(items)
+
+
+@rt("/queue", methods=["GET"])
+async def review_queue(status: str = "review", platform: str = None, source_url: str = None):
+    """Review queue of stored posts, filtered and loaded page by page."""
+    try:
+        filters = _queue_filters(status, platform, source_url)
+    except ValueError as e:
+        return Div(Div(f"Error: {str(e)}", cls="error"))
+    total = post_store.count(**filters)
+
+    status_options = [("review", "In review"), ("all", "All")] + [
+        (member.value, member.label) for member in PostStatus
+    ]
+    return Titled(
+        "Review Queue",
+        Form(
+            Label("Status", Select(
+                *[Option(label, value=value, selected=value == status) for value, label in status_options],
+                name="status"
+            )),
+            Label("Platform", Select(
+                Option("All", value=""),
+                *[
+                    Option(get_platform_handler(member).label, value=member.value, selected=member.value == platform)
+                    for member in supported_platforms()
+                ],
+                name="platform"
+            )),
+            Label("Source URL", Input(type="url", name="source_url", value=source_url or "")),
+            Button("Filter", type="submit", cls="btn-secondary"),
+            method="get",
+            action="/queue",
+            cls="queue-filters"
+        ),
+        P(f"{total} posts", cls="queue-count"),
+        Div(
+            Button("✅ Approve All", hx_post="/approve-all", hx_target="#bulk-notice", cls="btn-primary"),
+            cls="button-group"
+        ),
+        Div(id="bulk-notice"),
+        Div(*render_queue_items(status, platform, source_url), id="queue-items"),
+        P(A("← Generate posts", href="/")),
+        render_live_updates(),
+    )
+
+
+@rt("/queue/items", methods=["GET"])
+async def queue_items(status: str = "review", platform: str = None, source_url: str = None, after: int = None):
+    """Next page of the review queue."""
+    try:
+        return render_queue_items(status, platform, source_url, after)
+    except ValueError as e:
+        return Div(f"Error: {str(e)}", cls="error")
+
+
 @rt("/generate", methods=["POST"])
-async def generate_posts(url: str, twitter: str = None, linkedin: str = None, style: str = "professional"):
-    """Generate posts from a URL."""
+async def generate_posts(
+    url: str,
+    twitter: str = None,
+    linkedin: str = None,
+    reddit: str = None,
+    subreddit: str = None,
+    professional: str = None,
+    casual: str = None,
+    technical: str = None,
+    style: str = None
+):
+    """Generate posts from a URL, one variant per selected style."""
     try:
         # Build platforms list from individual checkbox values
-        platforms = []
-        if twitter:
-            platforms.append("twitter")
-        if linkedin:
-            platforms.append("linkedin")
+        checked = {"twitter": twitter, "linkedin": linkedin, "reddit": reddit}
+        platforms = [platform.value for platform in supported_platforms() if checked.get(platform.value)]
         
         # Default to both if none selected
         if not platforms:
@@ -230,72 +489,90 @@ async def generate_posts(url: str, twitter: str = None, linkedin: str = None, st
             except ValueError:
                 pass
         
+        # Build styles list from style checkboxes, falling back to a single style value
+        selected_styles = [
+            name for name, checked in (
+                (PostStyle.PROFESSIONAL.value, professional),
+                (PostStyle.CASUAL.value, casual),
+                (PostStyle.TECHNICAL.value, technical),
+            )
+            if checked
+        ]
+        styles = get_requested_styles({"styles": selected_styles, "style": style})
+        
         # Create input for the graph
         input_data = {
             "url": url,
             "platforms": platform_enums,
-            "style": style
+            "styles": styles,
+            "subreddit": subreddit
         }
         
         # Run the graph
         result = await generate_post_graph.ainvoke({
             "input": input_data,
-            "content": None,
             "posts": [],
             "errors": [],
             "human_feedback": None,
             "is_approved": False
-        })
+        }, config=graph_config())
         
         # Try to generate posts using mock generator if content was scraped
         posts_list = []
         
-        if result.get("content"):
+        if result.get("content_hash"):
             # Content was successfully scraped, use mock generator
+            content = await asyncio.to_thread(content_store.get, result["content_hash"])
             for platform in platform_enums:
-                try:
-                    if platform == SocialPlatform.TWITTER:
-                        post_content = await mock_content_generator.generate_twitter_post(
-                            result["content"],
-                            style=style
+                for variant_style in styles:
+                    try:
+                        post_content = await mock_content_generator.generate_post(
+                            platform.value,
+                            content,
+                            style=variant_style
                         )
-                    elif platform == SocialPlatform.LINKEDIN:
-                        post_content = await mock_content_generator.generate_linkedin_post(
-                            result["content"],
-                            style=style
+                        post = GeneratedPost(
+                            platform=platform,
+                            content=post_content,
+                            status=PostStatus.PENDING_APPROVAL,
+                            style=variant_style,
+                            source_url=url,
+                            content_hash=result["content_hash"]
                         )
-                    else:
-                        continue
-                    
-                    post_id = str(uuid.uuid4())
-                    post_dict = {
-                        "platform": platform.value,
-                        "content": post_content,
-                        "status": "Pending Review"
-                    }
-                    posts_store[post_id] = post_dict
-                    posts_list.append((post_id, post_dict))
-                except Exception as e:
-                    pass
+                        handler = get_platform_handler(platform)
+                        if handler.prepare:
+                            handler.prepare(post, input_data)
+                        
+                        post_store.add(post)
+                        posts_list.append(post)
+                    except Exception as e:
+                        pass
         
         # If we have posts, render them
         if posts_list:
-            posts_html = []
-            for post_id, post in posts_list:
-                posts_html.append(render_post_card(post_id, post))
+            posts_html = [render_post_card(post) for post in posts_list]
             
             return Div(
                 Div(
                     H2("Generated Posts (Preview)"),
                     P("Review and edit the posts below before approving."),
+                    *(
+                        [P(
+                            f"⚠️ This content is nearly identical to {result['duplicate_of']['url']}, "
+                            "which was already processed.",
+                            cls="duplicate-notice"
+                        )]
+                        if result.get("duplicate_of") else []
+                    ),
                     cls="preview-section"
                 ),
                 *posts_html,
                 Div(
-                    Button("✅ Approve All", hx_post="/approve-all", cls="btn-primary"),
+                    Button("✅ Approve All", hx_post="/approve-all", hx_target="#bulk-notice", cls="btn-primary"),
                     Button("🗑️ Clear All", hx_delete="/clear", cls="btn-secondary"),
                     cls="button-group"
-                )
+                ),
+                Div(id="bulk-notice")
             )
         
         # If no posts generated, show errors or message
@@ -321,51 +598,68 @@ async def generate_posts(url: str, twitter: str = None, linkedin: str = None, st
 @rt("/edit/{post_id}", methods=["GET"])
 async def edit_post(post_id: str):
     """Show edit form for a post."""
-    if post_id not in posts_store:
+    post = post_store.get(post_id)
+    if post is None:
         return Div(Div("Post not found", cls="error"))
     
-    post = posts_store[post_id]
-    return render_edit_form(post_id, post)
+    return render_edit_form(post)
 
 
 @rt("/save/{post_id}", methods=["POST"])
 async def save_post(post_id: str, content: str):
     """Save edited post."""
-    if post_id not in posts_store:
+    post = post_store.update(post_id, content=content, status=PostStatus.EDITED)
+    if post is None:
         return Div(Div("Post not found", cls="error"))
     
-    posts_store[post_id]["content"] = content
-    posts_store[post_id]["status"] = "Edited"
-    
-    return render_post_card(post_id, posts_store[post_id])
+    return render_post_card(post)
 
 
 @rt("/cancel/{post_id}", methods=["GET"])
 async def cancel_edit(post_id: str):
     """Cancel editing and return to post view."""
-    if post_id not in posts_store:
+    post = post_store.get(post_id)
+    if post is None:
         return Div(Div("Post not found", cls="error"))
     
-    return render_post_card(post_id, posts_store[post_id])
+    return render_post_card(post)
 
 
 @rt("/approve/{post_id}", methods=["POST"])
 async def approve_post(post_id: str):
-    """Approve a single post."""
-    if post_id in posts_store:
-        posts_store[post_id]["status"] = "Approved"
+    """Approve a single post, unless it nearly duplicates a recently published one."""
+    post = post_store.get(post_id)
+    if post is None:
+        return Div(Div("Post not found", cls="error"))
+
+    duplicate = find_published_duplicate(post.platform.value, post.content, exclude=post_id)
+    if duplicate and settings.published_duplicate_action == "block":
+        post = post_store.update(post_id, duplicate_of=duplicate.post_id)
+        return (
+            Div(
+                f"⚠️ Not approved: {duplicate.similarity:.0%} similar to a post already "
+                f"published on {post.platform.value}.",
+                cls="error"
+            ),
+            render_status_badges(post, oob=True)
+        )
+
+    fields = {"status": PostStatus.APPROVED}
+    if duplicate:
+        fields["duplicate_of"] = duplicate.post_id
+    post = post_store.update(post_id, **fields)
+    message = "✅ Post approved!"
+    if duplicate:
+        message += f" ⚠️ It is {duplicate.similarity:.0%} similar to a recently published post."
     
-    return Div(
-        Div(f"✅ Post approved!", cls="success"),
-        hx_swap="outerHTML"
-    )
+    return Div(message, cls="success"), render_status_badges(post, oob=True)
 
 
 @rt("/reject/{post_id}", methods=["POST"])
 async def reject_post(post_id: str):
     """Reject a single post."""
-    if post_id in posts_store:
-        del posts_store[post_id]
+    post_store.delete(post_id)
+    fragment_cache.invalidate(post_id)
     
     return Div(
         Div(f"❌ Post rejected and removed.", cls="error"),
@@ -375,29 +669,246 @@ async def reject_post(post_id: str):
 
 @rt("/approve-all", methods=["POST"])
 async def approve_all():
-    """Approve all posts."""
-    for post_id in posts_store:
-        posts_store[post_id]["status"] = "Approved"
-    
-    return Div(
-        Div(f"✅ All {len(posts_store)} posts approved!", cls="success"),
-        hx_swap="outerHTML"
-    )
+    """
+    Approve all posts in the review queue, skipping near duplicates of published posts.
+
+    Returns a summary plus out-of-band status badges for every changed post,
+    so cards already on the page are updated without re-rendering them.
+    """
+    def approve_queue():
+        updates = []
+        for status in REVIEW_STATUSES:
+            for post in post_store.list(status=status):
+                duplicate = find_published_duplicate(post.platform.value, post.content, exclude=post.id)
+                if duplicate and settings.published_duplicate_action == "block":
+                    updates.append((post.id, {"duplicate_of": duplicate.post_id}))
+                else:
+                    updates.append((post.id, {"status": PostStatus.APPROVED}))
+        # One transaction for the whole queue
+        return post_store.update_many(updates)
+
+    changed = await asyncio.to_thread(approve_queue)
+    approved = sum(post.status == PostStatus.APPROVED for post in changed)
+    skipped = len(changed) - approved
+
+    message = f"✅ All {approved} posts approved!"
+    if skipped:
+        message = f"✅ {approved} posts approved. ⚠️ {skipped} skipped as near duplicates of published posts."
+    return Div(message, cls="success"), *[render_status_badges(post, oob=True) for post in changed]
 
 
 @rt("/clear", methods=["DELETE"])
 async def clear_posts():
-    """Clear all posts."""
-    posts_store.clear()
+    """Clear all posts that have not been published."""
+    post_store.clear(include_published=False)
+    fragment_cache.clear()
     return Div("")
 
 
+# Feed watcher, started with the app when enabled
+feed_watcher = None
+feed_watcher_task = None
+
+
+async def ingest_feed_url(url: str) -> dict:
+    """
+    Run the graph for a URL found by the feed watcher and queue its posts for review.
+
+    Raises:
+        RuntimeError: If the graph failed without producing posts, so the URL is retried later
+    """
+    result = await ingest_url(url)
+    posts, errors = result.get("posts", []), result.get("errors", [])
+    if errors and not posts:
+        raise RuntimeError(errors[0])
+    metrics.incr("feed_ingest_errors_total", len(errors))
+    for post in posts:
+        post.status = PostStatus.PENDING_APPROVAL
+        post.source_url = post.source_url or url
+        post_store.add(post)
+    return result
+
+
+@app.lifespan.on_event("startup")
+async def start_loop_monitor():
+    """Start measuring event-loop lag and detecting blocking callbacks."""
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+
+
+@app.lifespan.on_event("shutdown")
+async def stop_loop_monitor():
+    """Stop the event-loop monitor."""
+    loop_monitor.stop()
+
+
+@app.lifespan.on_event("startup")
+async def load_published_index():
+    """Load posts published within the duplicate window into the published-post index."""
+    await asyncio.to_thread(published_index.sync)
+
+
+@app.lifespan.on_event("startup")
+async def start_feed_watcher():
+    """Start polling configured feeds and sitemaps."""
+    global feed_watcher, feed_watcher_task
+    if settings.feed_watcher_enabled and settings.feed_urls:
+        feed_watcher = FeedWatcher(ingest=ingest_feed_url)
+        feed_watcher_task = asyncio.create_task(feed_watcher.run())
+
+
+@app.lifespan.on_event("shutdown")
+async def stop_feed_watcher():
+    """Stop the feed watcher."""
+    if feed_watcher is not None:
+        await feed_watcher.stop()
+        await asyncio.gather(feed_watcher_task, return_exceptions=True)
+
+
+@rt("/events", methods=["GET"])
+async def event_stream():
+    """Server-sent events stream of post lifecycle events, for live updates in every open tab."""
+    subscription = live_updates.subscribe()
+
+    async def stream():
+        try:
+            while True:
+                message = await subscription.get(timeout=settings.event_heartbeat_seconds)
+                # Comment lines keep idle connections open through proxies
+                yield message if message is not None else ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    return EventStream(stream())
+
+
+def render_trace(spans: list) -> Div:
+    """Render a trace as a timeline of its spans, indented by depth."""
+    start = min(span.start for span in spans)
+    total_ms = max(max((span.start - start) * 1000 + span.duration_ms for span in spans), 0.001)
+    depths = {}
+    rows = []
+    for span in spans:
+        depth = depths[span.span_id] = depths.get(span.parent_id, -1) + 1
+        offset = (span.start - start) * 1000
+        attributes = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+        rows.append(Div(
+            Div(span.name, title=attributes, cls="trace-name", style=f"padding-left: {depth}em"),
+            Div(
+                Div(
+                    cls="trace-bar",
+                    style=f"left: {offset / total_ms:.2%}; width: {span.duration_ms / total_ms:.2%}",
+                    title=span.error or attributes
+                ),
+                cls="trace-track"
+            ),
+            Div(f"{span.duration_ms:9.1f} ms"),
+            cls="trace-row trace-error" if span.status == "error" else "trace-row"
+        ))
+    return Div(*rows)
+
+
+@rt("/debug/traces", methods=["GET"])
+async def debug_traces():
+    """Recent traces kept in memory, newest first."""
+    if not tracer.enabled:
+        return Div(Div("Tracing is disabled; set TRACING_ENABLED=true.", cls="error"))
+
+    rows = []
+    for spans in tracer.buffer.traces():
+        root = next((span for span in spans if span.parent_id is None), None) or min(spans, key=lambda s: s.start)
+        errors = sum(span.status == "error" for span in spans)
+        rows.append(Tr(
+            Td(time.strftime("%H:%M:%S", time.localtime(root.start))),
+            Td(A(root.name, href=f"/debug/traces/{root.trace_id}")),
+            Td(f"{root.duration_ms:.1f} ms"),
+            Td(len(spans)),
+            Td(errors or ""),
+        ))
+    return Titled(
+        "Traces",
+        Table(Thead(Tr(Th("Time"), Th("Root span"), Th("Duration"), Th("Spans"), Th("Errors"))), Tbody(*rows))
+    )
+
+
+@rt("/debug/traces/{trace_id}", methods=["GET"])
+async def debug_trace(trace_id: str):
+    """Timeline of one trace."""
+    spans = tracer.buffer.trace(trace_id)
+    if not spans:
+        return Div(Div("Trace not found", cls="error"))
+    return Titled(f"Trace {trace_id}", render_trace(spans), P(A("← All traces", href="/debug/traces")))
+
+
+def _profiling_denied(req) -> Optional[Response]:
+    """Return an error response unless profiling is enabled and the admin token matches."""
+    if not settings.profiling_enabled:
+        return Response("Not found", status_code=404)
+    token = settings.profiling_admin_token
+    if token and req.headers.get("x-admin-token") != token:
+        return Response("Forbidden", status_code=403)
+    return None
+
+
+@rt("/admin/profile/start", methods=["POST"])
+async def start_profiling(req, seconds: float = None, interval_ms: float = None, slow_callback_ms: float = None):
+    """Start a sampling profile (and slow-callback monitoring) for a time window."""
+    denied = _profiling_denied(req)
+    if denied:
+        return denied
+    try:
+        profiling_session.start(seconds, interval_ms, slow_callback_ms)
+    except RuntimeError as e:
+        return Response(str(e), status_code=409)
+    return profiling_session.summary()
+
+
+@rt("/admin/profile/stop", methods=["POST"])
+async def stop_profiling(req):
+    """Stop the running profile and return its summary."""
+    denied = _profiling_denied(req)
+    if denied:
+        return denied
+    profiling_session.stop()
+    return profiling_session.summary()
+
+
+@rt("/admin/profile", methods=["GET"])
+async def profiling_summary(req):
+    """Summary of the running or last profile: top stacks, slow callbacks and tasks."""
+    denied = _profiling_denied(req)
+    if denied:
+        return denied
+    return profiling_session.summary()
+
+
+@rt("/admin/profile/folded", methods=["GET"])
+async def profiling_folded(req):
+    """Sampled stacks of the running or last profile in folded format, for flamegraph tools."""
+    denied = _profiling_denied(req)
+    if denied:
+        return denied
+    return Response(profiling_session.folded(), media_type="text/plain")
+
+
+@rt("/debug/loop", methods=["GET"])
+async def debug_loop():
+    """Event-loop lag percentiles and the stacks of recent blocking callbacks."""
+    return loop_monitor.snapshot()
+
+
 @rt("/health", methods=["GET"])
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
 
+@rt("/metrics", methods=["GET"])
+async def metrics_snapshot():
+    """Metrics endpoint (LLM token and prompt-cache usage, among others)."""
+    return metrics.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
     print("Starting Social Media Agent on 0.0.0.0:5001")
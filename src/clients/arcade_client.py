@@ -2,7 +2,9 @@
 
 from typing import Optional, Dict, Any
 import os
+from src.clients.arcade_mock import ArcadeMockClient
 from src.config import settings
+from src.utils.tracing import traced
 
 # Try to import real Arcade, fall back to mock
 try:
@@ -10,7 +12,6 @@ try:
     ARCADE_AVAILABLE = True
 except ImportError:
     ARCADE_AVAILABLE = False
-    from src.clients.arcade_mock import ArcadeMockClient as Arcade
 
 
 class ArcadeClient:
@@ -18,10 +19,10 @@ class ArcadeClient:
 
     def __init__(self):
         """Initialize the Arcade client."""
-        if ARCADE_AVAILABLE:
+        if ARCADE_AVAILABLE and not settings.arcade_use_mock:
             self.client = Arcade(api_key=settings.arcade_api_key)
         else:
-            self.client = Arcade()
+            self.client = ArcadeMockClient()
         self.user_id = settings.arcade_user_id
 
     async def authenticate_twitter(self) -> Optional[Dict[str, Any]]:
@@ -53,6 +54,7 @@ class ArcadeClient:
             print(f"Error authenticating with LinkedIn: {str(e)}")
             return None
 
+    @traced("arcade.post_to_twitter")
     async def post_to_twitter(self, content: str, media_urls: Optional[list] = None) -> Optional[str]:
         """
         Post content to Twitter.
@@ -76,6 +78,7 @@ class ArcadeClient:
             print(f"Error posting to Twitter: {str(e)}")
             return None
 
+    @traced("arcade.post_to_linkedin")
     async def post_to_linkedin(self, content: str, media_urls: Optional[list] = None) -> Optional[str]:
         """
         Post content to LinkedIn.
@@ -100,6 +103,33 @@ class ArcadeClient:
             print(f"Error posting to LinkedIn: {str(e)}")
             return None
 
+    @traced("arcade.post_to_reddit")
+    async def post_to_reddit(self, subreddit: str, title: str, body: str) -> Optional[str]:
+        """
+        Submit a text post to a subreddit.
+
+        Args:
+            subreddit: Target subreddit name (without the r/ prefix)
+            title: The post title
+            body: The post body (markdown)
+
+        Returns:
+            Post ID or None if posting fails
+        """
+        try:
+            result = await self.client.post(
+                "reddit",
+                user_id=self.user_id,
+                subreddit=subreddit,
+                title=title,
+                content=body
+            )
+            return result.get("id")
+        except Exception as e:
+            print(f"Error posting to Reddit: {str(e)}")
+            return None
+
+    @traced("arcade.schedule_post")
     async def schedule_post(
         self,
         platform: str,
@@ -29,6 +29,19 @@ class ArcadeMockClient:
         """Mock LinkedIn post."""
         return f"mock_linkedin_{hash(content) % 1000}"
 
+    async def post_to_reddit(self, subreddit: str, title: str, body: str) -> Optional[str]:
+        """Mock Reddit submission."""
+        return f"mock_reddit_{subreddit}_{hash(title + body) % 1000}"
+
+    async def authenticate(self, platform: str, user_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Mock authentication for any platform."""
+        self.authenticated = True
+        return {"token": "mock_token", "user_id": user_id or "mock_user"}
+
+    async def post(self, platform: str, user_id: Optional[str] = None, content: str = "", **kwargs) -> Dict[str, Any]:
+        """Mock post to any platform, as called by ArcadeClient."""
+        return {"id": f"mock_{platform}_{hash(content + str(kwargs.get('title', ''))) % 1000}"}
+
     async def schedule_post(
         self,
         platform: str,
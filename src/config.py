@@ -1,7 +1,7 @@
 """Configuration management for the social media agent application."""
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -11,15 +11,136 @@ class Settings(BaseSettings):
     langsmith_api_key: Optional[str] = None
     langsmith_tracing_v2: bool = True
 
+    # Local Tracing (spans per request, graph node and upstream call)
+    tracing_enabled: bool = False
+    # Spans kept in memory for /debug/traces
+    tracing_buffer_size: int = 10000
+    # Optional JSONL file spans are also written to
+    tracing_jsonl_path: Optional[str] = None
+
+    # Runtime Profiling (admin endpoints under /admin/profile; disabled unless enabled here)
+    profiling_enabled: bool = False
+    # Required in the X-Admin-Token header when set
+    profiling_admin_token: Optional[str] = None
+    profiling_max_seconds: float = 300.0
+    profiling_interval_ms: float = 5.0
+    profiling_slow_callback_ms: float = 100.0
+
+    # Event-Loop Monitoring (lag percentiles in /metrics, blocking callbacks at /debug/loop)
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: float = 100.0
+    loop_block_threshold_ms: float = 100.0
+
     # LLM Configuration
     anthropic_api_key: str
+    # Alternative Anthropic API endpoint (e.g. a local stand-in for load tests)
+    anthropic_base_url: Optional[str] = None
+
+    # Content Generation
+    max_content_chars: int = 12000
+
+    # LLM Model Routing
+    llm_default_model: str = "claude-3-5-sonnet-20241022"
+    llm_default_timeout: float = 30.0
+    llm_fast_model: str = "claude-3-5-haiku-20241022"
+    llm_fast_timeout: float = 10.0
+    llm_fast_max_input_chars: int = 8000
+    # Tier per task; platform tasks default to their handler's model tier
+    llm_routes: Dict[str, str] = {
+        "key_points": "fast",
+        "summarize": "fast",
+    }
+
+    # LLM Rate Limiting (process-wide, adaptive)
+    llm_requests_per_minute: int = 50
+    llm_tokens_per_minute: int = 40000
+    llm_max_concurrency: int = 8
+    llm_min_concurrency: int = 1
+    llm_latency_target_seconds: float = 20.0
+
+    # Request Hedging (LLM and scrape calls)
+    hedging_enabled: bool = False
+    hedging_percentile: float = 0.95
+    hedging_budget: float = 0.05
+    hedging_min_samples: int = 20
 
     # Web Scraping
     firecrawl_api_key: str
+    firecrawl_api_url: str = "https://api.firecrawl.dev"
+    # Primary engine (firecrawl or local) and how engines combine (single, fallback, race)
+    scrape_engine: str = "firecrawl"
+    scrape_strategy: str = "single"
+    scrape_domain_engines: Dict[str, str] = {}
+    scrape_timeout: float = 20.0
+    scrape_max_connections: int = 20
+    scrape_user_agent: str = "Mozilla/5.0 (compatible; SocialMediaAgent/0.1)"
+    # Formats kept in scrape results (markdown is always kept; add "html" to keep raw HTML)
+    scrape_formats: List[str] = ["markdown"]
+    scrape_max_document_bytes: int = 2_000_000
+    scrape_extract_concurrency: int = 2
+    scrape_cache_ttl_seconds: float = 900.0
+    scrape_cache_max_entries: int = 1024
+
+    # Scraped documents stored once by content hash (graph state and posts hold the hash)
+    content_store_path: str = "data/content"
+    content_store_zstd_level: int = 3
+
+    # Near-Duplicate Detection of scraped content
+    # reuse: generate from the earlier duplicate's cached posts; flag: mark posts only; off
+    near_duplicate_action: str = "reuse"
+    near_duplicate_max_distance: int = 3
+    near_duplicate_min_shingles: int = 20
+    near_duplicate_max_entries: int = 10000
+
+    # Post Store and Published-Post Duplicate Checks
+    post_store_path: str = "data/posts.sqlite3"
+    # block: refuse to publish/approve near duplicates; flag: allow but mark them; off
+    published_duplicate_action: str = "block"
+    published_duplicate_window_hours: float = 72.0
+    published_duplicate_threshold: float = 0.7
+
+    # Content Fan-Out (summary and key points generated in parallel with the posts)
+    generate_summary: bool = True
+    generate_key_points: bool = True
+    summary_max_length: int = 500
+    # Generate short-form posts (e.g. tweets) from the summary instead of the condensed content
+    summarize_for_short_form: bool = True
+
+    # Review queue page size (posts loaded per infinite-scroll request)
+    queue_page_size: int = 25
+
+    # Live post lifecycle events pushed to browsers over server-sent events
+    event_queue_size: int = 100
+    event_heartbeat_seconds: float = 15.0
+
+    # Rendered post card and edit form fragments kept in memory (keyed by post id and version)
+    fragment_cache_max_entries: int = 2048
+
+    # Serialization of graph state, checkpoints and stored post metadata (msgpack)
+    # zstd (needs the zstandard package) or none; applies to text of at least compress_min_bytes
+    serializer_compression: str = "zstd"
+    serializer_compress_min_bytes: int = 4096
+    serializer_zstd_level: int = 3
+    # Checkpoint graph runs in memory (thread id per run), using the msgpack serializer
+    graph_checkpointing: bool = False
+
+    # Feed Watcher (RSS/Atom feeds and sitemaps polled for new URLs)
+    feed_watcher_enabled: bool = False
+    feed_urls: List[str] = []
+    feed_poll_interval_seconds: float = 300.0
+    feed_max_poll_interval_seconds: float = 3600.0
+    feed_fetch_concurrency: int = 20
+    feed_ingest_concurrency: int = 2
+    feed_queue_size: int = 1000
+    feed_seen_db_path: str = "data/seen_urls.sqlite3"
+    feed_bloom_capacity: int = 1_000_000
+    feed_bloom_error_rate: float = 0.001
 
     # Social Media Authentication
     arcade_api_key: str
     arcade_user_id: str
+    # Use the mock Arcade client even when the arcade package is installed (e.g. load tests)
+    arcade_use_mock: bool = False
 
     # Twitter Configuration
     twitter_api_key: Optional[str] = None
@@ -31,6 +152,9 @@ class Settings(BaseSettings):
     twitter_user_token_secret: Optional[str] = None
     twitter_user_id: Optional[str] = None
 
+    # Reddit Configuration
+    reddit_default_subreddit: Optional[str] = None
+
     # LinkedIn Configuration
     linkedin_user_id: Optional[str] = None
     linkedin_organization_id: Optional[str] = None
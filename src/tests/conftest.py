@@ -0,0 +1,70 @@
+"""Shared fixtures for the test suite."""
+
+import functools
+import hashlib
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import pytest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """
+    Static file handler with ETag support that records response statuses.
+
+    Last-Modified / If-Modified-Since handling comes from SimpleHTTPRequestHandler.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_response(self, code, message=None):
+        self.server.statuses.append(code)
+        super().send_response(code, message)
+
+    def end_headers(self):
+        if getattr(self, "_etag", None):
+            self.send_header("ETag", self._etag)
+        super().end_headers()
+
+    def send_head(self):
+        self._etag = None
+        path = self.translate_path(self.path)
+        if self.server.use_etags and os.path.isfile(path):
+            self._etag = f'"{hashlib.sha1(Path(path).read_bytes()).hexdigest()}"'
+            if self.headers.get("If-None-Match") == self._etag:
+                self.send_response(304)
+                self.end_headers()
+                return None
+        return super().send_head()
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Local HTTP server for the fixtures directory."""
+
+    daemon_threads = True
+
+    def __init__(self, directory: Path):
+        super().__init__(("127.0.0.1", 0), functools.partial(_FixtureHandler, directory=str(directory)))
+        self.statuses = []
+        self.use_etags = True
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture
+def fixture_server():
+    """Serve the fixtures directory over HTTP on a free local port."""
+    server = FixtureServer(FIXTURES_DIR)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,79 @@
+"""Local fakes shared by the test suite."""
+
+import asyncio
+from typing import Any, List, Optional
+from pydantic import Field
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class FakeCachingChatModel(BaseChatModel):
+    """
+    Chat model that echoes a canned reply and simulates Anthropic prompt caching.
+
+    A system block marked with ``cache_control`` is reported as a cache write the
+    first time it is seen and as a cache read afterwards. Token counts are
+    approximated as one token per four characters. ``delay`` adds latency to
+    async calls and ``error`` makes every call fail.
+    """
+
+    reply: str = "Generated post"
+    delay: float = 0.0
+    error: Optional[Exception] = None
+    calls: List[List[BaseMessage]] = Field(default_factory=list)
+    cached_prefixes: set = Field(default_factory=set)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-caching-chat-model"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        self.calls.append(messages)
+        if self.error is not None:
+            raise self.error
+
+        cache_read = cache_write = uncached = 0
+        for message in messages:
+            blocks = message.content if isinstance(message.content, list) else [
+                {"type": "text", "text": message.content}
+            ]
+            for block in blocks:
+                tokens = len(block["text"]) // 4
+                if "cache_control" not in block:
+                    uncached += tokens
+                elif block["text"] in self.cached_prefixes:
+                    cache_read += tokens
+                else:
+                    self.cached_prefixes.add(block["text"])
+                    cache_write += tokens
+
+        output_tokens = len(self.reply) // 4
+        input_tokens = uncached + cache_read + cache_write
+        message = AIMessage(
+            content=self.reply,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "input_token_details": {"cache_read": cache_read, "cache_creation": cache_write},
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self._generate(messages, stop=stop, **kwargs)
@@ -0,0 +1,101 @@
+"""Tests for the web app's review queue and live updates."""
+
+import asyncio
+import pytest
+from unittest.mock import patch
+from fasthtml.common import to_xml
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+from src.utils.fragment_cache import FragmentCache
+from src.utils.post_store import PostStore
+
+
+@pytest.fixture
+def app_store():
+    """Point the web app at an in-memory post store with a small queue page size."""
+    from src import app
+
+    store = PostStore(":memory:")
+    with patch.object(app, "post_store", store), \
+            patch.object(app, "fragment_cache", FragmentCache(max_entries=100)), \
+            patch.object(app.settings, "queue_page_size", 2):
+        yield store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_queue_loads_pages_until_the_last(app_store):
+    """Test that each queue page ends with a loader for the next until none is left."""
+    from src.app import queue_items, review_queue
+
+    for i in range(3):
+        app_store.add(GeneratedPost(SocialPlatform.TWITTER, f"Post {i}", PostStatus.PENDING_APPROVAL))
+    app_store.add(GeneratedPost(SocialPlatform.TWITTER, "Done", PostStatus.APPROVED))
+
+    page = to_xml(await review_queue(status="review"))
+    assert "3 posts" in page
+    assert "Post 0" in page and "Post 1" in page and "Post 2" not in page
+    assert 'hx-trigger="revealed"' in page
+
+    cursor = app_store.page(status=PostStatus.PENDING_APPROVAL, limit=2)[1]
+    more = to_xml(await queue_items(status="review", after=cursor))
+    assert "Post 2" in more and "Done" not in more and "revealed" not in more
+
+
+@pytest.mark.asyncio
+async def test_approve_all_approves_the_review_queue(app_store):
+    """Test that every post under review is approved and gets an out-of-band badge."""
+    from src.app import approve_all
+
+    ids = [app_store.add(GeneratedPost(SocialPlatform.TWITTER, f"Post {i}", PostStatus.PENDING_APPROVAL))
+           for i in range(3)]
+
+    with patch("src.app.find_published_duplicate", return_value=None):
+        summary, *badges = await approve_all()
+
+    assert "All 3 posts approved" in to_xml(summary)
+    assert len(badges) == 3
+    assert all(app_store.get(post_id).status == PostStatus.APPROVED for post_id in ids)
+
+
+@pytest.mark.asyncio
+async def test_event_stream_pushes_rendered_post_events(app_store):
+    """Test that a post event reaches a connected stream with out-of-band badges."""
+    from src.app import event_stream, publish_live_event
+    from src.utils.events import PostEvent
+
+    response = await event_stream()
+    messages = response.body_iterator
+    pending = asyncio.ensure_future(messages.__anext__())
+    await asyncio.sleep(0)
+
+    post = GeneratedPost(SocialPlatform.REDDIT, "Post", PostStatus.APPROVED, id="p1")
+    publish_live_event(PostEvent("approved", post.id, post))
+    message = await asyncio.wait_for(pending, timeout=1)
+
+    assert message.startswith("event: post\ndata: <li>")
+    assert "Reddit post approved" in message
+    assert 'data: <span hx-swap-oob="true" id="badges-p1">' in message
+
+    publish_live_event(PostEvent("deleted", "p1"))
+    message = await asyncio.wait_for(messages.__anext__(), timeout=1)
+    assert '<div hx-swap-oob="delete" id="post-p1"></div>' in message
+    await messages.aclose()
+
+
+@pytest.mark.asyncio
+async def test_requests_are_traced_and_viewable():
+    """Test that a request gets a root span, a trace id header and a debug timeline."""
+    import httpx
+    from src import app
+    from src.utils import tracing
+
+    enabled = tracing.Tracer(enabled=True, buffer_size=100)
+    with patch.object(tracing, "tracer", enabled), patch.object(app, "tracer", enabled):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app.app), base_url="http://test") as client:
+            response = await client.get("/health")
+            trace_id = response.headers["x-trace-id"]
+            timeline = await client.get(f"/debug/traces/{trace_id}")
+
+    span, = enabled.buffer.trace(trace_id)
+    assert (span.name, span.attributes["status_code"]) == ("GET /health", 200)
+    assert "GET /health" in timeline.text and "x-trace-id" not in timeline.headers
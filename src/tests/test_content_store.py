@@ -0,0 +1,46 @@
+"""Tests for the content-addressed store of scraped documents."""
+
+import pytest
+from unittest.mock import patch
+from src.utils import content_store as content_store_module
+from src.utils.content_store import ContentStore
+from src.utils.metrics import metrics
+from src.utils.scrape_cache import content_hash
+
+ARTICLE = "# Tender notice\n\n" + "The city invites bids for the maintenance of bike lanes. " * 200
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A content store in a temporary directory."""
+    return ContentStore(str(tmp_path / "content"))
+
+
+def test_documents_are_stored_once_by_hash(store):
+    """Test that a document is written compressed once and read back intact."""
+    metrics.reset()
+    digest = store.put(ARTICLE)
+
+    assert digest == content_hash(ARTICLE)
+    assert digest in store
+    assert store.put(ARTICLE, digest) == digest
+    assert metrics.counter("content_store_writes_total") == 1
+    assert metrics.counter("content_store_known_total") == 1
+    assert store.path_for(digest).stat().st_size < len(ARTICLE) / 10
+    assert store.get(digest) == ARTICLE
+    assert [path.name for path in store.root.rglob("*") if path.is_file()] == [digest]
+
+
+def test_missing_documents_raise_key_error(store):
+    """Test that reading an unknown hash raises KeyError."""
+    with pytest.raises(KeyError):
+        store.get("0" * 64)
+
+
+def test_reads_documents_written_without_zstd(store):
+    """Test that zlib-compressed documents (written without zstandard) are still readable."""
+    with patch.object(content_store_module, "ZSTD_AVAILABLE", False):
+        zlib_store = ContentStore(str(store.root))
+    digest = zlib_store.put("Plain article text")
+
+    assert store.get(digest) == "Plain article text"
@@ -0,0 +1,130 @@
+"""Tests for near-duplicate detection of scraped content."""
+
+import pytest
+from unittest.mock import patch
+from src.agents.generate_post_graph import generate_posts_node, scrape_content_node
+from src.agents.types import SocialPlatform
+from src.utils.dedup import MinHashLSH, SimHashIndex, estimate_jaccard, hamming_distance, minhash, simhash
+from src.utils.scrape_cache import ScrapeCache, content_hash
+
+TOPICS = [
+    "bike lanes", "bus priority", "street lighting", "pedestrian crossings", "parking",
+    "delivery access", "tree planting", "drainage", "signal timing", "school streets",
+    "cycle parking", "road resurfacing",
+]
+ARTICLE = " ".join(
+    f"Phase {i + 1} of the council plan covers {topic} in district {i * 7 % 12 + 1}, with a budget "
+    f"of {i * 3 + 2} million and works expected to last {i % 5 + 3} months before residents are "
+    "consulted again."
+    for i, topic in enumerate(TOPICS)
+)
+SYNDICATED = (
+    "Reposted from City News. "
+    + ARTICLE.replace("district 8", "the eighth district")
+    + " Share this story."
+)
+UNRELATED = " ".join(
+    f"Trial {i + 1} of the battery study measured {topic} degradation in cell batch {i * 5 % 11}, "
+    f"showing capacity loss of {i + 4} percent after {i * 50 + 100} charge cycles in cold conditions."
+    for i, topic in enumerate(TOPICS)
+)
+
+
+def test_simhash_is_close_for_near_duplicates():
+    """Test that a lightly edited copy stays within a few bits and other text does not."""
+    original = simhash(ARTICLE)
+
+    assert hamming_distance(original, simhash(SYNDICATED)) <= 3
+    assert hamming_distance(original, simhash(UNRELATED)) > 10
+
+
+def test_simhash_skips_short_text():
+    """Test that texts with too few shingles get no fingerprint."""
+    assert simhash("Too short to fingerprint") is None
+
+
+def test_index_finds_match_through_bands():
+    """Test lookup of the closest fingerprint within the distance limit."""
+    index = SimHashIndex(max_distance=3, max_entries=10)
+    index.add("a", 0b1111 << 60, url="https://example.com/a")
+    index.add("b", 0, url="https://example.com/b")
+
+    match = index.find(0b111)
+    assert (match.key, match.url, match.distance) == ("b", "https://example.com/b", 3)
+    assert index.find(0b1111) is None
+    assert index.find(0, exclude="b") is None
+
+
+def test_index_evicts_oldest_entries():
+    """Test that the index is bounded and evicted keys are no longer matched."""
+    index = SimHashIndex(max_distance=2, max_entries=2)
+    index.add("a", 1)
+    index.add("b", 1 << 40)
+    index.add("c", 1 << 20)
+
+    assert len(index) == 2
+    assert index.find(1).key != "a"
+    assert all(key != "a" for band in index._bands for keys in band.values() for key in keys)
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_reuses_generated_posts():
+    """Test that a syndicated copy at another URL reuses the first article's posts."""
+    calls = []
+
+    async def fake_scrape(url):
+        content = ARTICLE if url.endswith("original") else SYNDICATED
+        return {"content": content, "content_hash": content_hash(content)}
+
+    async def fake_variants(platform, content, styles):
+        calls.append(platform)
+        return {style: f"{platform}:{style}" for style in styles}
+
+    def make_state(url):
+        return {
+            "input": {"url": url, "platforms": [SocialPlatform.TWITTER], "style": "casual"},
+            "posts": [],
+            "errors": [],
+        }
+
+    with patch("src.agents.generate_post_graph.scraper.scrape_url", fake_scrape), \
+            patch("src.agents.generate_post_graph.scraper.cache", ScrapeCache(ttl=0)), \
+            patch("src.agents.generate_post_graph.content_index", SimHashIndex()), \
+            patch("src.agents.generate_post_graph.content_generator.generate_variants", fake_variants):
+        first = make_state("https://a.example.com/original")
+        first.update(await scrape_content_node(first))
+        first.update(await generate_posts_node(first))
+        second = make_state("https://b.example.com/copy")
+        second.update(await scrape_content_node(second))
+        second.update(await generate_posts_node(second))
+
+    assert first["duplicate_of"] is None
+    assert second["duplicate_of"]["url"] == "https://a.example.com/original"
+    assert second["content_hash"] == content_hash(ARTICLE)
+    assert calls == ["twitter"]
+    assert second["posts"][0].content == "twitter:casual"
+    assert second["posts"][0].metadata["reused"] is True
+    assert second["posts"][0].metadata["duplicate_of"] == "https://a.example.com/original"
+
+
+def test_minhash_estimates_similarity_of_posts():
+    """Test that a reworded post scores high and an unrelated post scores low."""
+    post = "Big news: the city approves 12 km of protected bike lanes downtown! Construction starts next spring."
+    reworded = "BIG NEWS - the city approves 12km of protected bike lanes downtown. Construction starts next spring 🚲"
+    unrelated = "New study: a cold-weather electrolyte halves capacity loss in lithium cells over two years."
+
+    assert estimate_jaccard(minhash(post), minhash(reworded)) > 0.7
+    assert estimate_jaccard(minhash(post), minhash(unrelated)) < 0.2
+
+
+def test_minhash_lsh_returns_matches_above_threshold():
+    """Test that LSH lookup returns only sufficiently similar entries, best first."""
+    index = MinHashLSH(threshold=0.7)
+    index.add("a", minhash("Protected bike lanes are coming to the downtown core next spring"))
+    index.add("b", minhash("Battery researchers halve capacity loss in cold weather"))
+
+    matches = index.query(minhash("Protected bike lanes are coming to the downtown core this spring!"))
+    assert [match.key for match in matches] == ["a"]
+
+    index.remove("a")
+    assert index.query(minhash("Protected bike lanes are coming to the downtown core next spring")) == []
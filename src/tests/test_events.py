@@ -0,0 +1,81 @@
+"""Tests for the post event bus and the events published by the post store."""
+
+import asyncio
+import threading
+import pytest
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+from src.utils.events import EventBus
+from src.utils.post_store import PostStore
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_receives_the_same_item():
+    """Test fan-out of one item object to all subscribers and listeners."""
+    bus = EventBus(queue_size=10)
+    subscriptions = [bus.subscribe() for _ in range(200)]
+    heard = []
+    bus.add_listener(heard.append)
+
+    item = {"type": "approved"}
+    bus.publish(item)
+
+    received = await asyncio.gather(*[subscription.get(timeout=1) for subscription in subscriptions])
+    assert all(value is item for value in received)
+    assert heard == [item]
+
+    subscriptions[0].close()
+    assert len(bus) == 199
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_and_failing_listener_is_isolated():
+    """Test that a full queue keeps the newest items and listener errors do not stop delivery."""
+    bus = EventBus(queue_size=3)
+    subscription = bus.subscribe()
+    bus.add_listener(lambda item: 1 / 0)
+
+    for i in range(5):
+        bus.publish(i)
+
+    assert [await subscription.get(timeout=1) for _ in range(3)] == [2, 3, 4]
+    assert subscription.dropped == 2
+    assert await subscription.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_publish_from_another_thread():
+    """Test that items published off the event loop reach subscribers."""
+    bus = EventBus(queue_size=10)
+    subscription = bus.subscribe()
+
+    thread = threading.Thread(target=bus.publish, args=("from thread",))
+    thread.start()
+    thread.join()
+
+    assert await subscription.get(timeout=1) == "from thread"
+
+
+def test_post_store_publishes_lifecycle_events():
+    """Test the event types the store publishes as a post moves through review."""
+    bus = EventBus(queue_size=10)
+    events = []
+    bus.add_listener(events.append)
+    store = PostStore(":memory:", events=bus)
+
+    post = GeneratedPost(SocialPlatform.TWITTER, "Hello", PostStatus.PENDING_APPROVAL)
+    store.add(post)
+    store.update(post.id, content="Hello again", status=PostStatus.EDITED)
+    store.update(post.id, duplicate_of="abc")
+    store.update(post.id, status=PostStatus.APPROVED)
+    post = store.get(post.id)
+    post.status = PostStatus.PUBLISHED
+    store.save(post)
+    store.delete(post.id)
+    store.clear()
+    store.close()
+
+    assert [event.type for event in events] == [
+        "generated", "edited", "updated", "approved", "published", "deleted", "cleared"
+    ]
+    assert events[3].post.status is PostStatus.APPROVED
+    assert {event.post_id for event in events[:-1]} == {post.id}
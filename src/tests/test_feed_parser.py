@@ -0,0 +1,55 @@
+"""Tests for feed and sitemap parsing."""
+
+import pytest
+from src.utils.feed_parser import FeedParseError, parse_feed
+from src.tests.conftest import FIXTURES_DIR
+
+
+def test_parse_rss():
+    """Test that RSS items are returned in document order."""
+    feed = parse_feed((FIXTURES_DIR / "feeds" / "rss.xml").read_bytes())
+
+    assert feed.kind == "rss"
+    assert [entry.url for entry in feed.entries] == [
+        "https://example.com/blog/scaling-ingestion",
+        "https://example.com/blog/prompt-caching",
+        "https://example.com/blog/sqlite",
+    ]
+    assert feed.entries[0].title == "Scaling our ingestion pipeline"
+    assert feed.entries[0].published == "Mon, 05 Oct 2026 09:00:00 GMT"
+
+
+def test_parse_atom_prefers_alternate_link():
+    """Test that Atom entries use their alternate link."""
+    feed = parse_feed((FIXTURES_DIR / "feeds" / "atom.xml").read_bytes())
+
+    assert feed.kind == "atom"
+    assert [entry.url for entry in feed.entries] == [
+        "https://research.example.com/tail-latency",
+        "https://research.example.com/bloom-filters",
+    ]
+    assert feed.entries[1].published == "2026-09-30T08:00:00Z"
+
+
+def test_parse_sitemap_and_sitemap_index():
+    """Test that sitemaps yield entries and sitemap indexes yield child sitemaps."""
+    sitemap = parse_feed((FIXTURES_DIR / "feeds" / "sitemap.xml").read_bytes())
+    assert sitemap.kind == "sitemap"
+    assert sitemap.entries[1].url == "https://example.com/docs/getting-started"
+    assert sitemap.entries[1].published == "2026-09-01"
+
+    index = parse_feed(
+        b'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        b"<sitemap><loc>https://example.com/sitemap-posts.xml</loc></sitemap>"
+        b"</sitemapindex>"
+    )
+    assert index.kind == "sitemapindex"
+    assert index.sitemaps == ["https://example.com/sitemap-posts.xml"]
+    assert index.entries == []
+
+
+@pytest.mark.parametrize("document", [b"<html><body></body></html>", b"<rss><channel>", b""])
+def test_parse_rejects_unsupported_documents(document):
+    """Test that HTML, truncated and empty documents raise FeedParseError."""
+    with pytest.raises(FeedParseError):
+        parse_feed(document)
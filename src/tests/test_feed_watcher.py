@@ -0,0 +1,265 @@
+"""Tests for the seen-URL index and the feed watcher."""
+
+import asyncio
+import sqlite3
+import threading
+import pytest
+from unittest.mock import patch
+from src.agents.feed_watcher import FeedWatcher
+from src.tests.conftest import FixtureServer
+from src.utils.seen_index import BloomFilter, SeenIndex
+
+
+@pytest.fixture
+def seen():
+    """Create an in-memory seen index."""
+    index = SeenIndex(":memory:", capacity=1000, error_rate=0.01)
+    yield index
+    index.close()
+
+
+class RecordingIngest:
+    """Ingest function that records URLs and tracks peak concurrency."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.urls = []
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, url):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.urls.append(url)
+        self.active -= 1
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added item is reported as present."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"https://example.com/{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"https://other.example.com/{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_seen_index_returns_only_new_urls(seen):
+    """Test that a batch returns unseen URLs once, in order, without duplicates."""
+    assert seen.add_new(["a", "b", "a"], source="feed") == ["a", "b"]
+    assert seen.add_new(["b", "c"], source="feed") == ["c"]
+    assert "a" in seen
+    assert "z" not in seen
+    assert len(seen) == 3
+
+
+def test_seen_index_tracks_pending_urls(seen):
+    """Test that URLs stay pending until ingested and are new again once forgotten."""
+    seen.add_new(["a", "b", "c"], source="feed")
+    seen.mark_ingested("b")
+    assert seen.forget("c") == "feed"
+    assert seen.forget("z") is None
+
+    assert seen.pending() == ["a"]
+    assert seen.add_new(["a", "b", "c"]) == ["c"]
+
+
+def test_seen_index_persists_across_restarts(tmp_path):
+    """Test that the Bloom filter is rebuilt from SQLite on open."""
+    path = str(tmp_path / "seen.sqlite3")
+    first = SeenIndex(path, capacity=100)
+    first.add_new(["https://example.com/a"])
+    first.close()
+
+    second = SeenIndex(path, capacity=100)
+    assert "https://example.com/a" in second.bloom
+    assert second.add_new(["https://example.com/a", "https://example.com/b"]) == ["https://example.com/b"]
+    second.close()
+
+
+def test_seen_index_migrates_urls_as_ingested(tmp_path):
+    """Test that URLs recorded before pending tracking are not ingested again."""
+    path = str(tmp_path / "seen.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE seen_urls (url TEXT PRIMARY KEY, source TEXT, first_seen REAL NOT NULL)")
+    db.execute("INSERT INTO seen_urls VALUES ('https://example.com/old', 'feed', 1.0)")
+    db.commit()
+    db.close()
+
+    index = SeenIndex(path, capacity=100)
+    assert index.pending() == []
+    assert "https://example.com/old" in index
+    index.close()
+
+
+@pytest.mark.asyncio
+async def test_watcher_ingests_new_entries_once(fixture_server, seen):
+    """Test that only unseen entries are ingested and unchanged feeds are revalidated."""
+    ingest = RecordingIngest()
+    watcher = FeedWatcher(
+        feeds=[f"{fixture_server.url}/feeds/rss.xml", f"{fixture_server.url}/feeds/sitemap.xml"],
+        seen=seen,
+        ingest=ingest,
+        poll_interval=60
+    )
+
+    first = await watcher.poll_due()
+    await watcher.drain()
+    assert sorted(first) == sorted([
+        "https://example.com/blog/scaling-ingestion",
+        "https://example.com/blog/prompt-caching",
+        "https://example.com/blog/sqlite",
+        "https://example.com/docs/getting-started",
+    ])
+    assert sorted(ingest.urls) == sorted(first)
+
+    # Nothing is due until the poll interval has passed
+    assert await watcher.poll_due() == []
+
+    second = await watcher.poll_due(now=watcher.next_poll_at() + 120)
+    await watcher.stop()
+    assert second == []
+    assert fixture_server.statuses == [200, 200, 304, 304]
+    assert all(source.interval == 120 for source in watcher.sources.values())
+
+
+@pytest.mark.asyncio
+async def test_watcher_follows_sitemap_index(tmp_path, seen):
+    """Test that child sitemaps of a sitemap index are added as feeds."""
+    server = FixtureServer(tmp_path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        (tmp_path / "posts.xml").write_text(
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            "<url><loc>https://example.com/posts/1</loc></url></urlset>"
+        )
+        (tmp_path / "index.xml").write_text(
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<sitemap><loc>{server.url}/posts.xml</loc></sitemap></sitemapindex>"
+        )
+        watcher = FeedWatcher(feeds=[f"{server.url}/index.xml"], seen=seen, ingest=RecordingIngest())
+
+        assert await watcher.poll_due() == []
+        assert f"{server.url}/posts.xml" in watcher.sources
+        assert await watcher.poll_due() == ["https://example.com/posts/1"]
+        await watcher.stop()
+    finally:
+        await asyncio.to_thread(server.shutdown)
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_watcher_bounds_ingest_concurrency(fixture_server, seen):
+    """Test that no more than ingest_concurrency URLs are processed at once."""
+    ingest = RecordingIngest(delay=0.02)
+    watcher = FeedWatcher(
+        feeds=[f"{fixture_server.url}/feeds/rss.xml", f"{fixture_server.url}/feeds/atom.xml"],
+        seen=seen,
+        ingest=ingest,
+        ingest_concurrency=2
+    )
+
+    watcher.start_workers()
+    await watcher.poll_due()
+    await watcher.drain()
+    await watcher.stop()
+
+    assert len(ingest.urls) == 5
+    assert ingest.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_watcher_reprocesses_feed_body_after_recording_fails(fixture_server, seen):
+    """Test that a feed body whose entries could not be recorded is not revalidated as unchanged."""
+    add_new = seen.add_new
+    calls = []
+
+    def failing_once(urls, source=None):
+        calls.append(source)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return add_new(urls, source)
+
+    watcher = FeedWatcher(feeds=[f"{fixture_server.url}/feeds/rss.xml"], seen=seen, ingest=RecordingIngest())
+    with patch.object(seen, "add_new", failing_once):
+        assert await watcher.poll_due() == []
+        retried = await watcher.poll_due(now=watcher.next_poll_at())
+    await watcher.stop()
+
+    assert fixture_server.statuses == [200, 200]
+    assert len(retried) == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_ingest_is_queued_again_from_unchanged_feed(fixture_server, seen):
+    """Test that a URL whose ingest failed is queued again by the next poll of an unchanged feed."""
+    failing = {"https://example.com/blog/sqlite"}
+    ingest = RecordingIngest()
+
+    async def flaky_ingest(url):
+        if url in failing:
+            failing.discard(url)
+            raise RuntimeError("LLM unavailable")
+        await ingest(url)
+
+    watcher = FeedWatcher(feeds=[f"{fixture_server.url}/feeds/rss.xml"], seen=seen, ingest=flaky_ingest)
+    await watcher.poll_due()
+    await watcher.drain()
+    retried = await watcher.poll_due(now=watcher.next_poll_at())
+    await watcher.drain()
+    await watcher.stop()
+
+    assert fixture_server.statuses == [200, 200]
+    assert retried == ["https://example.com/blog/sqlite"]
+    assert ingest.urls.count("https://example.com/blog/sqlite") == 1
+    assert seen.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_watcher_retries_failed_and_unfinished_ingests(fixture_server, seen):
+    """Test that failed URLs are found again and URLs left queued are ingested on the next run."""
+    feed = f"{fixture_server.url}/feeds/rss.xml"
+
+    async def failing_ingest(url):
+        raise RuntimeError("LLM unavailable")
+
+    watcher = FeedWatcher(feeds=[feed], seen=seen, ingest=failing_ingest)
+    failed = await watcher.poll_due()
+    await watcher.drain()
+    await watcher.stop()
+    assert failed and seen.pending() == []
+
+    # Discovered again; the watcher stops before ingesting them
+    watcher = FeedWatcher(feeds=[feed], seen=seen, ingest=RecordingIngest())
+    assert await watcher.poll_due() == failed
+    await watcher.stop()
+    assert seen.pending() == failed
+
+    ingest = RecordingIngest()
+    restarted = FeedWatcher(feeds=[], seen=seen, ingest=ingest)
+    assert await restarted.requeue_pending() == failed
+    await restarted.drain()
+    await restarted.stop()
+    assert ingest.urls == failed
+    assert seen.pending() == []
+
+
+@pytest.mark.asyncio
+async def test_watcher_backs_off_failing_feeds(fixture_server, seen):
+    """Test that a failing feed is rescheduled with a longer interval."""
+    watcher = FeedWatcher(
+        feeds=[f"{fixture_server.url}/feeds/missing.xml"],
+        seen=seen,
+        ingest=RecordingIngest(),
+        poll_interval=10,
+        max_poll_interval=15
+    )
+
+    await watcher.poll_due()
+    source = watcher.sources[f"{fixture_server.url}/feeds/missing.xml"]
+    assert source.failures == 1
+    assert source.interval == 15
+    await watcher.stop()
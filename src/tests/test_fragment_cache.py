@@ -0,0 +1,82 @@
+"""Tests for the rendered fragment cache and the post card fragments."""
+
+import pytest
+from unittest.mock import patch
+from fasthtml.common import Div, to_xml
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+from src.utils.fragment_cache import FragmentCache
+from src.utils.post_store import PostStore
+
+
+def make_post(content="Hello", post_id="p1", version=1):
+    """Build a stored post."""
+    return GeneratedPost(SocialPlatform.TWITTER, content, PostStatus.PENDING_APPROVAL, id=post_id, version=version)
+
+
+def test_fragments_are_reused_until_the_version_changes():
+    """Test that a fragment renders once per post version."""
+    cache = FragmentCache(max_entries=10)
+    renders = []
+
+    def render(post):
+        renders.append(post.version)
+        return Div(post.content)
+
+    post = make_post()
+    assert cache.render(post, "card", render) == "<div>Hello</div>"
+    assert cache.render(post, "card", render) == "<div>Hello</div>"
+    assert renders == [1]
+
+    post.content, post.version = "Hello again", 2
+    assert cache.render(post, "card", render) == "<div>Hello again</div>"
+    assert renders == [1, 2]
+    assert len(cache) == 1
+
+
+def test_invalidate_and_eviction():
+    """Test that invalidation drops every kind of fragment and the least recent is evicted."""
+    cache = FragmentCache(max_entries=2)
+    render = lambda post: Div(post.id)
+
+    cache.render(make_post(post_id="a"), "card", render)
+    cache.render(make_post(post_id="a"), "edit", render)
+    cache.invalidate("a")
+    assert len(cache) == 0
+
+    for post_id in ("a", "b", "a", "c"):
+        cache.render(make_post(post_id=post_id), "card", render)
+    assert len(cache) == 2
+    renders = []
+    cache.render(make_post(post_id="b"), "card", lambda post: renders.append(post.id) or Div())
+    assert renders == ["b"]
+
+
+@pytest.fixture
+def app_store():
+    """Point the web app at an in-memory post store and an empty fragment cache."""
+    from src import app
+
+    store = PostStore(":memory:")
+    with patch.object(app, "post_store", store), \
+            patch.object(app, "fragment_cache", FragmentCache(max_entries=100)), \
+            patch.object(app, "find_published_duplicate", return_value=None):
+        yield store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_approve_swaps_only_the_status_badges(app_store):
+    """Test that approving returns a notice plus out-of-band badges instead of the card."""
+    from src.app import approve_post, render_post_card
+
+    post_id = app_store.add(make_post(post_id=None))
+    card = render_post_card(app_store.get(post_id))
+    assert f'id="badges-{post_id}"' in card and "Pending Review" in card
+
+    html = to_xml(await approve_post(post_id))
+    assert "Post approved" in html
+    assert f'<span hx-swap-oob="true" id="badges-{post_id}">' in html
+    assert "Approved" in html and "post-content" not in html
+
+    # The approved post has a new version, so its card is rendered again
+    assert "Approved" in render_post_card(app_store.get(post_id))
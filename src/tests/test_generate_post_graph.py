@@ -0,0 +1,162 @@
+"""Tests for the generate post graph nodes."""
+
+import asyncio
+import contextlib
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.agents.generate_post_graph import (
+    create_generate_post_graph, generate_posts_node, get_requested_styles, merge_posts
+)
+from src.agents.types import GeneratedPost, SocialPlatform, PostStatus, PostStyle
+from src.utils.content_store import content_store
+from src.utils.scrape_cache import ScrapeCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_outputs():
+    """Start each test without posts cached for the (shared) article's content hash."""
+    with patch("src.agents.generate_post_graph.scraper.cache", ScrapeCache()):
+        yield
+
+
+def make_state(**input_data):
+    """Build a graph state with scraped content."""
+    return {
+        "input": {"url": "https://example.com", **input_data},
+        "content_hash": content_store.put("Article body"),
+        "posts": [],
+        "errors": [],
+        "human_feedback": None,
+        "is_approved": False,
+    }
+
+
+@contextlib.contextmanager
+def patch_graph(generate_variants, summarize=None):
+    """Replace the scraper and the LLM calls of a full graph run with fakes."""
+    scrape = AsyncMock(return_value={"content": "Article body", "content_hash": None})
+    with patch("src.agents.generate_post_graph.scraper.scrape_url", scrape), \
+            patch("src.agents.generate_post_graph.find_near_duplicate", AsyncMock(return_value=None)), \
+            patch("src.agents.generate_post_graph.content_generator.generate_variants", generate_variants), \
+            patch(
+                "src.agents.generate_post_graph.content_generator.summarize_content",
+                summarize or AsyncMock(return_value="Short summary")
+            ), \
+            patch(
+                "src.agents.generate_post_graph.content_generator.extract_key_points",
+                AsyncMock(return_value=["Point one", "Point two"])
+            ):
+        yield
+
+
+def test_requested_styles_from_single_style():
+    """Test that a single style value is still accepted."""
+    assert get_requested_styles({"style": "casual"}) == ["casual"]
+    assert get_requested_styles({}) == ["professional"]
+
+
+def test_requested_styles_deduplicates_in_order():
+    """Test that repeated styles are dropped while keeping order."""
+    styles = ["technical", PostStyle.CASUAL, "Technical"]
+    assert get_requested_styles({"styles": styles}) == ["technical", "casual"]
+
+
+@pytest.mark.asyncio
+async def test_generate_posts_node_builds_all_variants():
+    """Test that every platform/style combination is generated in one run."""
+    async def fake_variants(platform, content, styles):
+        return {style: f"{platform}:{style}:{content}" for style in styles}
+
+    state = make_state(
+        platforms=[SocialPlatform.TWITTER, SocialPlatform.LINKEDIN],
+        styles=["professional", "casual"]
+    )
+    with patch("src.agents.generate_post_graph.content_generator.generate_variants", fake_variants):
+        result = await generate_posts_node(state)
+
+    assert result["errors"] == []
+    assert [(p.platform, p.style) for p in result["posts"]] == [
+        (SocialPlatform.TWITTER, "professional"),
+        (SocialPlatform.TWITTER, "casual"),
+        (SocialPlatform.LINKEDIN, "professional"),
+        (SocialPlatform.LINKEDIN, "casual"),
+    ]
+    assert all(p.status == PostStatus.PENDING_APPROVAL for p in result["posts"])
+    assert result["posts"][0].content == "twitter:professional:Article body"
+
+
+@pytest.mark.asyncio
+async def test_generate_posts_node_records_platform_errors():
+    """Test that a failing platform does not drop the other platform's variants."""
+    async def fake_variants(platform, content, styles):
+        if platform == "twitter":
+            raise RuntimeError("boom")
+        return {style: "post" for style in styles}
+
+    state = make_state(platforms=[SocialPlatform.TWITTER, SocialPlatform.LINKEDIN], style="casual")
+    with patch("src.agents.generate_post_graph.content_generator.generate_variants", fake_variants):
+        result = await generate_posts_node(state)
+
+    assert result["errors"] == ["Error generating twitter post: boom"]
+    assert [p.platform for p in result["posts"]] == [SocialPlatform.LINKEDIN]
+
+
+def test_merge_posts_replaces_by_key_and_keeps_order():
+    """Test that updated posts replace earlier ones with the same key."""
+    first = GeneratedPost(SocialPlatform.TWITTER, "a", id="1")
+    second = GeneratedPost(SocialPlatform.LINKEDIN, "b", id="2")
+    updated = GeneratedPost(SocialPlatform.TWITTER, "a", PostStatus.PUBLISHED, id="1")
+    new = GeneratedPost(SocialPlatform.REDDIT, "c", style="casual")
+
+    assert merge_posts([first, second], [updated, new]) == [updated, second, new]
+
+
+@pytest.mark.asyncio
+async def test_graph_accumulates_partial_updates():
+    """Test that node updates are merged into the final state without losing errors."""
+    async def fake_variants(platform, content, styles):
+        return {style: f"{platform}:{style}" for style in styles}
+
+    with patch_graph(fake_variants):
+        result = await create_generate_post_graph().ainvoke({
+            **make_state(platforms=["twitter", "myspace"]),
+            "content_hash": None,
+            "errors": ["earlier error"],
+        })
+
+    assert content_store.get(result["content_hash"]) == "Article body"
+    assert result["errors"] == ["earlier error", "Unsupported platform: myspace"]
+    assert [post.content for post in result["posts"]] == ["twitter:professional"]
+
+
+@pytest.mark.asyncio
+async def test_graph_fans_out_summary_key_points_and_posts():
+    """Test that long-form posts run alongside the summary and tweets are written from it."""
+    summary_started = asyncio.Event()
+    linkedin_started = asyncio.Event()
+    calls = []
+
+    async def summarize(content, max_length=500):
+        summary_started.set()
+        # Only completes if the LinkedIn branch runs concurrently
+        await asyncio.wait_for(linkedin_started.wait(), timeout=1)
+        return "Short summary"
+
+    async def fake_variants(platform, content, styles):
+        if platform == "linkedin":
+            linkedin_started.set()
+        calls.append((platform, content))
+        return {style: f"{platform}:{style}" for style in styles}
+
+    with patch_graph(fake_variants, summarize=summarize):
+        result = await create_generate_post_graph().ainvoke(
+            {**make_state(platforms=["twitter", "linkedin"]), "content_hash": None}
+        )
+
+    assert result["errors"] == []
+    assert result["summary"] == "Short summary"
+    assert result["key_points"] == ["Point one", "Point two"]
+    assert sorted(calls) == [("linkedin", "Article body"), ("twitter", "Short summary")]
+    assert {post.platform.value: post.metadata["source"] for post in result["posts"]} == {
+        "linkedin": "content", "twitter": "summary"
+    }
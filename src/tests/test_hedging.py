@@ -0,0 +1,94 @@
+"""Tests for request hedging."""
+
+import asyncio
+import pytest
+from src.utils.hedging import HedgingPolicy
+from src.utils.metrics import metrics
+
+
+def make_call(delays, results=None):
+    """Build a call factory whose n-th attempt sleeps for delays[n]."""
+    attempts = []
+
+    async def call():
+        index = len(attempts)
+        attempts.append(index)
+        await asyncio.sleep(delays[index])
+        return results[index] if results else index
+
+    return call, attempts
+
+
+def warmed_policy(**overrides):
+    """Create an enabled policy with a warm 10ms latency history."""
+    options = {"name": "test", "enabled": True, "budget": 1.0, "min_samples": 5, "min_delay": 0.01}
+    options.update(overrides)
+    policy = HedgingPolicy(**options)
+    for _ in range(100):
+        policy.tracker().record(0.01)
+    return policy
+
+
+@pytest.mark.asyncio
+async def test_disabled_policy_never_hedges():
+    """Test that a disabled policy only issues the primary call."""
+    policy = HedgingPolicy(name="test", enabled=False)
+    for _ in range(10):
+        policy.tracker().record(0.001)
+    call, attempts = make_call([0.05])
+
+    assert await policy.run(call) == 0
+    assert attempts == [0]
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_hedge_wins():
+    """Test that a duplicate is sent after the percentile and the faster one wins."""
+    metrics.reset()
+    policy = warmed_policy()
+    call, attempts = make_call([1.0, 0.0])
+
+    assert await policy.run(call) == 1
+    assert attempts == [0, 1]
+    assert metrics.counter("hedges_sent_total", target="test") == 1
+    assert metrics.counter("hedge_wins_total", target="test") == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    """Test that calls finishing within the percentile are not duplicated."""
+    policy = warmed_policy()
+    call, attempts = make_call([0.0])
+
+    assert await policy.run(call) == 0
+    assert attempts == [0]
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_hedges():
+    """Test that hedges stop once the budget ratio is used up."""
+    metrics.reset()
+    policy = warmed_policy(budget=0.5)
+    call, attempts = make_call([0.05, 0.05, 0.0, 0.05])
+
+    assert [await policy.run(call) for _ in range(3)] == [0, 2, 3]
+    assert policy.hedges == 1
+    assert metrics.counter("hedges_skipped_budget_total", target="test") == 2
+
+
+@pytest.mark.asyncio
+async def test_hedge_result_used_when_primary_fails():
+    """Test that a failed primary does not fail the request if the hedge succeeds."""
+    policy = warmed_policy()
+
+    attempts = []
+
+    async def call():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            await asyncio.sleep(0.05)
+            raise RuntimeError("slow failure")
+        await asyncio.sleep(0.1)
+        return "hedged"
+
+    assert await policy.run(call) == "hedged"
@@ -1,7 +1,11 @@
 """Tests for the LLM content generator."""
 
 import pytest
-from src.utils.llm import ContentGenerator
+from unittest.mock import patch
+from src.config import settings
+from src.utils.llm import ContentGenerator, build_messages, condense_content
+from src.utils.metrics import metrics
+from src.tests.fakes import FakeCachingChatModel
 
 
 @pytest.fixture
@@ -26,3 +30,67 @@ def test_generator_has_methods(generator):
     assert callable(generator.generate_linkedin_post)
     assert callable(generator.summarize_content)
     assert callable(generator.extract_key_points)
+
+
+def test_condense_content_strips_markdown_noise():
+    """Test that condensing drops images, unwraps links and collapses whitespace."""
+    content = "# Title\n\n\n![logo](https://example.com/logo.png)\nRead   the [docs](https://example.com).\n\n\n\nEnd"
+    assert condense_content(content) == "# Title\n\nRead the docs.\n\nEnd"
+
+
+def test_condense_content_caps_at_paragraph_boundary():
+    """Test that condensed content is capped without splitting a paragraph."""
+    content = "First paragraph.\n\nSecond paragraph that is long."
+    assert condense_content(content, max_chars=25) == "First paragraph."
+
+
+@pytest.mark.asyncio
+async def test_generate_variants_shares_content(generator):
+    """Test that one post is generated per style from the same content."""
+    calls = []
+
+    async def fake_generate_post(platform, content, style="professional"):
+        calls.append((content, style))
+        return f"{style} tweet"
+
+    generator.generate_post = fake_generate_post
+    variants = await generator.generate_variants("twitter", "article", ["professional", "casual"])
+
+    assert variants == {"professional": "professional tweet", "casual": "casual tweet"}
+    assert calls == [("article", "professional"), ("article", "casual")]
+
+
+def test_build_messages_marks_article_for_caching():
+    """Test that the article is a cache-marked prefix and instructions follow it."""
+    messages = build_messages("Article body", "Write a tweet")
+    block = messages[0].content[0]
+    assert "Article body" in block["text"]
+    assert block["cache_control"] == {"type": "ephemeral"}
+    assert messages[1].content == "Write a tweet"
+
+
+@pytest.mark.asyncio
+async def test_repeated_generation_reads_article_from_cache():
+    """Test that cache writes then reads are recorded per call and in metrics."""
+    metrics.reset()
+    llm = FakeCachingChatModel(reply="A tweet #news")
+    generator = ContentGenerator(llm=llm)
+    article = "Long article body. " * 50
+
+    first = await generator.generate_twitter_post(article, style="casual")
+    await generator.generate_linkedin_post(article, style="technical")
+
+    assert first == "A tweet #news"
+    write_call, read_call = generator.usage_history
+    assert write_call["cache_write_tokens"] > 0 and write_call["cache_read_tokens"] == 0
+    assert read_call["cache_read_tokens"] == write_call["cache_write_tokens"]
+    assert metrics.counter("llm_cache_read_tokens_total", task="linkedin") == read_call["cache_read_tokens"]
+    assert metrics.counter("llm_cache_write_tokens_total", task="twitter") == write_call["cache_write_tokens"]
+
+
+def test_models_use_configured_base_url():
+    """Test that Claude can be pointed at another endpoint (e.g. a local stand-in)."""
+    with patch.object(settings, "anthropic_base_url", "http://127.0.0.1:9"):
+        generator = ContentGenerator()
+
+    assert generator.llm.anthropic_api_url == "http://127.0.0.1:9"
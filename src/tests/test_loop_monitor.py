@@ -0,0 +1,97 @@
+"""Tests for event-loop lag measurement and blocking-call detection."""
+
+import asyncio
+import time
+from collections import deque
+import pytest
+from src.utils.callback_hook import callback_hook
+from src.utils.loop_monitor import LoopMonitor, format_blocks
+from src.utils.metrics import metrics
+from src.utils.profiler import SlowCallbackMonitor
+
+
+@pytest.fixture
+def monitor():
+    """A loop monitor with a short lag interval and a 50 ms blocking threshold."""
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+    try:
+        yield monitor
+    finally:
+        monitor.stop()
+
+
+@pytest.mark.allow_blocking
+@pytest.mark.asyncio
+async def test_blocking_call_is_recorded_with_its_stack(monitor):
+    """Test that a coroutine blocking the loop is recorded with the blocking line."""
+    monitor.start()
+
+    async def blocking_write():
+        time.sleep(0.12)
+
+    async def polite():
+        await asyncio.sleep(0.01)
+
+    before = monitor.block_count
+    await asyncio.gather(
+        asyncio.create_task(blocking_write(), name="write"),
+        asyncio.create_task(polite(), name="polite"),
+    )
+
+    block, = monitor.blocks_since(before)
+    assert block["callback"].startswith("task write (")
+    assert block["duration_ms"] >= 120
+    assert any("time.sleep(0.12)" in line for line in block["stack"])
+    assert "blocked the event loop for" in format_blocks([block])
+
+
+@pytest.mark.allow_blocking
+@pytest.mark.asyncio
+async def test_lag_is_observed_as_a_histogram(monitor):
+    """Test that lag measurements show up in the metrics with percentiles."""
+    metrics.reset()
+    monitor.start()
+    await asyncio.sleep(0.05)
+    time.sleep(0.06)
+    await asyncio.sleep(0.05)
+
+    lag = monitor.snapshot()["lag_seconds"]
+    assert lag["count"] >= 3
+    assert lag["p99"] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_stop_restores_the_event_loop(monitor):
+    """Test that stopping unregisters from the callback hook and stops the watchdog thread."""
+    original = asyncio.Handle._run
+    monitor.start()
+    assert monitor in callback_hook._observers
+    await asyncio.sleep(0.02)
+    monitor.stop()
+
+    assert monitor not in callback_hook._observers
+    assert asyncio.Handle._run is original
+    assert monitor._watchdog is None
+    assert monitor.blocks_since(0) == []
+
+
+@pytest.mark.allow_blocking
+@pytest.mark.asyncio
+async def test_profiler_and_monitor_share_the_callback_hook(monitor):
+    """Test that stopping a profiling monitor started first keeps blocking detection working."""
+    original = asyncio.Handle._run
+    profile = SlowCallbackMonitor(threshold=0.05)
+    profile.start()
+    monitor.start()
+    profile.stop()
+
+    async def blocking_write():
+        time.sleep(0.08)
+
+    before = monitor.block_count
+    await asyncio.create_task(blocking_write(), name="write")
+    assert [block["callback"] for block in monitor.blocks_since(before)][0].startswith("task write (")
+    assert profile.records == deque()
+
+    monitor.stop()
+    assert asyncio.Handle._run is original
@@ -0,0 +1,27 @@
+"""Tests for the in-process metrics registry."""
+
+from src.utils.metrics import MetricsRegistry, percentile
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([], 0.5) == 0.0
+
+
+def test_registry_labels_and_snapshot():
+    """Test that labelled counters, gauges and histograms are exported."""
+    registry = MetricsRegistry()
+    registry.incr("calls", task="twitter")
+    registry.incr("calls", 2, task="twitter")
+    registry.set_gauge("queue_depth", 4)
+    for value in (1.0, 2.0, 3.0):
+        registry.observe("latency", value)
+
+    snapshot = registry.snapshot()
+    assert snapshot["counters"]["calls{task=twitter}"] == 3
+    assert snapshot["gauges"]["queue_depth"] == 4
+    assert snapshot["histograms"]["latency"]["count"] == 3
+    assert snapshot["histograms"]["latency"]["p50"] == 2.0
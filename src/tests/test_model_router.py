@@ -0,0 +1,99 @@
+"""Tests for model routing and fallback."""
+
+import asyncio
+import pytest
+from src.utils.llm import ContentGenerator
+from src.utils.rate_limiter import AdaptiveLimiter
+from src.utils.model_router import ModelRouter, ModelTier, Route
+from src.tests.fakes import FakeCachingChatModel
+
+
+@pytest.fixture
+def router():
+    """Create a router with a fast tier for short inputs and a default tier."""
+    return ModelRouter(
+        tiers=[
+            ModelTier(name="fast", model="small", timeout=5.0, max_input_chars=100),
+            ModelTier(name="default", model="large", timeout=30.0),
+        ],
+        routes=[
+            Route(task="twitter", tier="fast", fallbacks=["default"], timeout=0.5),
+            Route(task="linkedin", tier="default", fallbacks=["fast"]),
+        ],
+        default_tier="default"
+    )
+
+
+def test_short_task_routes_to_fast_tier(router):
+    """Test that short inputs for short-form tasks use the fast tier first."""
+    steps = router.select("twitter", 50)
+    assert [step.tier.name for step in steps] == ["fast", "default"]
+    assert steps[0].timeout == 0.5
+
+
+def test_large_input_skips_fast_tier(router):
+    """Test that inputs above a tier's size limit skip that tier."""
+    assert [step.tier.name for step in router.select("twitter", 500)] == ["default"]
+    assert [step.tier.name for step in router.select("linkedin", 500)] == ["default"]
+
+
+def test_unrouted_task_uses_default_tier(router):
+    """Test that tasks without a route use the default tier."""
+    assert [step.tier.name for step in router.select("unknown", 10)] == ["default"]
+
+
+def test_unknown_tier_is_rejected():
+    """Test that routes must reference known tiers."""
+    with pytest.raises(ValueError):
+        ModelRouter(
+            tiers=[ModelTier(name="default", model="large", timeout=30.0)],
+            routes=[Route(task="twitter", tier="fast")],
+            default_tier="default"
+        )
+
+
+@pytest.mark.asyncio
+async def test_generator_falls_back_on_failure(router):
+    """Test that a failing tier falls through to the next tier in the chain."""
+    fast = FakeCachingChatModel(error=RuntimeError("overloaded"))
+    default = FakeCachingChatModel(reply="From default")
+    generator = ContentGenerator(router=router, models={"fast": fast, "default": default})
+
+    assert await generator.generate_twitter_post("Short article") == "From default"
+    assert len(fast.calls) == 1
+    assert generator.usage_history[-1]["tier"] == "default"
+
+
+@pytest.mark.asyncio
+async def test_generator_falls_back_on_route_timeout(router):
+    """Test that exceeding the route timeout moves on to the fallback tier."""
+    fast = FakeCachingChatModel(reply="Too slow", delay=1.0)
+    default = FakeCachingChatModel(reply="From default")
+    generator = ContentGenerator(router=router, models={"fast": fast, "default": default})
+
+    assert await generator.generate_twitter_post("Short article") == "From default"
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_wait_does_not_count_against_route_timeout(router):
+    """Test that calls queued behind the limiter longer than the route timeout still use their tier."""
+    router.routes["twitter"] = Route(task="twitter", tier="fast", fallbacks=["default"], timeout=0.5)
+    fast = FakeCachingChatModel(reply="From fast", delay=0.2)
+    default = FakeCachingChatModel(reply="From default")
+    limiter = AdaptiveLimiter(name="test", requests_per_minute=100, tokens_per_minute=10**6, max_concurrency=1)
+    generator = ContentGenerator(router=router, models={"fast": fast, "default": default}, limiter=limiter)
+
+    posts = await asyncio.gather(*[generator.generate_twitter_post("Short article") for _ in range(4)])
+
+    assert posts == ["From fast"] * 4
+    assert not default.calls
+
+
+@pytest.mark.asyncio
+async def test_generator_raises_when_chain_exhausted(router):
+    """Test that the last error is raised when every tier fails."""
+    failing = FakeCachingChatModel(error=RuntimeError("down"))
+    generator = ContentGenerator(router=router, models={"fast": failing, "default": failing})
+
+    with pytest.raises(RuntimeError, match="down"):
+        await generator.generate_linkedin_post("Short article")
@@ -0,0 +1,144 @@
+"""Tests for platform length rules, validation and auto-fitting."""
+
+import pytest
+from src.utils.metrics import metrics
+from src.utils.platform_rules import fit_post, get_rules, post_length, split_title, validate_post
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("hello", 5),
+    ("日本語", 6),
+    ("café", 4),
+    ("café", 4),
+    ("👍", 2),
+    ("👍🏽", 2),
+    ("👨‍👩‍👧‍👦", 2),
+    ("🇪🇪", 2),
+    ("“quoted” — dash", 15),
+])
+def test_twitter_weighted_length(text, expected):
+    """Test Twitter's weighting of CJK, emoji sequences and normalized text."""
+    assert post_length("twitter", text) == expected
+
+
+def test_twitter_counts_urls_as_tco_length():
+    """Test that every URL counts 23 regardless of its length."""
+    long_url = "https://example.com/" + "a" * 100
+    assert post_length("twitter", f"Read {long_url}.") == len("Read ") + 23 + 1
+    assert post_length("linkedin", f"Read {long_url}.") == len(f"Read {long_url}.")
+
+
+def test_validate_post_reports_issues():
+    """Test hashtag, mention and length validation."""
+    assert validate_post("twitter", "Bike lanes are coming #Cities @city_hall").ok
+
+    result = validate_post("twitter", "#2026 update for @a_much_too_long_username " + "x" * 300)
+    assert not result.ok
+    assert result.length > result.max_length == 280
+    assert result.issues == [
+        f"Too long: {result.length}/280 characters",
+        "Invalid hashtag #2026: hashtags need a letter",
+        "Invalid mention @a_much_too_long_username",
+    ]
+    assert "Too many hashtags" in validate_post("twitter", "#a #b #c #d #e #f").issues[0]
+
+
+def test_fit_post_keeps_short_posts_unchanged():
+    """Test that posts within the limit are returned as-is (apart from whitespace)."""
+    assert fit_post("twitter", "  Short post #Tag  ") == "Short post #Tag"
+
+
+def test_fit_post_trims_at_sentence_boundaries_and_keeps_trailer():
+    """Test that whole sentences are dropped and trailing URL/hashtags are kept."""
+    sentences = [f"Sentence number {i} explains one more detail of the plan." for i in range(10)]
+    post = " ".join(sentences) + "\n\nhttps://example.com/article #BikeLanes #Cities"
+
+    fitted = fit_post("twitter", post)
+
+    assert post_length("twitter", fitted) <= 280
+    assert fitted.endswith("\n\nhttps://example.com/article #BikeLanes #Cities")
+    body = fitted.split("\n\n")[0]
+    assert body.endswith("plan.")
+    assert body == " ".join(sentences[:len(body.split(". "))])
+    assert fit_post("twitter", post) == fitted
+
+
+def test_fit_post_cuts_long_sentence_at_word_boundary():
+    """Test that an over-long first sentence is cut between words, never inside a URL."""
+    post = "word " * 60 + "https://example.com/" + "p" * 50 + " more words here"
+
+    fitted = fit_post("twitter", post)
+
+    assert post_length("twitter", fitted) <= 280
+    assert fitted.endswith("…")
+    assert "https://example.com/" not in fitted or ("p" * 50) in fitted
+
+
+def test_fit_post_splits_unspaced_cjk_sentences():
+    """Test that CJK sentences without spaces are cut between sentences and keep the trailer."""
+    sentence = "これは新しい研究についての投稿です。"
+    post = sentence * 9 + " #AI"
+    assert post_length("twitter", post) == 328
+
+    fitted = fit_post("twitter", post)
+
+    assert post_length("twitter", fitted) <= 280
+    assert fitted == sentence * 7 + "\n\n#AI"
+
+
+@pytest.mark.parametrize("post", ["x" * 400, "日本語の文章" * 60])
+def test_fit_post_cuts_single_long_token_between_characters(post):
+    """Test that a post of one over-long word is cut between characters, never to an empty post."""
+    fitted = fit_post("twitter", post)
+
+    assert fitted.endswith("…")
+    assert post[:len(fitted) - 1] == fitted[:-1]
+    assert 278 <= post_length("twitter", fitted) <= 280
+
+
+def test_fit_post_never_cuts_hashtags():
+    """Test that a hashtag too long to fit is dropped or left whole, never cut."""
+    tag = "#" + "a" * 400
+    assert fit_post("twitter", f"Headline {tag}") == "Headline"
+    assert fit_post("twitter", tag) == tag
+
+
+def test_fit_post_drops_trailing_hashtags_when_needed():
+    """Test that trailing hashtags are dropped from the end when nothing else fits."""
+    tags = " ".join(f"#Tag{i}{'x' * 40}" for i in range(8))
+    fitted = fit_post("twitter", f"Headline. {tags}")
+
+    assert post_length("twitter", fitted) <= 280
+    assert fitted.startswith("Headline.")
+    assert "#Tag0" in fitted and "#Tag7" not in fitted
+
+
+def test_get_rules_rejects_unknown_platform():
+    """Test that unknown platforms raise ValueError."""
+    assert get_rules("linkedin").max_length == 3000
+    with pytest.raises(ValueError):
+        get_rules("myspace")
+
+
+def test_reddit_title_is_validated_and_fitted_separately():
+    """Test that Reddit titles are split off, checked and cut on their own."""
+    assert split_title("## Title: **Big news**\n\nBody text") == ("Big news", "Body text")
+    assert validate_post("reddit", "\n\n").issues == ["Missing title"]
+
+    long_title = " ".join(["word"] * 80)
+    result = validate_post("reddit", f"{long_title}\n\nBody")
+    assert result.length == 4
+    assert result.issues == ["Title too long: 399/300 characters"]
+
+    title, body = split_title(fit_post("reddit", f"{long_title}\n\nBody"))
+    assert len(title) <= 300 and title.endswith("…")
+    assert body == "Body"
+
+
+def test_fit_post_leaves_fitting_reddit_post_unchanged():
+    """Test that a Reddit post within its limits keeps its title markup and is not counted as fitted."""
+    post = "## Title: **Big news**\n\nBody text"
+    before = metrics.counter("posts_auto_fitted_total", platform="reddit")
+
+    assert fit_post("reddit", post) == post
+    assert metrics.counter("posts_auto_fitted_total", platform="reddit") == before
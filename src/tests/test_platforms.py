@@ -0,0 +1,154 @@
+"""Tests for the platform registry and Reddit support."""
+
+import asyncio
+from dataclasses import replace
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.agents.generate_post_graph import generate_posts_node, publish_posts_node
+from src.agents.platforms import get_platform_handler, register_platform, supported_platforms
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+from src.tests.fakes import FakeCachingChatModel
+from src.utils.content_store import content_store
+from src.utils.llm import ContentGenerator
+from src.utils.model_router import create_default_router
+from src.utils.scrape_cache import ScrapeCache
+from src.utils.mock_llm import mock_content_generator
+from src.utils.platform_rules import split_title
+from src.utils.post_store import PostStore
+from src.utils.published_index import PublishedPostIndex
+
+
+@pytest.fixture(autouse=True)
+def store():
+    """Record published posts in an in-memory store and a fresh published index, without cached posts."""
+    post_store = PostStore(":memory:")
+    with patch("src.utils.published_index.post_store", post_store), \
+            patch("src.utils.published_index.published_index", PublishedPostIndex(post_store)), \
+            patch("src.agents.generate_post_graph.scraper.cache", ScrapeCache()):
+        yield post_store
+    post_store.close()
+
+
+def make_state(posts=None, **input_data):
+    """Build a graph state with scraped content."""
+    return {
+        "input": {"url": "https://example.com", **input_data},
+        "content_hash": content_store.put("Article body"),
+        "posts": posts or [],
+        "errors": [],
+        "human_feedback": None,
+        "is_approved": True,
+    }
+
+
+def test_registry_lookup():
+    """Test that platforms are looked up by enum or name."""
+    assert supported_platforms() == [SocialPlatform.TWITTER, SocialPlatform.LINKEDIN, SocialPlatform.REDDIT]
+    assert get_platform_handler("reddit").label == "Reddit"
+    assert get_platform_handler(SocialPlatform.TWITTER).platform == SocialPlatform.TWITTER
+    assert get_platform_handler("myspace") is None
+
+
+@pytest.mark.asyncio
+async def test_generation_uses_the_registered_handler():
+    """Test that generation takes its instructions and model tier from the platform handler."""
+    handler = get_platform_handler("linkedin")
+    fast, default = FakeCachingChatModel(reply="From fast"), FakeCachingChatModel(reply="From default")
+    try:
+        register_platform(replace(handler, instructions="Write a {style} update", model_tier="fast"))
+        generator = ContentGenerator(router=create_default_router(), models={"fast": fast, "default": default})
+
+        assert await generator.generate_post("linkedin", "Short article", style="casual") == "From fast"
+    finally:
+        register_platform(handler)
+
+    assert fast.calls[0][1].content == "Write a casual update"
+    assert not default.calls
+    with pytest.raises(ValueError):
+        await generator.generate_post("myspace", "Short article")
+
+
+@pytest.mark.asyncio
+async def test_generate_reddit_posts_with_subreddit():
+    """Test that Reddit posts carry their title and normalized subreddit."""
+    async def fake_variants(platform, content, styles):
+        return {style: f"Title for {style}\n\nBody of the post." for style in styles}
+
+    state = make_state(platforms=["reddit", "myspace"], styles=["casual"], subreddit=" r/Python/ ")
+    with patch("src.agents.generate_post_graph.content_generator.generate_variants", fake_variants):
+        result = await generate_posts_node(state)
+
+    assert result["errors"] == ["Unsupported platform: myspace"]
+    post, = result["posts"]
+    assert post.platform == SocialPlatform.REDDIT
+    assert post.metadata["title"] == "Title for casual"
+    assert post.metadata["subreddit"] == "Python"
+
+
+@pytest.mark.asyncio
+async def test_mock_reddit_post_has_title_and_body():
+    """Test the mock generator's Reddit output."""
+    post = await mock_content_generator.generate_post("reddit", "City tender for bike lanes\nBudget is €1,200,000 total")
+    title, body = split_title(post)
+    assert title == "City tender for bike lanes"
+    assert "€1,200,000" in body
+
+
+@pytest.mark.asyncio
+async def test_publish_reddit_post():
+    """Test that a Reddit post is submitted with its subreddit, title and body."""
+    reddit = AsyncMock(return_value="t3_abc")
+    post = GeneratedPost(
+        platform=SocialPlatform.REDDIT,
+        content="A title\n\nThe body.",
+        metadata={"subreddit": "python"}
+    )
+    with patch("src.agents.platforms.arcade_client.post_to_reddit", reddit):
+        result = await publish_posts_node(make_state(posts=[post]))
+
+    reddit.assert_awaited_once_with("python", "A title", "The body.")
+    published, = result["posts"]
+    assert published.status == PostStatus.PUBLISHED
+    assert published.metadata["post_id"] == "t3_abc"
+    assert post.status == PostStatus.DRAFT
+    assert result["errors"] == []
+
+
+@pytest.mark.asyncio
+async def test_publish_reddit_without_subreddit_fails_only_that_post():
+    """Test that a missing subreddit fails the Reddit post but not the others."""
+    posts = [
+        GeneratedPost(platform=SocialPlatform.REDDIT, content="A title\n\nThe body."),
+        GeneratedPost(platform=SocialPlatform.TWITTER, content="A tweet"),
+    ]
+    with patch("src.agents.platforms.arcade_client.post_to_twitter", AsyncMock(return_value="1")):
+        result = await publish_posts_node(make_state(posts=posts))
+
+    assert [post.status for post in result["posts"]] == [PostStatus.FAILED, PostStatus.PUBLISHED]
+    assert result["errors"] == ["Failed to publish reddit post: No subreddit set for Reddit post"]
+
+
+@pytest.mark.asyncio
+async def test_publish_platforms_concurrently():
+    """Test that a slow platform does not hold up the others."""
+    reddit_started = asyncio.Event()
+
+    async def slow_twitter(content):
+        # Only completes if the Reddit publish runs while this one is waiting
+        await asyncio.wait_for(reddit_started.wait(), timeout=1)
+        return "tweet"
+
+    async def reddit(subreddit, title, body):
+        reddit_started.set()
+        return "t3_abc"
+
+    posts = [
+        GeneratedPost(platform=SocialPlatform.TWITTER, content="A tweet"),
+        GeneratedPost(platform=SocialPlatform.REDDIT, content="A title\n\nBody", metadata={"subreddit": "python"}),
+    ]
+    with patch("src.agents.platforms.arcade_client.post_to_twitter", slow_twitter), \
+            patch("src.agents.platforms.arcade_client.post_to_reddit", reddit):
+        result = await publish_posts_node(make_state(posts=posts))
+
+    assert result["errors"] == []
+    assert [post.status for post in result["posts"]] == [PostStatus.PUBLISHED, PostStatus.PUBLISHED]
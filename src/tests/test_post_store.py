@@ -0,0 +1,182 @@
+"""Tests for the SQLite post store."""
+
+import sqlite3
+import pytest
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+from src.utils.post_store import PostStore
+
+
+@pytest.fixture
+def store():
+    """Create an in-memory post store."""
+    post_store = PostStore(":memory:")
+    yield post_store
+    post_store.close()
+
+
+def make_post(content="Hello", platform=SocialPlatform.TWITTER, status=PostStatus.PENDING_APPROVAL, **fields):
+    """Build a post."""
+    return GeneratedPost(platform=platform, content=content, status=status, **fields)
+
+
+def test_add_get_update_delete(store):
+    """Test the basic post lifecycle."""
+    post_id = store.add(make_post(style="casual"))
+
+    post = store.get(post_id)
+    assert post.id == post_id
+    assert (post.platform, post.style, post.content, post.version) == (SocialPlatform.TWITTER, "casual", "Hello", 1)
+    assert post_id in store
+
+    updated = store.update(post_id, content="Hello again", status=PostStatus.EDITED, duplicate_of="abc")
+    assert (updated.content, updated.status, updated.metadata["duplicate_of"]) == (
+        "Hello again", PostStatus.EDITED, "abc"
+    )
+    assert updated.version == 2
+    assert updated.updated_at >= updated.created_at
+
+    assert store.delete(post_id) is True
+    assert store.get(post_id) is None
+    assert store.update(post_id, status=PostStatus.APPROVED) is None
+
+
+def test_update_many_commits_once(store):
+    """Test that a batch of updates is applied in one transaction and skips missing posts."""
+    ids = [store.add(make_post(f"Post {i}")) for i in range(3)]
+    statements = []
+    store._db.set_trace_callback(statements.append)
+
+    updated = store.update_many([
+        (ids[0], {"status": PostStatus.APPROVED}),
+        ("missing", {"status": PostStatus.APPROVED}),
+        (ids[2], {"duplicate_of": "abc"}),
+    ])
+
+    assert [post.id for post in updated] == [ids[0], ids[2]]
+    assert updated[0].status == PostStatus.APPROVED and updated[0].version == 2
+    assert updated[1].metadata["duplicate_of"] == "abc"
+    assert store.get(ids[1]).version == 1
+    assert statements.count("COMMIT") == 1
+
+
+def test_round_trip_keeps_every_field(store):
+    """Test that a stored post reads back equal, with enum members restored."""
+    post = make_post(
+        platform=SocialPlatform.REDDIT,
+        scheduled_time="2026-01-01T09:00:00",
+        media_urls=("https://example.com/a.png",),
+        metadata={"subreddit": "python", "title": "Hello"},
+        style="technical",
+        source_url="https://example.com",
+        content_hash="ab" * 32,
+    )
+    store.add(post)
+
+    stored = store.get(post.id)
+    assert stored == post
+    assert stored.platform is SocialPlatform.REDDIT and stored.status is PostStatus.PENDING_APPROVAL
+    assert not hasattr(stored, "__dict__")
+
+
+def test_save_upserts_and_bumps_version(store):
+    """Test that saving a stored post rewrites it and increments its version."""
+    post = make_post()
+    store.save(post)
+    post.status = PostStatus.PUBLISHED
+    post.published_at = 100.0
+    store.save(post)
+
+    assert post.version == 2
+    assert store.get(post.id) == post
+    assert len(store) == 1
+
+
+def test_list_filters_by_status_in_creation_order(store):
+    """Test that posts are listed in insertion order and filtered by status."""
+    first = store.add(make_post("1"))
+    store.add(make_post("2", platform=SocialPlatform.LINKEDIN, status=PostStatus.APPROVED))
+    third = store.add(make_post("3"))
+
+    assert [post.id for post in store.list(status=PostStatus.PENDING_APPROVAL)] == [first, third]
+    assert len(store.list()) == len(store) == 3
+
+
+def test_published_since_and_clear_keeps_published(store):
+    """Test published post lookup and that clearing the queue keeps published posts."""
+    store.add(make_post("old", status=PostStatus.PUBLISHED, published_at=100.0))
+    recent = store.add(make_post("new", status=PostStatus.PUBLISHED, published_at=200.0))
+    store.add(make_post("li", platform=SocialPlatform.LINKEDIN, status=PostStatus.PUBLISHED, published_at=300.0))
+    store.add(make_post("draft"))
+
+    assert [post.id for post in store.published_since(150.0, platform="twitter")] == [recent]
+
+    store.clear(include_published=False)
+    assert len(store) == 3
+
+
+def test_migrates_stores_from_earlier_versions(tmp_path):
+    """Test that older tables gain the new columns and status labels become statuses."""
+    path = str(tmp_path / "posts.sqlite3")
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE posts (seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE NOT NULL, "
+        "platform TEXT NOT NULL, style TEXT, content TEXT NOT NULL, status TEXT NOT NULL, source_url TEXT, "
+        "metadata TEXT NOT NULL DEFAULT '{}', created_at REAL NOT NULL, updated_at REAL NOT NULL, published_at REAL)"
+    )
+    db.execute(
+        "INSERT INTO posts (id, platform, content, status, metadata, created_at, updated_at) "
+        "VALUES ('a', 'twitter', 'Hi', 'Pending Review', '{\"duplicate_of\": \"b\"}', 1, 1)"
+    )
+    db.commit()
+    db.close()
+
+    store = PostStore(path)
+    post = store.get("a")
+    assert (post.status, post.version, post.media_urls, post.content_hash) == (
+        PostStatus.PENDING_APPROVAL, 1, (), None
+    )
+    assert store.count(status=PostStatus.PENDING_APPROVAL) == len(store) == 1
+    assert store.update("a", title="T").metadata == {"duplicate_of": "b", "title": "T"}
+    store.close()
+
+
+def test_page_walks_filtered_posts_with_a_cursor(store):
+    """Test keyset pagination over filtered posts."""
+    ids = [
+        store.add(make_post(str(i), platform=SocialPlatform.LINKEDIN if i % 3 == 0 else SocialPlatform.TWITTER,
+                            source_url=f"https://example.com/{i % 2}"))
+        for i in range(10)
+    ]
+    store.update(ids[1], status=PostStatus.EDITED)
+    store.update(ids[2], status=PostStatus.APPROVED)
+
+    seen, cursor = [], None
+    while True:
+        posts, cursor = store.page(status=(PostStatus.PENDING_APPROVAL, PostStatus.EDITED), after=cursor, limit=3)
+        seen.extend(post.id for post in posts)
+        if cursor is None:
+            break
+    assert seen == [post_id for i, post_id in enumerate(ids) if i != 2]
+
+    posts, cursor = store.page(platform="linkedin", source_url="https://example.com/0")
+    assert [post.content for post in posts] == ["0", "6"] and cursor is None
+
+
+def test_counts_follow_adds_updates_and_deletes(store):
+    """Test that the maintained counts match the posts."""
+    first = store.add(make_post())
+    store.add(make_post(platform=SocialPlatform.LINKEDIN, source_url="https://example.com"))
+    store.add(make_post(status=PostStatus.APPROVED))
+    store.update(first, status=PostStatus.EDITED)
+
+    assert store.status_counts() == {
+        PostStatus.PENDING_APPROVAL: 1, PostStatus.EDITED: 1, PostStatus.APPROVED: 1
+    }
+    assert store.count(status=[PostStatus.PENDING_APPROVAL, PostStatus.EDITED]) == 2
+    assert store.count(platform=SocialPlatform.TWITTER) == 2
+    assert store.count(source_url="https://example.com") == 1
+
+    store.delete(first)
+    assert store.count(status=PostStatus.EDITED) == 0
+    store.clear()
+    assert len(store) == 0 and store.status_counts() == {}
@@ -0,0 +1,97 @@
+"""Tests for runtime profiling and the admin profiling endpoints."""
+
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+from src.utils.profiler import ProfilingSession, SamplingProfiler, SlowCallbackMonitor
+
+
+def busy_work(seconds):
+    """Spin on the CPU."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_profiler_folds_stacks():
+    """Test that sampled stacks include the running function, root first."""
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_work(0.1)
+    profiler.stop()
+
+    assert profiler.samples > 10
+    folded = profiler.folded().splitlines()
+    busy = [line for line in folded if "busy_work (test_profiler.py" in line]
+    assert busy and busy[0].startswith("MainThread;")
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in folded)
+
+
+@pytest.mark.allow_blocking
+@pytest.mark.asyncio
+async def test_slow_callback_monitor_reports_blocking_tasks():
+    """Test that a coroutine blocking the loop is reported with its task and the hook is removed."""
+    original = asyncio.Handle._run
+    monitor = SlowCallbackMonitor(threshold=0.05)
+    monitor.start()
+
+    async def blocking_scrape():
+        time.sleep(0.08)
+
+    async def polite():
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(
+        asyncio.create_task(blocking_scrape(), name="scrape"),
+        asyncio.create_task(polite(), name="polite"),
+    )
+    monitor.stop()
+
+    assert asyncio.Handle._run is original
+    record, = monitor.records
+    assert record["callback"].startswith("task scrape (")
+    assert "blocking_scrape" in record["callback"]
+    assert record["duration_ms"] >= 80
+
+
+@pytest.mark.asyncio
+async def test_session_stops_when_the_window_ends():
+    """Test that a session ends by itself and cannot be started twice."""
+    session = ProfilingSession()
+    session.start(seconds=0.05, interval_ms=1, slow_callback_ms=0)
+    with pytest.raises(RuntimeError):
+        session.start()
+
+    await asyncio.sleep(0.1)
+    summary = session.summary()
+    assert summary["running"] is False
+    assert summary["samples"] > 0 and summary["tasks"]["count"] >= 1
+    assert session.folded()
+
+
+@pytest.mark.asyncio
+async def test_admin_endpoints_are_guarded_by_config():
+    """Test that profiling endpoints are hidden when disabled and require the admin token."""
+    from src import app
+
+    transport = httpx.ASGITransport(app=app.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.post("/admin/profile/start")).status_code == 404
+
+        with patch.object(app.settings, "profiling_enabled", True), \
+                patch.object(app.settings, "profiling_admin_token", "secret"), \
+                patch.object(app, "profiling_session", ProfilingSession()):
+            assert (await client.post("/admin/profile/start")).status_code == 403
+
+            headers = {"X-Admin-Token": "secret"}
+            started = await client.post("/admin/profile/start?seconds=5&interval_ms=1", headers=headers)
+            assert started.json()["running"] is True
+            await asyncio.sleep(0.05)
+            stopped = await client.post("/admin/profile/stop", headers=headers)
+            folded = await client.get("/admin/profile/folded", headers=headers)
+
+    assert stopped.json()["running"] is False and stopped.json()["samples"] > 0
+    assert folded.headers["content-type"].startswith("text/plain")
+    assert folded.text.count("\n") >= 1
@@ -0,0 +1,84 @@
+"""Tests for near-duplicate checks against published posts."""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.agents.generate_post_graph import publish_posts_node
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+from src.utils.post_store import PostStore
+from src.utils.published_index import PublishedPostIndex
+
+POST = "Big news: the city approves 12 km of protected bike lanes downtown! Construction starts next spring."
+REWORDED = "BIG NEWS - the city approves 12km of protected bike lanes downtown. Construction starts next spring 🚲"
+HOUR = 3600
+
+
+def published(platform, published_at):
+    """Build a published post."""
+    return GeneratedPost(platform=platform, content=POST, status=PostStatus.PUBLISHED, published_at=published_at)
+
+
+@pytest.fixture
+def store():
+    """Create an in-memory post store."""
+    post_store = PostStore(":memory:")
+    yield post_store
+    post_store.close()
+
+
+def test_find_is_per_platform_and_windowed(store):
+    """Test that matches are limited to the same platform and the time window."""
+    index = PublishedPostIndex(store, window_hours=24, threshold=0.7)
+    index.add("tweet-1", "twitter", POST, published_at=1000 * HOUR)
+
+    match = index.find("twitter", REWORDED, now=1001 * HOUR)
+    assert match.post_id == "tweet-1"
+    assert match.similarity > 0.7
+    assert index.find("linkedin", REWORDED, now=1001 * HOUR) is None
+    assert index.find("twitter", REWORDED, now=1025 * HOUR) is None
+
+
+def test_sync_loads_window_then_only_new_posts(store):
+    """Test that the index is rebuilt from the store and then synced incrementally."""
+    store.add(published(SocialPlatform.TWITTER, 900 * HOUR))
+    recent = store.add(published(SocialPlatform.TWITTER, 990 * HOUR))
+
+    index = PublishedPostIndex(store, window_hours=24, threshold=0.7)
+    assert index.sync(now=1000 * HOUR) == 1
+    assert index.find("twitter", REWORDED, now=1000 * HOUR).post_id == recent
+
+    store.add(published(SocialPlatform.LINKEDIN, 999 * HOUR))
+    assert index.sync(now=1000 * HOUR) == 1
+    assert index.sync(now=1000 * HOUR) == 0
+    assert index.find("linkedin", REWORDED, now=1000 * HOUR) is not None
+
+
+@pytest.mark.asyncio
+async def test_publish_blocks_near_duplicates(store):
+    """Test that publishing skips a near duplicate and records published posts."""
+    index = PublishedPostIndex(store, window_hours=24, threshold=0.7)
+    twitter = AsyncMock(return_value="external-1")
+    state = {
+        "input": {"url": "https://example.com/a"},
+        "posts": [
+            GeneratedPost(platform=SocialPlatform.TWITTER, content=POST, style="casual"),
+            GeneratedPost(platform=SocialPlatform.TWITTER, content=REWORDED, style="casual"),
+        ],
+        "errors": [],
+    }
+
+    with patch("src.utils.published_index.post_store", store), \
+            patch("src.utils.published_index.published_index", index), \
+            patch("src.agents.platforms.arcade_client.post_to_twitter", twitter):
+        result = await publish_posts_node(state)
+
+    first, second = result["posts"]
+    assert first.status == PostStatus.PUBLISHED
+    assert second.status == PostStatus.FAILED
+    assert second.metadata["duplicate_of"] == first.id
+    assert twitter.await_count == 1
+    assert result["errors"][0].startswith("Skipped twitter post: near duplicate")
+
+    stored = store.get(first.id)
+    assert (stored.status, stored.style, stored.metadata["post_id"], stored.source_url) == (
+        PostStatus.PUBLISHED, "casual", "external-1", "https://example.com/a"
+    )
@@ -0,0 +1,104 @@
+"""Tests for the adaptive LLM limiter."""
+
+import asyncio
+import pytest
+from src.utils.metrics import metrics
+from src.utils.rate_limiter import AdaptiveLimiter, estimate_tokens
+
+
+class RateLimitError(Exception):
+    """Stand-in for an upstream 429 error."""
+    status_code = 429
+
+
+def make_limiter(**overrides):
+    """Create a limiter with generous defaults for testing."""
+    options = {
+        "name": "test",
+        "requests_per_minute": 1000,
+        "tokens_per_minute": 1_000_000,
+        "max_concurrency": 4,
+    }
+    options.update(overrides)
+    return AdaptiveLimiter(**options)
+
+
+def test_estimate_tokens():
+    """Test the rough token estimate."""
+    assert estimate_tokens("a" * 400, "b" * 400) == 201
+
+
+@pytest.mark.asyncio
+async def test_callers_are_admitted_in_arrival_order():
+    """Test that queued callers start in FIFO order once slots free up."""
+    limiter = make_limiter(max_concurrency=1)
+    order = []
+
+    async def call(index):
+        async with limiter.acquire():
+            order.append(index)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[call(i) for i in range(5)])
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.in_flight == 0
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_never_exceeds_limit():
+    """Test that the number of concurrent calls stays within the limit."""
+    limiter = make_limiter(max_concurrency=2)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        async with limiter.acquire():
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[call() for _ in range(6)])
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_error_halves_concurrency():
+    """Test multiplicative decrease on 429 and additive recovery on success."""
+    metrics.reset()
+    limiter = make_limiter(max_concurrency=8)
+
+    with pytest.raises(RateLimitError):
+        async with limiter.acquire():
+            raise RateLimitError()
+    assert limiter.limit == 4
+    assert metrics.counter("llm_limiter_rate_limited_total", limiter="test") == 1
+
+    async with limiter.acquire():
+        pass
+    assert limiter.limit == pytest.approx(4.25)
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_reduce_concurrency():
+    """Test that latency above the target is treated as congestion."""
+    limiter = make_limiter(max_concurrency=8, latency_target=0.0)
+    async with limiter.acquire():
+        await asyncio.sleep(0.01)
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_until_window_expires():
+    """Test that a call over the token budget waits for the window to roll over."""
+    metrics.reset()
+    limiter = make_limiter(tokens_per_minute=100, window_seconds=0.1)
+    loop = asyncio.get_running_loop()
+
+    async with limiter.acquire(estimated_tokens=80):
+        pass
+    started = loop.time()
+    async with limiter.acquire(estimated_tokens=80):
+        waited = loop.time() - started
+
+    assert waited >= 0.05
+    assert metrics.histogram("llm_limiter_wait_seconds", limiter="test").count == 2
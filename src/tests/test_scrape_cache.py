@@ -0,0 +1,155 @@
+"""Tests for scrape caching and conditional revalidation."""
+
+import pytest
+from unittest.mock import patch
+from src.agents.generate_post_graph import generate_posts_node
+from src.agents.types import SocialPlatform
+from src.utils.content_store import ContentStore, content_store
+from src.utils.metrics import metrics
+from src.utils.scrape_cache import ScrapeCache, content_hash
+from src.utils.scrape_engines import LocalEngine
+from src.utils.scraper import ContentScraper
+
+
+@pytest.fixture
+async def local_scraper():
+    """Create a scraper using only the local engine and an always-expired cache."""
+    engine = LocalEngine()
+    scraper = ContentScraper(
+        engines={"local": engine},
+        engine="local",
+        strategy="single",
+        domain_engines={},
+        cache=ScrapeCache(ttl=0)
+    )
+    yield scraper
+    await engine.aclose()
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_revalidated_with_etag(fixture_server, local_scraper):
+    """Test that an expired entry is revalidated with If-None-Match and reused on 304."""
+    metrics.reset()
+    url = f"{fixture_server.url}/pages/article.html"
+
+    first = await local_scraper.scrape_url(url)
+    second = await local_scraper.scrape_url(url)
+
+    assert fixture_server.statuses == [200, 304]
+    assert second == first
+    assert local_scraper.cache.get(url).etag.startswith('"')
+    assert metrics.counter("scrape_not_modified_total") == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_revalidated_with_last_modified(fixture_server, local_scraper):
+    """Test revalidation with If-Modified-Since when the server sends no ETag."""
+    fixture_server.use_etags = False
+    url = f"{fixture_server.url}/pages/blog.html"
+
+    await local_scraper.scrape_url(url)
+    await local_scraper.scrape_url(url)
+
+    assert fixture_server.statuses == [200, 304]
+    assert local_scraper.cache.get(url).last_modified is not None
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_skips_the_network(fixture_server):
+    """Test that a fresh cached result is returned without a request."""
+    engine = LocalEngine()
+    scraper = ContentScraper(
+        engines={"local": engine}, engine="local", strategy="single",
+        domain_engines={}, cache=ScrapeCache(ttl=60)
+    )
+    url = f"{fixture_server.url}/pages/blog.html"
+    try:
+        await scraper.scrape_url(url)
+        await scraper.scrape_url(url)
+    finally:
+        await engine.aclose()
+
+    assert fixture_server.statuses == [200]
+
+
+@pytest.mark.asyncio
+async def test_cache_keeps_documents_only_in_content_store(tmp_path):
+    """Test that cache entries hold the hash only and a lost document is fetched again."""
+    fetches = []
+
+    class StaticEngine:
+        name = "firecrawl"
+
+        async def scrape(self, url, validators=None, options=None):
+            fetches.append(url)
+            return {"content": "Stored body", "metadata": {"url": url}}
+
+    store = ContentStore(str(tmp_path))
+    scraper = ContentScraper(
+        engines={"firecrawl": StaticEngine()}, engine="firecrawl", strategy="single",
+        domain_engines={}, cache=ScrapeCache(ttl=60), store=store
+    )
+    first = await scraper.scrape_url("https://example.com/a")
+    entry = scraper.cache.get("https://example.com/a")
+    assert "content" not in entry.result
+    assert store.get(entry.content_hash) == "Stored body"
+
+    assert await scraper.scrape_url("https://example.com/a") == first
+    assert len(fetches) == 1
+
+    store.path_for(entry.content_hash).unlink()
+    assert await scraper.scrape_url("https://example.com/a") == first
+    assert len(fetches) == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_body_keeps_content_hash():
+    """Test that a full re-fetch of an unchanged body is detected by its hash."""
+    metrics.reset()
+
+    class StaticEngine:
+        name = "firecrawl"
+
+        async def scrape(self, url, validators=None, options=None):
+            return {"content": "Same body", "metadata": {"url": url}}
+
+    scraper = ContentScraper(
+        engines={"firecrawl": StaticEngine()}, engine="firecrawl", strategy="single",
+        domain_engines={}, cache=ScrapeCache(ttl=0)
+    )
+    first = await scraper.scrape_url("https://example.com/a")
+    second = await scraper.scrape_url("https://example.com/a")
+
+    assert first["content_hash"] == second["content_hash"] == content_hash("Same body")
+    assert metrics.counter("scrape_unchanged_total") == 1
+
+
+@pytest.mark.asyncio
+async def test_generation_reuses_posts_for_unchanged_content():
+    """Test that posts generated for a content hash are reused on the next run."""
+    calls = []
+
+    async def fake_variants(platform, content, styles):
+        calls.append((platform, list(styles)))
+        return {style: f"{platform}:{style}" for style in styles}
+
+    def make_state(styles):
+        return {
+            "input": {"url": "https://example.com", "platforms": [SocialPlatform.TWITTER], "styles": styles},
+            "content_hash": content_store.put("Article body"),
+            "posts": [],
+            "errors": [],
+        }
+
+    cache = ScrapeCache(ttl=0)
+    with patch("src.agents.generate_post_graph.scraper.cache", cache), \
+            patch("src.agents.generate_post_graph.content_generator.generate_variants", fake_variants):
+        await generate_posts_node(make_state(["casual"]))
+        result = await generate_posts_node(make_state(["casual", "technical"]))
+
+    assert calls == [("twitter", ["casual"]), ("twitter", ["technical"])]
+    assert [(p.style, p.metadata.get("reused", False)) for p in result["posts"]] == [
+        ("casual", True),
+        ("technical", False),
+    ]
+    assert cache.get_output(content_hash("Article body"), "condensed") == "Article body"
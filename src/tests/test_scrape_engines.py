@@ -0,0 +1,173 @@
+"""Tests for the local scrape engine and engine selection."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from src.config import settings
+from src.utils.html_extract import extract_article
+from src.utils.scrape_engines import FirecrawlEngine, LocalEngine, ScrapeOptions
+from src.utils.scraper import ContentScraper
+from src.tests.conftest import FIXTURES_DIR
+
+
+class StubEngine:
+    """Engine returning a fixed result or raising."""
+
+    def __init__(self, name, content=None, error=None):
+        self.name = name
+        self.content = content
+        self.error = error
+        self.calls = 0
+
+    async def scrape(self, url, validators=None, options=None):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return {"content": self.content, "metadata": {"url": url}}
+
+
+def test_extract_article_keeps_main_content_only():
+    """Test that boilerplate is dropped and the article is converted to markdown."""
+    html = (FIXTURES_DIR / "pages" / "article.html").read_text()
+    article = extract_article(html, base_url="https://news.example.com/tenders/")
+
+    assert article["title"] == "Open Tender: City Bike Lanes"
+    assert article["description"].startswith("The city opens a tender")
+    markdown = article["markdown"]
+    assert markdown.startswith("# Open Tender: City Bike Lanes")
+    assert "## Key requirements" in markdown
+    assert "- Completion within 18 months of award" in markdown
+    assert "**urban infrastructure**" in markdown
+    assert "[full technical specification](https://news.example.com/docs/spec.pdf)" in markdown
+    assert "> Safe cycling" in markdown
+    for boilerplate in ("Home", "Related tenders", "Great news", "All rights reserved", "analytics"):
+        assert boilerplate not in markdown
+
+
+@pytest.mark.asyncio
+async def test_local_engine_scrapes_fixture_page(fixture_server):
+    """Test fetching and extracting a page served by a local HTTP server."""
+    engine = LocalEngine()
+    try:
+        result = await engine.scrape(f"{fixture_server.url}/pages/blog.html")
+    finally:
+        await engine.aclose()
+
+    assert result["title"] == "Shipping faster with LangGraph"
+    assert result["metadata"]["description"] == "Notes from moving our agent workflow to LangGraph."
+    assert "*small*" in result["content"]
+    assert "newsletter" not in result["content"]
+
+
+def test_domain_rules_pick_primary_engine():
+    """Test that domain rules apply to the domain and its subdomains."""
+    scraper = ContentScraper(
+        engines={"firecrawl": StubEngine("firecrawl"), "local": StubEngine("local")},
+        engine="firecrawl",
+        strategy="fallback",
+        domain_engines={"example.com": "local"}
+    )
+    assert scraper.select_engines("https://blog.example.com/post") == ["local", "firecrawl"]
+    assert scraper.select_engines("https://other.org/post") == ["firecrawl", "local"]
+
+
+@pytest.mark.asyncio
+async def test_fallback_on_failure():
+    """Test that the next engine is used when the primary fails."""
+    firecrawl = StubEngine("firecrawl", error=RuntimeError("timeout"))
+    local = StubEngine("local", content="Local content")
+    scraper = ContentScraper(
+        engines={"firecrawl": firecrawl, "local": local},
+        engine="firecrawl",
+        strategy="fallback",
+        domain_engines={}
+    )
+
+    assert (await scraper.scrape_url("https://example.com"))["content"] == "Local content"
+    assert firecrawl.calls == local.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_single_strategy_does_not_fall_back():
+    """Test that the single strategy only uses the primary engine."""
+    local = StubEngine("local", content="Local content")
+    scraper = ContentScraper(
+        engines={"firecrawl": StubEngine("firecrawl", content=""), "local": local},
+        engine="firecrawl",
+        strategy="single",
+        domain_engines={}
+    )
+
+    assert await scraper.scrape_url("https://example.com") is None
+    assert local.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_race_returns_first_success():
+    """Test that racing engines returns a successful result even if one fails."""
+    scraper = ContentScraper(
+        engines={
+            "firecrawl": StubEngine("firecrawl", error=RuntimeError("down")),
+            "local": StubEngine("local", content="Raced content"),
+        },
+        engine="firecrawl",
+        strategy="race",
+        domain_engines={}
+    )
+
+    assert (await scraper.scrape_url("https://example.com"))["content"] == "Raced content"
+
+
+@pytest.mark.asyncio
+async def test_local_engine_drops_html_unless_requested(fixture_server):
+    """Test that raw HTML is only kept when the html format is requested."""
+    engine = LocalEngine()
+    url = f"{fixture_server.url}/pages/article.html"
+    try:
+        default = await engine.scrape(url, options=ScrapeOptions(formats=("markdown",)))
+        with_html = await engine.scrape(url, options=ScrapeOptions(formats=("markdown", "html")))
+    finally:
+        await engine.aclose()
+
+    assert "html" not in default
+    assert with_html["html"].startswith("<!DOCTYPE html>")
+
+
+@pytest.mark.asyncio
+async def test_local_engine_truncates_large_documents(fixture_server):
+    """Test that reading stops at the maximum document size."""
+    engine = LocalEngine()
+    options = ScrapeOptions(formats=("markdown", "html"), max_document_bytes=1200)
+    try:
+        result = await engine.scrape(f"{fixture_server.url}/pages/article.html", options=options)
+    finally:
+        await engine.aclose()
+
+    assert len(result["html"].encode("utf-8")) <= 1200
+    assert result["metadata"]["truncated"] is True
+
+
+@pytest.mark.asyncio
+async def test_firecrawl_engine_requests_only_needed_formats():
+    """Test that FireCrawl is asked for markdown only and HTML is not kept."""
+    document = MagicMock(markdown="# Title", html="<h1>Title</h1>")
+    document.metadata.title = "Title"
+    document.metadata.description = ""
+    app = MagicMock()
+    app.scrape.return_value = document
+
+    result = await FirecrawlEngine(app=app).scrape(
+        "https://example.com", options=ScrapeOptions(formats=("markdown",), max_document_bytes=4)
+    )
+
+    app.scrape.assert_called_once_with("https://example.com", formats=["markdown"])
+    assert "html" not in result
+    assert result["content"] == "# Ti"
+    assert result["metadata"]["truncated"] is True
+
+
+def test_firecrawl_engine_uses_configured_api_url():
+    """Test that FireCrawl can be pointed at another endpoint (e.g. a local stand-in)."""
+    with patch.object(settings, "firecrawl_api_url", "http://127.0.0.1:9"):
+        engine = FirecrawlEngine()
+
+    assert engine.app.api_url == "http://127.0.0.1:9"
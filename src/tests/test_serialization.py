@@ -0,0 +1,98 @@
+"""Tests for the msgpack state serializer and graph checkpointing."""
+
+import pickle
+import pytest
+from unittest.mock import AsyncMock, patch
+from langgraph.checkpoint.memory import InMemorySaver
+from src.agents.generate_post_graph import create_generate_post_graph, graph_config
+from src.agents.types import GeneratedPost, PostStatus, PostStyle, SocialPlatform
+from src.utils.serialization import StateSerializer
+
+ARTICLE = "The city council approved a network of protected bike lanes downtown. " * 200
+
+
+def make_state():
+    """Build a graph state with an article and posts."""
+    return {
+        "input": {"url": "https://example.com", "platforms": [SocialPlatform.TWITTER, SocialPlatform.REDDIT]},
+        "content": ARTICLE,
+        "content_hash": "abc",
+        "duplicate_of": None,
+        "posts": [
+            GeneratedPost(
+                SocialPlatform.REDDIT, "Title\n\nBody", PostStatus.EDITED, media_urls=("https://example.com/a.png",),
+                metadata={"subreddit": "python"}, id="p1", style=PostStyle.CASUAL.value, version=3
+            ),
+            GeneratedPost(SocialPlatform.TWITTER, "A tweet", PostStatus.PENDING_APPROVAL),
+        ],
+        "errors": [],
+        "is_approved": False,
+    }
+
+
+@pytest.mark.parametrize("compression", ["zstd", "none"])
+def test_round_trip_restores_posts_and_enums(compression):
+    """Test that state decodes to equal posts, enum members and text."""
+    serializer = StateSerializer(compression=compression, compress_min_bytes=1024)
+    state = make_state()
+
+    decoded = serializer.loads(serializer.dumps(state))
+    assert decoded == state
+    assert isinstance(decoded["posts"][0], GeneratedPost)
+    assert decoded["posts"][0].media_urls == ("https://example.com/a.png",)
+    assert decoded["input"]["platforms"][1] is SocialPlatform.REDDIT
+
+
+def test_compressed_state_is_smaller_than_json_and_pickle():
+    """Test that compressing the article makes the state much smaller."""
+    state = make_state()
+    compressed = StateSerializer(compression="zstd", compress_min_bytes=1024).dumps(state)
+    plain = StateSerializer(compression="none").dumps(state)
+
+    assert len(compressed) < len(plain) / 10
+    assert len(plain) < len(pickle.dumps(state))
+
+
+def test_checkpoint_values_fall_back_for_unsupported_types():
+    """Test that values msgpack cannot encode use LangGraph's serializer."""
+    serializer = StateSerializer()
+    assert serializer.dumps_typed([1, "a"])[0] == serializer.type_name
+    assert serializer.dumps_typed(ARTICLE)[0] == serializer.type_name
+
+    typed = serializer.dumps_typed({1, 2})
+    assert typed[0] != serializer.type_name
+    assert serializer.loads_typed(typed) == {1, 2}
+    assert serializer.loads_typed(serializer.dumps_typed(ARTICLE)) == ARTICLE
+
+
+@pytest.mark.asyncio
+async def test_graph_checkpoints_round_trip_through_serializer():
+    """Test that a checkpointed run restores the posts from its checkpoint."""
+    async def fake_variants(platform, content, styles):
+        return {style: f"{platform} post" for style in styles}
+
+    scrape = AsyncMock(return_value={"content": ARTICLE, "content_hash": "hash-1"})
+    graph = create_generate_post_graph(checkpointer=InMemorySaver(serde=StateSerializer()))
+    config = graph_config("thread-1")
+    with patch("src.agents.generate_post_graph.scraper.scrape_url", scrape), \
+            patch("src.agents.generate_post_graph.find_near_duplicate", AsyncMock(return_value=None)), \
+            patch("src.agents.generate_post_graph.content_generator.generate_variants", fake_variants), \
+            patch("src.agents.generate_post_graph.content_generator.summarize_content", AsyncMock(return_value="S")), \
+            patch("src.agents.generate_post_graph.content_generator.extract_key_points", AsyncMock(return_value=[])):
+        await graph.ainvoke({
+            "input": {"url": "https://example.com", "platforms": [SocialPlatform.TWITTER]},
+            "posts": [],
+            "errors": [],
+            "human_feedback": None,
+            "is_approved": False
+        }, config=config)
+
+    snapshot = await graph.aget_state(config)
+    post, = snapshot.values["posts"]
+    assert isinstance(post, GeneratedPost)
+    assert (post.platform, post.content, post.status) == (
+        SocialPlatform.TWITTER, "twitter post", PostStatus.PENDING_APPROVAL
+    )
+    # The checkpoint refers to the article by hash instead of carrying it
+    assert snapshot.values["content_hash"] == "hash-1" and "content" not in snapshot.values
+    assert post.content_hash == "hash-1"
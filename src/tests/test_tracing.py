@@ -0,0 +1,126 @@
+"""Tests for request tracing spans and exporters."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from src.tests.fakes import FakeCachingChatModel
+from src.utils.llm import ContentGenerator
+from src.utils.tracing import JsonlExporter, RingBufferExporter, Span, Tracer, current_span, traced
+
+
+@pytest.fixture
+def tracer():
+    """Enable the global tracer with an empty buffer."""
+    from src.utils import tracing
+
+    enabled = Tracer(enabled=True, buffer_size=100)
+    with patch.object(tracing, "tracer", enabled):
+        yield enabled
+
+
+def test_disabled_tracer_records_nothing():
+    """Test that a disabled tracer hands out a shared no-op span."""
+    disabled = Tracer(enabled=False, buffer_size=10)
+    with disabled.span("request") as span:
+        span.set(ignored=True)
+        assert current_span() is None
+    assert disabled.span("a") is disabled.span("b")
+    assert disabled.buffer.traces() == []
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks(tracer):
+    """Test that spans started in concurrent tasks join the trace of the enclosing span."""
+    @traced("child")
+    async def child(index):
+        current_span().set(index=index)
+        await asyncio.sleep(0)
+
+    async with tracer.span("request", path="/generate") as root:
+        await asyncio.gather(child(0), child(1))
+
+    spans = tracer.buffer.trace(root.trace_id)
+    assert [span.name for span in spans] == ["request", "child", "child"]
+    assert all(span.parent_id == root.span_id for span in spans[1:])
+    assert sorted(span.attributes["index"] for span in spans[1:]) == [0, 1]
+    assert root.duration_ms > 0
+
+
+def test_errors_are_recorded_and_raised(tracer):
+    """Test that a failing span is marked as an error."""
+    with pytest.raises(ValueError):
+        with tracer.span("scrape"):
+            raise ValueError("boom")
+
+    span, = tracer.buffer.traces()[0]
+    assert (span.status, span.error) == ("error", "ValueError: boom")
+
+
+def test_ring_buffer_evicts_oldest_spans():
+    """Test that the buffer keeps the newest spans and drops emptied traces."""
+    buffer = RingBufferExporter(max_spans=3)
+    for i in range(4):
+        buffer.export(Span(trace_id=f"t{i // 2}", span_id=str(i), parent_id=None, name=str(i), start=i))
+
+    assert [[span.name for span in spans] for spans in buffer.traces()] == [["2", "3"], ["1"]]
+    buffer.export(Span(trace_id="t2", span_id="4", parent_id=None, name="4", start=4))
+    assert buffer.trace("t0") == []
+
+
+def test_jsonl_exporter_writes_one_line_per_span(tmp_path):
+    """Test that spans are appended as JSON lines."""
+    path = tmp_path / "traces" / "spans.jsonl"
+    exporter = JsonlExporter(str(path))
+    exporter.export(Span(trace_id="t", span_id="c", parent_id="r", name="llm.twitter", start=1.0, duration_ms=5))
+    exporter.export(Span(trace_id="t", span_id="r", parent_id=None, name="GET /", start=0.5, duration_ms=9))
+    exporter.close()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["llm.twitter", "GET /"]
+    assert lines[0]["parent_id"] == "r"
+
+
+@pytest.mark.asyncio
+async def test_llm_span_is_exported_with_token_usage(tmp_path):
+    """Test that token usage is on the LLM span before it reaches the exporters."""
+    path = tmp_path / "spans.jsonl"
+    enabled = Tracer(enabled=True, buffer_size=10, jsonl_path=str(path))
+    generator = ContentGenerator(llm=FakeCachingChatModel(reply="A tweet"))
+    with patch("src.utils.llm.tracer", enabled):
+        await generator.generate_post("twitter", "Article body")
+    enabled.exporters[-1].close()
+
+    line, = [json.loads(line) for line in path.read_text().splitlines()]
+    assert line["name"] == "llm.twitter"
+    assert line["attributes"]["input_tokens"] > 0
+    assert line["attributes"]["output_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_graph_run_is_traced_per_node(tracer):
+    """Test that a graph run yields node spans under the caller's span."""
+    from src.agents.generate_post_graph import create_generate_post_graph
+
+    async def fake_variants(platform, content, styles):
+        return {style: f"{platform} post" for style in styles}
+
+    scrape = AsyncMock(return_value={"content": "Article body", "content_hash": None})
+    with patch("src.agents.generate_post_graph.scraper.scrape_url", scrape), \
+            patch("src.agents.generate_post_graph.find_near_duplicate", AsyncMock(return_value=None)), \
+            patch("src.agents.generate_post_graph.content_generator.generate_variants", fake_variants), \
+            patch("src.agents.generate_post_graph.content_generator.summarize_content", AsyncMock(return_value="S")), \
+            patch("src.agents.generate_post_graph.content_generator.extract_key_points", AsyncMock(return_value=[])):
+        with tracer.span("POST /generate") as root:
+            await create_generate_post_graph().ainvoke({
+                "input": {"url": "https://example.com", "platforms": ["twitter", "linkedin"]},
+                "posts": [],
+                "errors": [],
+            })
+
+    spans = tracer.buffer.trace(root.trace_id)
+    names = [span.name for span in spans]
+    assert names[0] == "POST /generate"
+    assert {"graph.scrape_content", "graph.summarize_content", "graph.human_approval"} <= set(names)
+    assert names.count("graph.generate_posts") == 2
+    assert {span.parent_id for span in spans[1:]} == {root.span_id}
@@ -0,0 +1,71 @@
+"""Shared timing hook around the callbacks run by asyncio event loops."""
+
+import asyncio
+import threading
+import time
+from typing import Tuple
+
+
+class CallbackHook:
+    """
+    Times every callback run by an event loop and reports it to observers.
+
+    ``asyncio.Handle._run`` is wrapped once, while at least one observer is
+    registered, and restored when the last one is removed. Features that
+    need callback timings (the slow-callback monitor of a profiling
+    session, the loop monitor) register here instead of wrapping the method
+    themselves, so starting and stopping them in any order never drops
+    another feature's hook.
+
+    Observers implement ``callback_started(handle, started)``, called on the
+    loop thread before the callback runs, and
+    ``callback_finished(handle, started, elapsed)``, called after it;
+    times come from ``time.perf_counter``.
+    """
+
+    def __init__(self):
+        """Initialize the hook without observers."""
+        self._observers: Tuple = ()
+        self._lock = threading.Lock()
+        self._original = None
+
+    def add(self, observer):
+        """Register an observer, wrapping ``asyncio.Handle._run`` if needed."""
+        with self._lock:
+            if observer in self._observers:
+                return
+            self._observers = self._observers + (observer,)
+            if self._original is None:
+                self._install()
+
+    def remove(self, observer):
+        """Unregister an observer, restoring ``asyncio.Handle._run`` after the last one."""
+        with self._lock:
+            self._observers = tuple(o for o in self._observers if o is not observer)
+            if not self._observers and self._original is not None:
+                asyncio.Handle._run = self._original
+                self._original = None
+
+    def _install(self):
+        original = self._original = asyncio.Handle._run
+        hook = self
+
+        def _run(handle):
+            observers = hook._observers
+            if not observers:
+                return original(handle)
+            started = time.perf_counter()
+            for observer in observers:
+                observer.callback_started(handle, started)
+            try:
+                return original(handle)
+            finally:
+                elapsed = time.perf_counter() - started
+                for observer in observers:
+                    observer.callback_finished(handle, started, elapsed)
+
+        asyncio.Handle._run = _run
+
+
+# Global callback hook shared by the profiler and the loop monitor
+callback_hook = CallbackHook()
@@ -0,0 +1,114 @@
+"""Content-addressed store of scraped documents, compressed on disk."""
+
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional
+from src.config import settings
+from src.utils.metrics import metrics
+from src.utils.scrape_cache import content_hash
+
+# Optional zstd compression; zlib is used without it
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class ContentStore:
+    """
+    Stores each scraped document once, under the SHA-256 hash of its text.
+
+    Graph state and posts hold only the hash; the text is read back when
+    it is needed (e.g. to condense it for the LLM). Documents are written as
+    ``<root>/<first two hex digits>/<hash>``, compressed with zstd (zlib
+    without the zstandard package; reads detect either), through a
+    temporary file and a rename, so concurrent writers of the same document
+    never expose a partial file. Storing a known document only checks that
+    its file exists.
+    """
+
+    def __init__(self, path: Optional[str] = None, level: Optional[int] = None):
+        """
+        Initialize the store.
+
+        Args:
+            path: Directory the documents are written to
+            level: zstd compression level
+        """
+        self.root = Path(path or settings.content_store_path)
+        level = settings.content_store_zstd_level if level is None else level
+        self._compress = zstandard.ZstdCompressor(level=level).compress if ZSTD_AVAILABLE else zlib.compress
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+
+    def path_for(self, digest: str) -> Path:
+        """Return the file path of a document hash."""
+        return self.root / digest[:2] / digest
+
+    def __contains__(self, digest: str) -> bool:
+        return self.path_for(digest).exists()
+
+    def put(self, text: str, digest: Optional[str] = None) -> str:
+        """
+        Store a document unless it is already stored.
+
+        Args:
+            text: The document text
+            digest: The text's content hash, if already computed
+
+        Returns:
+            The content hash
+        """
+        digest = digest or content_hash(text)
+        path = self.path_for(digest)
+        if path.exists():
+            metrics.incr("content_store_known_total")
+            return digest
+
+        data = self._compress(text.encode("utf-8"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        metrics.incr("content_store_writes_total")
+        metrics.incr("content_store_bytes_written_total", len(data))
+        return digest
+
+    def get(self, digest: str) -> str:
+        """
+        Read a document.
+
+        Args:
+            digest: The content hash
+
+        Returns:
+            The document text
+
+        Raises:
+            KeyError: If no document is stored under the hash
+        """
+        try:
+            data = self.path_for(digest).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+        if data[:4] == _ZSTD_MAGIC:
+            if self._decompressor is None:
+                raise RuntimeError(f"Document {digest} is zstd-compressed; install zstandard to read it")
+            raw = self._decompressor.decompress(data)
+        else:
+            raw = zlib.decompress(data)
+        metrics.incr("content_store_reads_total")
+        return raw.decode("utf-8")
+
+
+# Global content store
+content_store = ContentStore()
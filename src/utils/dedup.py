@@ -0,0 +1,317 @@
+"""Near-duplicate detection with SimHash (articles) and MinHash (short posts)."""
+
+import hashlib
+import re
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from src.config import settings
+
+FINGERPRINT_BITS = 64
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text, ignoring punctuation and markup."""
+    return _TOKEN.findall(text.lower())
+
+
+def shingles(text: str, size: int = 3) -> Counter:
+    """
+    Count the word n-grams of a text.
+
+    Args:
+        text: The text
+        size: Words per shingle
+
+    Returns:
+        Counter of shingles
+    """
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return Counter([" ".join(tokens)] if tokens else [])
+    return Counter(" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    Compute the 64-bit SimHash of a text over its word 3-grams.
+
+    Texts that differ only slightly (boilerplate, a changed sentence) get
+    fingerprints within a small Hamming distance of each other.
+
+    Returns:
+        The fingerprint, or None if the text has too few shingles to be meaningful
+    """
+    counts = shingles(text)
+    if sum(counts.values()) < settings.near_duplicate_min_shingles:
+        return None
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, weight in counts.items():
+        value = _hash64(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            if value >> bit & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class DuplicateMatch:
+    """An indexed document that is a near duplicate of a lookup."""
+    key: str
+    url: Optional[str]
+    distance: int
+
+
+class SimHashIndex:
+    """
+    Index of SimHash fingerprints supporting near-duplicate lookup.
+
+    Fingerprints are split into ``max_distance + 1`` bands; two fingerprints
+    within ``max_distance`` bits must agree exactly on at least one band, so
+    a lookup only compares against documents sharing a band instead of
+    scanning the whole index. The oldest entries are evicted beyond
+    ``max_entries``.
+    """
+
+    def __init__(self, max_distance: Optional[int] = None, max_entries: Optional[int] = None):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_distance: Largest Hamming distance treated as a near duplicate
+            max_entries: Maximum number of fingerprints kept
+        """
+        self.max_distance = settings.near_duplicate_max_distance if max_distance is None else max_distance
+        self.max_entries = max_entries or settings.near_duplicate_max_entries
+        self.band_count = self.max_distance + 1
+        self.band_width = -(-FINGERPRINT_BITS // self.band_count)
+        self._fingerprints: "OrderedDict[str, int]" = OrderedDict()
+        self._urls: Dict[str, Optional[str]] = {}
+        self._bands: List[Dict[int, Set[str]]] = [{} for _ in range(self.band_count)]
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _band_values(self, fingerprint: int):
+        mask = (1 << self.band_width) - 1
+        for band in range(self.band_count):
+            yield band, fingerprint >> (band * self.band_width) & mask
+
+    def add(self, key: str, fingerprint: int, url: Optional[str] = None):
+        """
+        Index a fingerprint.
+
+        Args:
+            key: Identifier of the document (its content hash)
+            fingerprint: SimHash of the document
+            url: Source URL, reported in matches
+        """
+        if key in self._fingerprints:
+            self._fingerprints.move_to_end(key)
+            return
+        self._fingerprints[key] = fingerprint
+        self._urls[key] = url
+        for band, value in self._band_values(fingerprint):
+            self._bands[band].setdefault(value, set()).add(key)
+
+        while len(self._fingerprints) > self.max_entries:
+            self.remove(next(iter(self._fingerprints)))
+
+    def remove(self, key: str):
+        """Drop a document from the index."""
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        self._urls.pop(key, None)
+        for band, value in self._band_values(fingerprint):
+            bucket = self._bands[band].get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._bands[band][value]
+
+    def find(self, fingerprint: int, exclude: Optional[str] = None) -> Optional[DuplicateMatch]:
+        """
+        Return the closest indexed near duplicate of a fingerprint.
+
+        Args:
+            fingerprint: SimHash to look up
+            exclude: Key to ignore (e.g. the document itself)
+
+        Returns:
+            The closest match within ``max_distance``, or None
+        """
+        candidates = set()
+        for band, value in self._band_values(fingerprint):
+            candidates.update(self._bands[band].get(value, ()))
+        candidates.discard(exclude)
+
+        best = None
+        for key in candidates:
+            distance = hamming_distance(fingerprint, self._fingerprints[key])
+            if distance <= self.max_distance and (best is None or distance < best.distance):
+                best = DuplicateMatch(key=key, url=self._urls[key], distance=distance)
+        return best
+
+    def clear(self):
+        """Drop all fingerprints."""
+        self._fingerprints.clear()
+        self._urls.clear()
+        for band in self._bands:
+            band.clear()
+
+
+MINHASH_BINS = 64
+_EMPTY_BIN = 1 << 32
+
+
+def char_shingles(text: str, size: int = 5) -> Set[str]:
+    """Character n-grams of a text with case, punctuation and spacing normalized."""
+    normalized = " ".join(tokenize(text))
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def minhash(text: str, bins: int = MINHASH_BINS) -> Tuple[int, ...]:
+    """
+    Compute a one-permutation MinHash signature over character 5-grams.
+
+    Each shingle is hashed once and assigned to a bin by its high bits; the
+    bin keeps the minimum of the remaining bits. This is equivalent to
+    ``bins`` independent MinHashes for Jaccard estimation, at the cost of a
+    single hash per shingle, which keeps signing a post well under a
+    millisecond. Empty bins hold a sentinel value.
+
+    Args:
+        text: The text (typically a post)
+        bins: Signature length; must be a power of two
+
+    Returns:
+        The signature
+    """
+    signature = [_EMPTY_BIN] * bins
+    shift = 32 - (bins.bit_length() - 1)
+    mask = (1 << shift) - 1
+    for shingle in char_shingles(text):
+        # CRC32 is fast but linear; a multiplicative mix spreads it over the bins
+        value = (zlib.crc32(shingle.encode("utf-8")) * 2654435761) & 0xFFFFFFFF
+        index = value >> shift
+        value &= mask
+        if value < signature[index]:
+            signature[index] = value
+    return tuple(signature)
+
+
+def estimate_jaccard(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimate Jaccard similarity from two signatures, ignoring bins empty in both."""
+    used = matches = 0
+    for x, y in zip(a, b):
+        if x == _EMPTY_BIN and y == _EMPTY_BIN:
+            continue
+        used += 1
+        if x == y:
+            matches += 1
+    return matches / used if used else 0.0
+
+
+@dataclass
+class SimilarMatch:
+    """An indexed text similar to a lookup."""
+    key: str
+    similarity: float
+
+
+class MinHashLSH:
+    """
+    Locality-sensitive hashing index over MinHash signatures.
+
+    Signatures are split into ``bands`` of ``rows`` bins; texts sharing any
+    band are candidates and are confirmed by their estimated Jaccard
+    similarity, so a lookup touches only a handful of entries.
+    """
+
+    def __init__(self, threshold: float, bins: int = MINHASH_BINS, rows: int = 4):
+        """
+        Initialize an empty index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a match
+            bins: Signature length
+            rows: Bins per band (fewer rows catch less similar candidates)
+        """
+        self.threshold = threshold
+        self.rows = rows
+        self.bands = bins // rows
+        self.signatures: Dict[str, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key: str, signature: Tuple[int, ...]):
+        """Index a signature under a key."""
+        if key in self.signatures:
+            self.remove(key)
+        self.signatures[key] = signature
+        for band, value in self._band_keys(signature):
+            self._buckets[band].setdefault(value, set()).add(key)
+
+    def remove(self, key: str):
+        """Drop a key from the index."""
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, value in self._band_keys(signature):
+            bucket = self._buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def query(self, signature: Tuple[int, ...]) -> List[SimilarMatch]:
+        """
+        Return indexed entries at or above the similarity threshold.
+
+        Returns:
+            Matches, most similar first
+        """
+        candidates = set()
+        for band, value in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(value, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = estimate_jaccard(signature, self.signatures[key])
+            if similarity >= self.threshold:
+                matches.append(SimilarMatch(key=key, similarity=similarity))
+        matches.sort(key=lambda match: match.similarity, reverse=True)
+        return matches
+
+
+# Global index of scraped content
+content_index = SimHashIndex()
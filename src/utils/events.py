@@ -0,0 +1,152 @@
+"""In-process publish/subscribe of post lifecycle events."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, List, Optional
+from src.config import settings
+from src.utils.metrics import metrics
+
+# Lifecycle event types
+GENERATED = "generated"
+EDITED = "edited"
+APPROVED = "approved"
+SCHEDULED = "scheduled"
+PUBLISHED = "published"
+FAILED = "failed"
+UPDATED = "updated"
+DELETED = "deleted"
+CLEARED = "cleared"
+
+
+@dataclass(slots=True)
+class PostEvent:
+    """A change to a stored post."""
+    type: str
+    post_id: Optional[str] = None
+    post: Any = None
+    at: float = field(default_factory=time.time)
+
+
+class Subscription:
+    """
+    A subscriber's bounded queue of events.
+
+    A subscriber that falls behind loses its oldest events instead of
+    slowing down the publisher or the other subscribers.
+    """
+
+    def __init__(self, bus: "EventBus", max_size: int):
+        """Initialize the subscription on the running event loop."""
+        self.bus = bus
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+        self._items = deque(maxlen=max_size)
+        self._ready = asyncio.Event()
+
+    def put(self, item: Any):
+        """Queue an item; must be called on the subscription's loop."""
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+            metrics.incr("events_dropped_total")
+        self._items.append(item)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Wait for the next item.
+
+        Args:
+            timeout: Seconds to wait before returning None
+
+        Returns:
+            The item, or None if none arrived within the timeout
+        """
+        while not self._items:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._items.popleft()
+
+    def close(self):
+        """Stop receiving events."""
+        self.bus.unsubscribe(self)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        while True:
+            yield await self.get()
+
+
+class EventBus:
+    """
+    Fan-out of published items to listeners and subscribers.
+
+    Listeners are called synchronously on publish, e.g. to render an event
+    once for every client. Subscribers each get their own bounded queue and
+    receive the same item object, so fan-out costs one append per subscriber.
+    ``publish`` may be called from any thread.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None):
+        """
+        Initialize the bus.
+
+        Args:
+            queue_size: Maximum queued items per subscriber
+        """
+        self.queue_size = queue_size or settings.event_queue_size
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[Any], None]] = []
+        self._subscriptions: List[Subscription] = []
+
+    def add_listener(self, listener: Callable[[Any], None]):
+        """Call a function with every published item."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Any], None]):
+        """Stop calling a listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def subscribe(self) -> Subscription:
+        """Create a subscription on the running event loop."""
+        subscription = Subscription(self, self.queue_size)
+        with self._lock:
+            self._subscriptions = [*self._subscriptions, subscription]
+        metrics.set_gauge("event_subscribers", len(self._subscriptions))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription."""
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+        metrics.set_gauge("event_subscribers", len(self._subscriptions))
+
+    def publish(self, item: Any):
+        """Deliver an item to every listener and subscriber."""
+        for listener in list(self._listeners):
+            try:
+                listener(item)
+            except Exception as e:
+                print(f"Event listener failed: {e}")
+
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for subscription in self._subscriptions:
+            if subscription.loop is running:
+                subscription.put(item)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription.put, item)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+
+# Global bus of post lifecycle events
+post_events = EventBus()
@@ -0,0 +1,121 @@
+"""Parsing of RSS/Atom feeds and XML sitemaps into entry URLs."""
+
+import io
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+FEED_KINDS = ("rss", "atom", "sitemap", "sitemapindex")
+
+
+class FeedParseError(Exception):
+    """Raised when a document is not a supported feed or sitemap."""
+
+
+@dataclass
+class FeedEntry:
+    """An item of a feed or a URL of a sitemap."""
+    url: str
+    title: str = ""
+    published: Optional[str] = None
+
+
+@dataclass
+class ParsedFeed:
+    """Entries of a feed, and child sitemaps when the document is a sitemap index."""
+    kind: str
+    entries: List[FeedEntry] = field(default_factory=list)
+    sitemaps: List[str] = field(default_factory=list)
+
+
+def _local(tag: str) -> str:
+    """Strip the XML namespace from a tag name."""
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(element: ET.Element, *names: str) -> Optional[str]:
+    for child in element:
+        if _local(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _atom_link(entry: ET.Element) -> Optional[str]:
+    """Return the alternate link of an Atom entry."""
+    fallback = None
+    for child in entry:
+        if _local(child.tag) != "link" or not child.get("href"):
+            continue
+        rel = child.get("rel", "alternate")
+        if rel == "alternate":
+            return child.get("href").strip()
+        fallback = fallback or child.get("href").strip()
+    return fallback
+
+
+def parse_feed(document: bytes) -> ParsedFeed:
+    """
+    Parse an RSS 2.0/RSS 1.0, Atom, sitemap or sitemap index document.
+
+    The document is parsed incrementally and each item is discarded once
+    read, so large sitemaps do not build a full tree in memory.
+
+    Args:
+        document: Raw XML bytes
+
+    Returns:
+        The parsed feed, entries in document order
+
+    Raises:
+        FeedParseError: If the XML is malformed or of an unknown kind
+    """
+    kind = None
+    feed = None
+    try:
+        for event, element in ET.iterparse(io.BytesIO(document), events=("start", "end")):
+            tag = _local(element.tag)
+            if event == "start":
+                if kind is None:
+                    kind = {"rss": "rss", "rdf": "rss", "feed": "atom",
+                            "urlset": "sitemap", "sitemapindex": "sitemapindex"}.get(tag)
+                    if kind is None:
+                        raise FeedParseError(f"Unsupported document root: {tag}")
+                    feed = ParsedFeed(kind=kind)
+                continue
+
+            if kind == "rss" and tag == "item":
+                url = _child_text(element, "link") or element.get(
+                    "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}about"
+                )
+                if url:
+                    feed.entries.append(FeedEntry(
+                        url=url,
+                        title=_child_text(element, "title") or "",
+                        published=_child_text(element, "pubdate", "date")
+                    ))
+                element.clear()
+            elif kind == "atom" and tag == "entry":
+                url = _atom_link(element)
+                if url:
+                    feed.entries.append(FeedEntry(
+                        url=url,
+                        title=_child_text(element, "title") or "",
+                        published=_child_text(element, "published", "updated")
+                    ))
+                element.clear()
+            elif kind == "sitemap" and tag == "url":
+                url = _child_text(element, "loc")
+                if url:
+                    feed.entries.append(FeedEntry(url=url, published=_child_text(element, "lastmod")))
+                element.clear()
+            elif kind == "sitemapindex" and tag == "sitemap":
+                url = _child_text(element, "loc")
+                if url:
+                    feed.sitemaps.append(url)
+                element.clear()
+    except ET.ParseError as e:
+        raise FeedParseError(f"Malformed feed: {str(e)}") from e
+
+    if feed is None:
+        raise FeedParseError("Empty feed document")
+    return feed
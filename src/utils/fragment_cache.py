@@ -0,0 +1,80 @@
+"""Cache of rendered HTML fragments keyed by post id and version."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+from fasthtml.common import NotStr, to_xml
+from src.config import settings
+from src.utils.metrics import metrics
+
+
+class FragmentCache:
+    """
+    LRU cache of rendered fragments (post cards, edit forms) as HTML strings.
+
+    Entries are keyed by (post id, fragment kind) and hold the post version
+    they were rendered from. The post store increments the version on every
+    edit and status change, so a fragment rendered from an older version is
+    never served; it is replaced on the next render.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of fragments kept
+        """
+        self.max_entries = max_entries or settings.fragment_cache_max_entries
+        self._lock = threading.Lock()
+        self._fragments: "OrderedDict[Tuple[str, str], Tuple[int, str]]" = OrderedDict()
+
+    def render(self, post: Any, kind: str, render: Callable[[Any], Any]) -> NotStr:
+        """
+        Return a post's fragment, rendering it on a miss.
+
+        Args:
+            post: The post; must have ``id`` and ``version``
+            kind: The fragment kind, e.g. "card"
+            render: Builds the FastHTML component for the post
+
+        Returns:
+            The rendered HTML, usable as a FastHTML component
+        """
+        if post.id is None:
+            return NotStr(to_xml(render(post)))
+
+        key = (post.id, kind)
+        with self._lock:
+            cached = self._fragments.get(key)
+            if cached is not None and cached[0] == post.version:
+                self._fragments.move_to_end(key)
+                metrics.incr("fragment_cache_hits", kind=kind)
+                return NotStr(cached[1])
+
+        metrics.incr("fragment_cache_misses", kind=kind)
+        html = to_xml(render(post))
+        with self._lock:
+            self._fragments[key] = (post.version, html)
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return NotStr(html)
+
+    def invalidate(self, post_id: str):
+        """Drop every fragment of a post."""
+        with self._lock:
+            for key in [key for key in self._fragments if key[0] == post_id]:
+                del self._fragments[key]
+
+    def clear(self):
+        """Drop all fragments."""
+        with self._lock:
+            self._fragments.clear()
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+
+# Global fragment cache
+fragment_cache = FragmentCache()
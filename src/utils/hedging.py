@@ -0,0 +1,138 @@
+"""Request hedging to cut tail latency of upstream calls."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from src.config import settings
+from src.utils.metrics import metrics, percentile
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Keeps a sliding window of observed latencies."""
+
+    def __init__(self, window: int = 512):
+        """Initialize an empty tracker."""
+        self.samples = deque(maxlen=window)
+
+    def record(self, latency: float):
+        """Record an observed latency in seconds."""
+        self.samples.append(latency)
+
+    def percentile(self, q: float) -> float:
+        """Return a latency percentile over the window."""
+        return percentile(self.samples, q)
+
+
+class HedgingPolicy:
+    """
+    Fires a duplicate call when the first one is slower than a latency percentile.
+
+    The first successful result wins and the other call is cancelled. Hedges
+    are only sent once enough latencies have been observed, and their number
+    is capped at ``budget`` times the number of requests to bound extra cost.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        enabled: bool = False,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        min_delay: float = 0.05
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            name: Name used to label hedging metrics
+            enabled: Whether hedges are sent at all
+            percentile: Observed-latency percentile after which a hedge is sent
+            budget: Maximum ratio of hedges to requests
+            min_samples: Latencies to observe before hedging starts
+            min_delay: Lower bound on the hedge delay in seconds
+        """
+        self.name = name
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.requests = 0
+        self.hedges = 0
+        self._trackers: Dict[str, LatencyTracker] = {}
+
+    def tracker(self, key: str = "default") -> LatencyTracker:
+        """Return the latency tracker for a key (e.g. a model tier)."""
+        if key not in self._trackers:
+            self._trackers[key] = LatencyTracker()
+        return self._trackers[key]
+
+    def hedge_delay(self, key: str = "default") -> Optional[float]:
+        """Return how long to wait before hedging, or None if hedging is off for now."""
+        tracker = self.tracker(key)
+        if not self.enabled or len(tracker.samples) < self.min_samples:
+            return None
+        return max(self.min_delay, tracker.percentile(self.percentile))
+
+    def _within_budget(self) -> bool:
+        return self.hedges + 1 <= self.budget * self.requests
+
+    async def run(self, call: Callable[[], Awaitable[T]], key: str = "default") -> T:
+        """
+        Run a call, hedging it if it is slower than the configured percentile.
+
+        Args:
+            call: Factory returning a new awaitable for each attempt
+            key: Latency tracking key
+
+        Returns:
+            The first successful result
+        """
+        self.requests += 1
+        metrics.incr("hedge_requests_total", target=self.name)
+        delay = self.hedge_delay(key)
+        started = time.monotonic()
+
+        primary = asyncio.ensure_future(call())
+        pending = {primary}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done:
+                    if self._within_budget():
+                        self.hedges += 1
+                        metrics.incr("hedges_sent_total", target=self.name)
+                        pending.add(asyncio.ensure_future(call()))
+                    else:
+                        metrics.incr("hedges_skipped_budget_total", target=self.name)
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    self.tracker(key).record(time.monotonic() - started)
+                    if task is not primary:
+                        metrics.incr("hedge_wins_total", target=self.name)
+                    return task.result()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def create_hedging_policy(name: str) -> HedgingPolicy:
+    """Create a hedging policy configured from settings."""
+    return HedgingPolicy(
+        name=name,
+        enabled=settings.hedging_enabled,
+        percentile=settings.hedging_percentile,
+        budget=settings.hedging_budget,
+        min_samples=settings.hedging_min_samples
+    )
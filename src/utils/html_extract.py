@@ -0,0 +1,341 @@
+"""Local HTML main-content extraction and markdown conversion."""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Union
+from urllib.parse import urljoin
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# Elements that never hold article content
+REMOVED_TAGS = {
+    "script", "style", "noscript", "svg", "iframe", "form", "button", "select",
+    "template", "canvas", "nav", "footer", "aside", "head",
+}
+
+# Page chrome that is kept only inside an article (e.g. the article's own header)
+CHROME_TAGS = {"header"}
+
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "body", "figure", "figcaption",
+    "table", "thead", "tbody", "tr", "td", "th", "dl", "dt", "dd", "address",
+    "details", "summary", "center", "header", "hgroup",
+}
+
+# Paragraph-like elements whose text scores their ancestors
+SCORED_TAGS = {"p", "pre", "td", "blockquote", "li"}
+
+CANDIDATE_TAGS = {"div", "article", "main", "section", "td", "blockquote", "body"}
+
+POSITIVE_HINTS = re.compile(r"article|body|content|entry|main|post|story|text|blog", re.I)
+NEGATIVE_HINTS = re.compile(
+    r"comment|sidebar|footer|nav|menu|share|social|advert|\bads?\b|\bad-|promo|related|"
+    r"cookie|banner|popup|subscribe|newsletter|breadcrumb|masthead|widget|sponsor",
+    re.I,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class Node:
+    """A minimal DOM element."""
+
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Node"] = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List[Union["Node", str]] = []
+        self.parent = parent
+
+    def text(self) -> str:
+        """Return the concatenated text of this element in document order."""
+        parts = []
+        stack = [iter(self.children)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, str):
+                    parts.append(child)
+                else:
+                    stack.append(iter(child.children))
+                    break
+            else:
+                stack.pop()
+        return "".join(parts)
+
+    def hints(self) -> str:
+        """Return the class and id attributes used for content hints."""
+        return f"{self.attrs.get('class', '')} {self.attrs.get('id', '')}"
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a Node tree and collects page metadata."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("document", {})
+        self.current = self.root
+        self.title = ""
+        self.meta: Dict[str, str] = {}
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {name: value or "" for name, value in attrs}
+        if tag == "meta":
+            key = attrs.get("property") or attrs.get("name")
+            if key and "content" in attrs:
+                self.meta[key.lower()] = attrs["content"]
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+
+        # Implicitly close an open paragraph or list item
+        if tag in ("p", "li") and self.current.tag == tag:
+            self.current = self.current.parent
+
+        node = Node(tag, attrs, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.current.tag == tag:
+            self.current = self.current.parent
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+            return
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+            return
+        self.current.children.append(data)
+
+
+def _prune(node: Node, in_article: bool = False):
+    """Remove boilerplate elements in place."""
+    kept = []
+    for child in node.children:
+        if isinstance(child, str):
+            kept.append(child)
+            continue
+        if child.tag in REMOVED_TAGS or (child.tag in CHROME_TAGS and not in_article):
+            continue
+        hints = child.hints()
+        if NEGATIVE_HINTS.search(hints) and not POSITIVE_HINTS.search(hints) and child.tag != "body":
+            continue
+        _prune(child, in_article or child.tag in ("article", "main"))
+        kept.append(child)
+    node.children = kept
+
+
+def _link_density(node: Node, text_length: int) -> float:
+    if not text_length:
+        return 0.0
+    link_length = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        for child in current.children:
+            if isinstance(child, Node):
+                if child.tag == "a":
+                    link_length += len(_WHITESPACE.sub(" ", child.text()).strip())
+                else:
+                    stack.append(child)
+    return min(1.0, link_length / text_length)
+
+
+def _initial_score(node: Node) -> float:
+    score = {"article": 10, "main": 10, "div": 5, "section": 3, "blockquote": 3, "td": 3}.get(node.tag, 0)
+    hints = node.hints()
+    if POSITIVE_HINTS.search(hints):
+        score += 25
+    if NEGATIVE_HINTS.search(hints):
+        score -= 25
+    return score
+
+
+def find_main_content(root: Node) -> Node:
+    """
+    Pick the element most likely to hold the main content.
+
+    Paragraph-like elements contribute a score based on their length and comma
+    count to their parent and, at half weight, their grandparent. Candidate
+    scores are adjusted by tag and class/id hints and scaled down by link density.
+
+    Args:
+        root: The pruned document tree
+
+    Returns:
+        The best candidate, or the body (or root) if nothing scores
+    """
+    scores: Dict[int, float] = {}
+    nodes: Dict[int, Node] = {}
+    body = None
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        for child in node.children:
+            if isinstance(child, Node):
+                stack.append(child)
+        if node.tag == "body":
+            body = node
+        if node.tag not in SCORED_TAGS:
+            continue
+
+        text = _WHITESPACE.sub(" ", node.text()).strip()
+        if len(text) < 25:
+            continue
+        content_score = 1 + text.count(",") + min(len(text) // 100, 3)
+
+        for ancestor, weight in ((node.parent, 1.0), (node.parent.parent if node.parent else None, 0.5)):
+            if ancestor is None or ancestor.tag not in CANDIDATE_TAGS:
+                continue
+            key = id(ancestor)
+            if key not in scores:
+                scores[key] = _initial_score(ancestor)
+                nodes[key] = ancestor
+            scores[key] += content_score * weight
+
+    best, best_score = None, 0.0
+    for key, score in scores.items():
+        node = nodes[key]
+        text_length = len(_WHITESPACE.sub(" ", node.text()).strip())
+        final = score * (1 - _link_density(node, text_length))
+        if final > best_score:
+            best, best_score = node, final
+    return best or body or root
+
+
+class _MarkdownRenderer:
+    """Renders a Node subtree as markdown."""
+
+    def __init__(self, base_url: str = ""):
+        self.base_url = base_url
+
+    def render(self, node: Node) -> str:
+        blocks: List[str] = []
+        self._blocks(node, blocks)
+        return "\n\n".join(block for block in blocks if block.strip())
+
+    def _blocks(self, node: Node, blocks: List[str]):
+        inline: List[str] = []
+
+        def flush():
+            text = "\n".join(line.strip() for line in "".join(inline).split("\n"))
+            text = text.strip()
+            if text:
+                blocks.append(text)
+            inline.clear()
+
+        for child in node.children:
+            if isinstance(child, str):
+                inline.append(_WHITESPACE.sub(" ", child))
+                continue
+            tag = child.tag
+            if tag in HEADING_TAGS:
+                flush()
+                heading = _WHITESPACE.sub(" ", self._inline(child)).strip()
+                if heading:
+                    blocks.append(f"{'#' * HEADING_TAGS[tag]} {heading}")
+            elif tag in ("ul", "ol"):
+                flush()
+                blocks.append(self._list(child))
+            elif tag == "pre":
+                flush()
+                blocks.append("```\n" + child.text().strip("\n") + "\n```")
+            elif tag == "blockquote":
+                flush()
+                quoted = self.render(child)
+                blocks.append("\n".join(f"> {line}" if line else ">" for line in quoted.split("\n")))
+            elif tag == "hr":
+                flush()
+                blocks.append("---")
+            elif tag in BLOCK_TAGS or tag == "li":
+                flush()
+                self._blocks(child, blocks)
+            else:
+                inline.append(self._inline(child))
+        flush()
+
+    def _list(self, node: Node) -> str:
+        lines = []
+        index = 0
+        for child in node.children:
+            if not isinstance(child, Node) or child.tag != "li":
+                continue
+            index += 1
+            marker = f"{index}." if node.tag == "ol" else "-"
+            body = self.render(child).split("\n")
+            lines.append(f"{marker} {body[0]}")
+            lines.extend(f"  {line}" if line else "" for line in body[1:])
+        return "\n".join(lines)
+
+    def _inline(self, node: Node) -> str:
+        tag = node.tag
+        if tag == "br":
+            return "\n"
+        if tag == "img":
+            src = node.attrs.get("src")
+            if not src:
+                return ""
+            return f"![{node.attrs.get('alt', '')}]({urljoin(self.base_url, src)})"
+
+        text = "".join(
+            _WHITESPACE.sub(" ", child) if isinstance(child, str) else self._inline(child)
+            for child in node.children
+        )
+        stripped = text.strip()
+        if not stripped:
+            return text
+        if tag == "a" and node.attrs.get("href", "").strip() and not node.attrs["href"].startswith("#"):
+            return f"[{stripped}]({urljoin(self.base_url, node.attrs['href'].strip())})"
+        if tag in ("strong", "b"):
+            return f"**{stripped}**"
+        if tag in ("em", "i"):
+            return f"*{stripped}*"
+        if tag == "code":
+            return f"`{stripped}`"
+        return text
+
+
+def extract_article(html: str, base_url: str = "") -> Dict[str, str]:
+    """
+    Extract the main content of an HTML page as markdown.
+
+    Args:
+        html: The page HTML
+        base_url: URL used to resolve relative links and images
+
+    Returns:
+        Dictionary with ``markdown``, ``title`` and ``description``
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+
+    title = builder.meta.get("og:title") or _WHITESPACE.sub(" ", builder.title).strip()
+    description = builder.meta.get("description") or builder.meta.get("og:description", "")
+
+    _prune(builder.root)
+    main = find_main_content(builder.root)
+    return {
+        "markdown": _MarkdownRenderer(base_url).render(main),
+        "title": title,
+        "description": description,
+    }
@@ -1,85 +1,286 @@
 """LLM utilities for content generation and analysis."""
 
+import asyncio
+import re
+from collections import deque
+from typing import Dict, List, Optional
 from langchain_anthropic import ChatAnthropic
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
 from src.config import settings
+from src.agents.platforms import get_platform_handler
+from src.utils.hedging import HedgingPolicy, create_hedging_policy
+from src.utils.metrics import metrics
+from src.utils.model_router import ModelRouter, ModelTier, create_default_router
+from src.utils.platform_rules import fit_post
+from src.utils.rate_limiter import AdaptiveLimiter, estimate_tokens, llm_limiter
+from src.utils.tracing import tracer
+
+
+# The article is sent as a stable system prefix marked for Anthropic prompt
+# caching; only the short task instructions differ between platforms/styles,
+# so repeated generations on the same article read the prefix from cache.
+ARTICLE_PREFIX = """You write social media content based on the article below.
+
+<article>
+{content}
+</article>"""
+
+SUMMARY_INSTRUCTIONS = """Summarize the article in {max_length} characters or less.
+
+Provide only the summary, nothing else."""
+
+KEY_POINTS_INSTRUCTIONS = """Extract the 3-5 most important key points from the article.
+
+Return only the key points as a numbered list."""
+
+
+def build_messages(content: str, instructions: str) -> List[BaseMessage]:
+    """
+    Build chat messages with the article as a cacheable prefix block.
+
+    Args:
+        content: The article content
+        instructions: Task-specific instructions
+
+    Returns:
+        System message carrying the cached article followed by the instructions
+    """
+    return [
+        SystemMessage(content=[{
+            "type": "text",
+            "text": ARTICLE_PREFIX.format(content=content),
+            "cache_control": {"type": "ephemeral"},
+        }]),
+        HumanMessage(content=instructions),
+    ]
+
+
+def record_usage(task: str, message: AIMessage) -> Dict[str, int]:
+    """
+    Record token usage, including prompt-cache reads and writes, for a call.
+
+    Args:
+        task: The generation task (twitter, linkedin, summarize, key_points)
+        message: The model response
+
+    Returns:
+        The usage recorded for this call
+    """
+    usage_metadata = message.usage_metadata or {}
+    details = usage_metadata.get("input_token_details") or {}
+    usage = {
+        "input_tokens": usage_metadata.get("input_tokens", 0),
+        "output_tokens": usage_metadata.get("output_tokens", 0),
+        "cache_read_tokens": details.get("cache_read", 0) or 0,
+        "cache_write_tokens": details.get("cache_creation", 0) or 0,
+    }
+
+    metrics.incr("llm_calls_total", task=task)
+    for name, value in usage.items():
+        metrics.incr(f"llm_{name}_total", value, task=task)
+    return usage
+
+
+_MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_INLINE_WHITESPACE = re.compile(r"[ \t]+")
+
+
+def condense_content(content: str, max_chars: int = None) -> str:
+    """
+    Condense scraped markdown into compact prompt input.
+
+    Drops images, replaces links with their text, collapses whitespace and
+    blank lines, and caps the result at a paragraph boundary.
+
+    Args:
+        content: Scraped markdown content
+        max_chars: Maximum length of the result (defaults to settings.max_content_chars)
+
+    Returns:
+        Condensed content
+    """
+    if max_chars is None:
+        max_chars = settings.max_content_chars
+
+    text = _MARKDOWN_IMAGE.sub("", content)
+    text = _MARKDOWN_LINK.sub(r"\1", text)
+
+    paragraphs = []
+    current = []
+    for line in text.splitlines():
+        line = _INLINE_WHITESPACE.sub(" ", line).strip()
+        if line:
+            current.append(line)
+        elif current:
+            paragraphs.append("\n".join(current))
+            current = []
+    if current:
+        paragraphs.append("\n".join(current))
+
+    condensed = "\n\n".join(paragraphs)
+    if len(condensed) <= max_chars:
+        return condensed
+
+    cut = condensed.rfind("\n\n", 0, max_chars)
+    if cut <= 0:
+        cut = max_chars
+    return condensed[:cut].rstrip()
 
 
 class ContentGenerator:
     """Generates social media content using Claude."""
 
-    def __init__(self):
-        """Initialize the content generator with Claude."""
-        self.llm = ChatAnthropic(
-            model="claude-3-5-sonnet-20241022",
-            api_key=settings.anthropic_api_key,
-            timeout=30.0,
-            max_retries=2
-        )
+    def __init__(
+        self,
+        llm: Optional[BaseChatModel] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        router: Optional[ModelRouter] = None,
+        models: Optional[Dict[str, BaseChatModel]] = None,
+        hedging: Optional[HedgingPolicy] = None
+    ):
+        """
+        Initialize the content generator with Claude.
 
-    async def generate_twitter_post(self, content: str, style: str = "professional") -> str:
+        Args:
+            llm: Optional chat model to use for every tier instead of Claude (e.g. in tests)
+            limiter: Optional limiter to use instead of the process-wide LLM limiter
+            router: Optional router mapping tasks to model tiers
+            models: Optional chat models keyed by tier name
+            hedging: Optional hedging policy for slow model calls
+        """
+        self.router = router or create_default_router()
+        self.limiter = limiter or llm_limiter
+        self.hedging = hedging or create_hedging_policy("llm")
+        self.parser = StrOutputParser()
+        self.usage_history = deque(maxlen=100)
+
+        self._shared_llm = llm
+        self._models: Dict[str, BaseChatModel] = dict(models or {})
+        self.llm = self._model_for(self.router.tiers[self.router.default_tier])
+
+    def _model_for(self, tier: ModelTier) -> BaseChatModel:
+        """Return the chat model for a tier, creating it on first use."""
+        if tier.name not in self._models:
+            self._models[tier.name] = self._shared_llm or ChatAnthropic(
+                model=tier.model,
+                api_key=settings.anthropic_api_key,
+                base_url=settings.anthropic_base_url,
+                timeout=tier.timeout,
+                max_tokens=tier.max_tokens,
+                max_retries=2
+            )
+        return self._models[tier.name]
+
+    async def _generate(self, task: str, content: str, instructions: str) -> str:
         """
-        Generate a Twitter post from content.
+        Run a generation task against the cached article prefix.
+
+        The task is routed to a model tier; if the call fails or the model
+        exceeds the route's timeout (time queued in the limiter does not
+        count), the next tier in the fallback chain is tried. Calls
+        slower than the tier's usual latency may be hedged with a duplicate.
 
         Args:
-            content: The source content
-            style: The style of the post (professional, casual, technical)
+            task: The generation task, used for routing and usage metrics
+            content: The article content
+            instructions: Task-specific instructions
 
         Returns:
-            Generated Twitter post
+            The model output text
         """
-        prompt = ChatPromptTemplate.from_template(
-            """Based on the following content, generate a compelling Twitter post that is:
-- Concise (under 280 characters)
-- Engaging and informative
-- Style: {style}
-- Include relevant hashtags if appropriate
-
-Content:
-{content}
+        messages = build_messages(content, instructions)
+        tokens = estimate_tokens(content, instructions)
+        last_error = None
 
-Generate only the tweet text, nothing else."""
-        )
+        for step in self.router.select(task, len(content)):
+            model = self._model_for(step.tier)
 
-        chain = prompt | self.llm | StrOutputParser()
-        result = await chain.ainvoke({
-            "content": content,
-            "style": style
-        })
-        return result.strip()
+            async def invoke():
+                # The route timeout covers the model call only, not the wait
+                # for a limiter slot, so a queue built up by a burst does not
+                # turn into route failures and fallbacks
+                async with self.limiter.acquire(tokens):
+                    return await asyncio.wait_for(model.ainvoke(messages), timeout=step.timeout)
 
-    async def generate_linkedin_post(self, content: str, style: str = "professional") -> str:
+            try:
+                with tracer.span(f"llm.{task}", tier=step.tier.name, model=step.tier.model) as span:
+                    message = await self.hedging.run(invoke, key=step.tier.name)
+                    # Set before the span ends, when it is handed to the exporters
+                    usage = record_usage(task, message)
+                    span.set(**usage)
+            except Exception as e:
+                last_error = e
+                metrics.incr("llm_route_failures_total", task=task, tier=step.tier.name)
+                continue
+
+            metrics.incr("llm_route_calls_total", task=task, tier=step.tier.name)
+            self.usage_history.append({"task": task, "tier": step.tier.name, **usage})
+            return self.parser.invoke(message).strip()
+
+        raise last_error
+
+    async def generate_post(self, platform: str, content: str, style: str = "professional") -> str:
         """
-        Generate a LinkedIn post from content.
+        Generate a post for any registered platform.
+
+        The platform's handler supplies the instructions and the model tier.
+        Over-length output is trimmed to the platform limit locally instead
+        of asking the model to shorten it.
 
         Args:
+            platform: The target platform (twitter, linkedin, reddit)
             content: The source content
             style: The style of the post (professional, casual, technical)
 
         Returns:
-            Generated LinkedIn post
+            Generated post
         """
-        prompt = ChatPromptTemplate.from_template(
-            """Based on the following content, generate a professional LinkedIn post that:
-- Is engaging and thought-provoking
-- Includes relevant insights or takeaways
-- Style: {style}
-- Can be longer than Twitter (up to 3000 characters)
-- Include relevant hashtags
-
-Content:
-{content}
+        handler = get_platform_handler(platform)
+        if handler is None:
+            raise ValueError(f"Unsupported platform: {platform}")
+        name = handler.platform.value
+        post = await self._generate(name, content, handler.instructions.format(style=style))
+        return fit_post(name, post)
 
-Generate only the LinkedIn post text, nothing else."""
-        )
+    async def generate_twitter_post(self, content: str, style: str = "professional") -> str:
+        """Generate a Twitter post from content."""
+        return await self.generate_post("twitter", content, style=style)
+
+    async def generate_linkedin_post(self, content: str, style: str = "professional") -> str:
+        """Generate a LinkedIn post from content."""
+        return await self.generate_post("linkedin", content, style=style)
+
+    async def generate_reddit_post(self, content: str, style: str = "professional") -> str:
+        """Generate a Reddit text post: the title, a blank line, then the body."""
+        return await self.generate_post("reddit", content, style=style)
 
-        chain = prompt | self.llm | StrOutputParser()
-        result = await chain.ainvoke({
-            "content": content,
-            "style": style
-        })
-        return result.strip()
+    async def generate_variants(self, platform: str, content: str, styles: List[str]) -> Dict[str, str]:
+        """
+        Generate one post per style for a platform from the same content.
+
+        Args:
+            platform: The target platform (twitter, linkedin, reddit)
+            content: The (condensed) source content, shared by all variants
+            styles: The styles to generate
+
+        Returns:
+            Mapping of style to generated post
+        """
+        if get_platform_handler(platform) is None:
+            raise ValueError(f"Unsupported platform: {platform}")
+        if not styles:
+            return {}
+
+        # The first variant writes the article prefix to the prompt cache; the
+        # remaining variants then run concurrently and read it from cache.
+        first = await self.generate_post(platform, content, style=styles[0])
+        rest = await asyncio.gather(*[
+            self.generate_post(platform, content, style=style) for style in styles[1:]
+        ])
+        return dict(zip(styles, [first, *rest]))
 
     async def summarize_content(self, content: str, max_length: int = 500) -> str:
         """
@@ -92,21 +293,12 @@ Generate only the LinkedIn post text, nothing else."""
         Returns:
             Summarized content
         """
-        prompt = ChatPromptTemplate.from_template(
-            """Summarize the following content in {max_length} characters or less:
-
-{content}
-
-Provide only the summary, nothing else."""
+        return await self._generate(
+            "summarize",
+            content,
+            SUMMARY_INSTRUCTIONS.format(max_length=max_length)
         )
 
-        chain = prompt | self.llm | StrOutputParser()
-        result = await chain.ainvoke({
-            "content": content,
-            "max_length": max_length
-        })
-        return result.strip()
-
     async def extract_key_points(self, content: str) -> list:
         """
         Extract key points from content.
@@ -117,16 +309,7 @@ Provide only the summary, nothing else."""
         Returns:
             List of key points
         """
-        prompt = ChatPromptTemplate.from_template(
-            """Extract the 3-5 most important key points from the following content:
-
-{content}
-
-Return only the key points as a numbered list."""
-        )
-
-        chain = prompt | self.llm | StrOutputParser()
-        result = await chain.ainvoke({"content": content})
+        result = await self._generate("key_points", content, KEY_POINTS_INSTRUCTIONS)
         
         # Parse the numbered list
         points = [line.strip() for line in result.strip().split('\n') if line.strip()]
@@ -0,0 +1,171 @@
+"""Event-loop lag measurement and detection of callbacks that block the loop."""
+
+import asyncio
+import itertools
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+from src.config import settings
+from src.utils.callback_hook import callback_hook
+from src.utils.metrics import metrics
+from src.utils.profiler import describe_handle
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and records the stacks of blocking callbacks.
+
+    Lag is measured by a timer that reschedules itself every ``interval``
+    seconds; how late it fires is observed as ``event_loop_lag_seconds``
+    (with p50/p95/p99 in the metrics snapshot).
+
+    Blocking calls are caught by a watchdog thread: every callback the
+    loop runs is timestamped through the shared callback hook, and when one
+    runs for longer than
+    ``block_threshold`` the watchdog captures the loop thread's stack while
+    it is still blocked, pointing at the blocking line (a synchronous SDK
+    call, file write, ...). Detection covers every event loop in the process.
+    """
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        block_threshold: Optional[float] = None,
+        max_records: int = 100
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between lag measurements
+            block_threshold: Seconds a callback may run before it is recorded as blocking
+            max_records: Number of blocking callbacks kept
+        """
+        self.interval = interval or settings.loop_monitor_interval_ms / 1000
+        self.block_threshold = block_threshold or settings.loop_block_threshold_ms / 1000
+        self.blocks: deque = deque(maxlen=max_records)
+        self.block_count = 0
+        self._lock = threading.Lock()
+        self._running: Dict[int, tuple] = {}
+        self._captured: Dict[int, Dict[str, Any]] = {}
+        self._seq = itertools.count()
+        self._detecting = False
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._expected = 0.0
+
+    def start(self):
+        """Start lag measurement on the running loop and blocking detection."""
+        self.start_detector()
+        self._loop = asyncio.get_running_loop()
+        self._expected = self._loop.time() + self.interval
+        self._timer = self._loop.call_later(self.interval, self._tick)
+
+    def _tick(self):
+        now = self._loop.time()
+        lag = max(0.0, now - self._expected)
+        metrics.observe("event_loop_lag_seconds", lag)
+        metrics.set_gauge("event_loop_lag_last_seconds", lag)
+        self._expected = now + self.interval
+        self._timer = self._loop.call_later(self.interval, self._tick)
+
+    def start_detector(self):
+        """Start detecting blocking callbacks (in any event loop of the process)."""
+        if self._detecting:
+            return
+        self._detecting = True
+        callback_hook.add(self)
+
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def callback_started(self, handle: asyncio.Handle, started: float):
+        self._running[threading.get_ident()] = (started, next(self._seq), handle)
+
+    def callback_finished(self, handle: asyncio.Handle, started: float, elapsed: float):
+        running = self._running.pop(threading.get_ident(), None)
+        if running is not None and elapsed >= self.block_threshold:
+            self._finish(running[1], handle, elapsed)
+
+    def _watch(self):
+        period = max(self.block_threshold / 4, 0.005)
+        while not self._stop.wait(period):
+            now = time.perf_counter()
+            for thread_id, (started, seq, handle) in list(self._running.items()):
+                if now - started < self.block_threshold or seq in self._captured:
+                    continue
+                frame = sys._current_frames().get(thread_id)
+                record = self._record(handle, traceback.format_stack(frame)[-15:] if frame else None)
+                with self._lock:
+                    self._captured[seq] = record
+
+    def _record(self, handle, stack: Optional[List[str]]) -> Dict[str, Any]:
+        record = {
+            "at": time.time(),
+            "duration_ms": None,
+            "callback": describe_handle(handle),
+            "stack": [line.rstrip() for line in stack] if stack else None,
+        }
+        with self._lock:
+            self.blocks.append(record)
+            self.block_count += 1
+        metrics.incr("event_loop_blocks_total")
+        return record
+
+    def _finish(self, seq: int, handle, elapsed: float):
+        with self._lock:
+            record = self._captured.pop(seq, None)
+        if record is None:
+            # Ended before the watchdog saw it; no stack is available
+            record = self._record(handle, None)
+        record["duration_ms"] = round(elapsed * 1000, 1)
+        metrics.observe("event_loop_block_seconds", elapsed)
+
+    def blocks_since(self, count: int) -> List[Dict[str, Any]]:
+        """Return the blocking callbacks recorded after ``block_count`` was ``count``."""
+        with self._lock:
+            new = self.block_count - count
+            return list(self.blocks)[-new:] if new > 0 else []
+
+    def stop(self):
+        """Stop measuring lag and detecting blocking callbacks."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._detecting = False
+        callback_hook.remove(self)
+        self._running.clear()
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return lag percentiles and the recent blocking callbacks."""
+        lag = metrics.histogram("event_loop_lag_seconds")
+        with self._lock:
+            blocks = list(self.blocks)
+        return {
+            "lag_seconds": lag.summary() if lag is not None else None,
+            "block_threshold_ms": self.block_threshold * 1000,
+            "blocks": blocks,
+        }
+
+
+def format_blocks(blocks: List[Dict[str, Any]]) -> str:
+    """Format blocking callback records as readable text."""
+    parts = []
+    for block in blocks:
+        parts.append(f"{block['callback']} blocked the event loop for {block['duration_ms']} ms")
+        parts.extend(block["stack"] or ["  (ended before its stack could be captured)"])
+    return "\n".join(parts)
+
+
+# Global loop monitor, started with the app
+loop_monitor = LoopMonitor()
@@ -0,0 +1,126 @@
+"""In-process metrics for the social media agent."""
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional, Any, Iterable
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """
+    Compute a percentile using nearest-rank on a copy of the values.
+
+    Args:
+        values: The observed values
+        q: Percentile between 0 and 1
+
+    Returns:
+        The percentile value, or 0.0 when there are no values
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class Histogram:
+    """Tracks count and sum plus a bounded window of recent observations."""
+
+    def __init__(self, window: int = 1024):
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, value: float):
+        """Record an observation."""
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def percentile(self, q: float) -> float:
+        """Return a percentile over the recent window."""
+        return percentile(self.samples, q)
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize the histogram for export."""
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and histograms."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> str:
+        """Build the storage key for a metric and its labels."""
+        if not labels:
+            return name
+        rendered = ",".join(f"{key}={value}" for key, value in sorted(labels.items()))
+        return f"{name}{{{rendered}}}"
+
+    def incr(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to the given value."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a histogram observation."""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels) -> float:
+        """Return the current value of a counter."""
+        return self._counters.get(self._key(name, labels), 0)
+
+    def gauge(self, name: str, **labels) -> float:
+        """Return the current value of a gauge."""
+        return self._gauges.get(self._key(name, labels), 0)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """Return a histogram if it has been observed."""
+        return self._histograms.get(self._key(name, labels))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return all metrics as a JSON-serializable dictionary."""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {key: h.summary() for key, h in self._histograms.items()},
+            }
+
+    def reset(self):
+        """Clear all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -2,6 +2,8 @@
 
 import re
 from typing import List
+from src.agents.platforms import get_platform_handler
+from src.utils.platform_rules import fit_post
 
 
 class MockContentGenerator:
@@ -39,7 +41,7 @@ class MockContentGenerator:
             "technical": f"📋 Tender Announcement: {title}\n\nAllocation: {value}\nSubmission Deadline: {deadline}\n\nReview specifications and requirements. #TenderProcess"
         }
         
-        return posts.get(style, posts["professional"])[:280]
+        return fit_post("twitter", posts.get(style, posts["professional"]))
 
     async def generate_linkedin_post(self, content: str, style: str = "professional") -> str:
         """
@@ -106,6 +108,65 @@ Interested vendors should review the complete technical requirements and submiss
         
         return posts.get(style, posts["professional"])
 
+    async def generate_reddit_post(self, content: str, style: str = "professional") -> str:
+        """
+        Generate a mock Reddit post (title, blank line, body) from content.
+
+        Args:
+            content: The source content
+            style: The style of the post (professional, casual, technical)
+
+        Returns:
+            Generated Reddit post
+        """
+        lines = [l.strip() for l in content.split('\n') if l.strip() and len(l.strip()) > 10]
+        title = lines[0] if lines else "New tender opportunity"
+        
+        value_match = re.search(r'€([\d,]+(?:\.\d+)?)', content)
+        value = f"€{value_match.group(1)}" if value_match else "not disclosed"
+        
+        intros = {
+            "professional": "A new public tender has been published that may interest suppliers here.",
+            "casual": "Came across this new tender and thought some of you might want to take a look.",
+            "technical": "Summary of a newly published tender and its main requirements."
+        }
+        body = f"""{intros.get(style, intros["professional"])}
+
+**Budget:** {value}
+
+{" ".join(lines[1:4])}
+
+What do you think about the scope and timeline?"""
+        
+        return fit_post("reddit", f"{title}\n\n{body}")
+
+    async def generate_post(self, platform: str, content: str, style: str = "professional") -> str:
+        """
+        Generate a mock post for any registered platform.
+
+        Platforms without a dedicated mock (``generate_<platform>_post``)
+        get a generic post built from the first lines of the content.
+
+        Args:
+            platform: The target platform (twitter, linkedin, reddit)
+            content: The source content
+            style: The style of the post
+
+        Returns:
+            Generated post
+        """
+        handler = get_platform_handler(platform)
+        if handler is None:
+            raise ValueError(f"Unsupported platform: {platform}")
+        name = handler.platform.value
+        generate = getattr(self, f"generate_{name}_post", None)
+        if generate is not None:
+            return await generate(content, style=style)
+
+        lines = [l.strip() for l in content.split('\n') if l.strip() and len(l.strip()) > 10]
+        title = lines[0] if lines else "New tender opportunity"
+        return fit_post(name, f"{title}\n\n{' '.join(lines[1:4])}".strip())
+
     async def summarize_content(self, content: str, max_length: int = 500) -> str:
         """
         Summarize content for social media.
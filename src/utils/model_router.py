@@ -0,0 +1,121 @@
+"""Routing of LLM tasks to model tiers."""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+from src.config import settings
+from src.agents.platforms import PLATFORM_HANDLERS
+
+
+@dataclass
+class ModelTier:
+    """A model and the limits it is used with."""
+    name: str
+    model: str
+    timeout: float
+    max_tokens: int = 1024
+    max_input_chars: Optional[int] = None
+
+
+@dataclass
+class Route:
+    """Maps a generation task to a preferred tier and its fallbacks."""
+    task: str
+    tier: str
+    fallbacks: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+
+
+@dataclass
+class RouteStep:
+    """One attempt in a resolved fallback chain."""
+    tier: ModelTier
+    timeout: float
+
+
+class ModelRouter:
+    """Resolves a task and input size to an ordered chain of model tiers."""
+
+    def __init__(self, tiers: List[ModelTier], routes: List[Route], default_tier: str):
+        """
+        Initialize the router.
+
+        Args:
+            tiers: Available model tiers
+            routes: Per-task routes
+            default_tier: Tier used for tasks without a route
+        """
+        self.tiers = {tier.name: tier for tier in tiers}
+        self.routes = {route.task: route for route in routes}
+        self.default_tier = default_tier
+
+        for route in routes:
+            for name in [route.tier, *route.fallbacks]:
+                if name not in self.tiers:
+                    raise ValueError(f"Route for {route.task} references unknown tier: {name}")
+        if default_tier not in self.tiers:
+            raise ValueError(f"Unknown default tier: {default_tier}")
+
+    def select(self, task: str, input_chars: int) -> List[RouteStep]:
+        """
+        Resolve the tiers to try for a task, in order.
+
+        Tiers whose ``max_input_chars`` is smaller than the input are skipped,
+        so a long article sent to a short-form task moves to a larger tier.
+
+        Args:
+            task: The generation task (twitter, linkedin, summarize, key_points)
+            input_chars: Size of the input content
+
+        Returns:
+            Ordered list of attempts; never empty
+        """
+        route = self.routes.get(task) or Route(task=task, tier=self.default_tier)
+
+        steps = []
+        for name in dict.fromkeys([route.tier, *route.fallbacks]):
+            tier = self.tiers[name]
+            if tier.max_input_chars is not None and input_chars > tier.max_input_chars:
+                continue
+            steps.append(RouteStep(tier=tier, timeout=route.timeout or tier.timeout))
+
+        if not steps:
+            tier = self.tiers[self.default_tier]
+            steps.append(RouteStep(tier=tier, timeout=route.timeout or tier.timeout))
+        return steps
+
+
+def create_default_router() -> ModelRouter:
+    """
+    Build the router from settings.
+
+    Each registered platform's task goes to its handler's ``model_tier``;
+    ``llm_routes`` adds routes for the other tasks and overrides platform
+    routes. Tasks routed to the fast tier move to the default tier when
+    their input exceeds ``llm_fast_max_input_chars``; every route falls
+    back to the other tier.
+
+    Returns:
+        Configured model router
+    """
+    tiers = [
+        ModelTier(
+            name="fast",
+            model=settings.llm_fast_model,
+            timeout=settings.llm_fast_timeout,
+            max_tokens=512,
+            max_input_chars=settings.llm_fast_max_input_chars
+        ),
+        ModelTier(
+            name="default",
+            model=settings.llm_default_model,
+            timeout=settings.llm_default_timeout,
+            max_tokens=2048
+        ),
+    ]
+    task_tiers = {handler.platform.value: handler.model_tier for handler in PLATFORM_HANDLERS.values()}
+    task_tiers.update(settings.llm_routes)
+    routes = [
+        Route(task=task, tier=tier, fallbacks=["default" if tier == "fast" else "fast"])
+        for task, tier in task_tiers.items()
+    ]
+    return ModelRouter(tiers=tiers, routes=routes, default_tier="default")
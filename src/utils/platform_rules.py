@@ -0,0 +1,309 @@
+"""Platform length rules, post validation and deterministic auto-fitting."""
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from src.utils.metrics import metrics
+
+URL_PATTERN = re.compile(r"https?://[^\s<>\"']+[^\s<>\"'.,;:!?)\]}]", re.I)
+HASHTAG_PATTERN = re.compile(r"(?<![\w&#＃])[#＃](\w+)")
+MENTION_PATTERN = re.compile(r"(?<![\w@＠])[@＠](\w+)")
+
+# Emoji presentation sequences (incl. ZWJ sequences, skin tones, keycaps and flags)
+# count as a single unit, like twitter-text does.
+_EMOJI_BASE = "\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF\u3030\u303D\u3297\u3299"
+EMOJI_PATTERN = re.compile(
+    "(?:[\U0001F1E6-\U0001F1FF]{2}"
+    "|[0-9#*]\uFE0F?\u20E3"
+    f"|[{_EMOJI_BASE}][\uFE0F\U0001F3FB-\U0001F3FF]*"
+    f"(?:\u200D[{_EMOJI_BASE}][\uFE0F\U0001F3FB-\U0001F3FF]*)*"
+    "[\U000E0020-\U000E007F]*)"
+)
+
+# Characters outside the ranges Twitter counts with weight 1 (CJK, most
+# non-Latin scripts, emoji) count 2.
+_HEAVY_CHAR = re.compile("[^\u0000-\u10FF\u2000-\u200D\u2010-\u201F\u2032-\u2037]")
+
+# CJK sentence punctuation ends a sentence even without following whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|(?<=[。！？])\s*|\n+")
+
+# A user-perceived character: an emoji sequence, CRLF, or a character with its combining marks
+_GRAPHEME = re.compile(
+    f"{EMOJI_PATTERN.pattern}|\r\n|.[\u0300-\u036F\u1AB0-\u1AFF\u20D0-\u20FF\uFE00-\uFE0F\uFE20-\uFE2F\u3099\u309A]*",
+    re.S
+)
+
+
+@dataclass(frozen=True)
+class PlatformRules:
+    """Length and formatting rules of a platform."""
+    name: str
+    max_length: int
+    weighted: bool = False
+    url_length: Optional[int] = None
+    max_hashtags: Optional[int] = None
+    max_mention_length: Optional[int] = None
+    max_title_length: Optional[int] = None
+
+
+@dataclass
+class ValidationResult:
+    """Outcome of validating a post against its platform rules."""
+    length: int
+    max_length: int
+    issues: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the post can be published as-is."""
+        return not self.issues
+
+
+PLATFORM_RULES: Dict[str, PlatformRules] = {
+    "twitter": PlatformRules(
+        name="twitter", max_length=280, weighted=True, url_length=23,
+        max_hashtags=5, max_mention_length=15
+    ),
+    "linkedin": PlatformRules(name="linkedin", max_length=3000, max_hashtags=30),
+    "reddit": PlatformRules(name="reddit", max_length=40000, max_title_length=300),
+}
+
+_TITLE_PREFIX = re.compile(r"^(?:#+\s*)?(?:title:\s*)?", re.I)
+
+
+def get_rules(platform: str) -> PlatformRules:
+    """Return the rules of a platform."""
+    platform = getattr(platform, "value", platform)
+    if platform not in PLATFORM_RULES:
+        raise ValueError(f"Unsupported platform: {platform}")
+    return PLATFORM_RULES[platform]
+
+
+def split_title(text: str) -> Tuple[str, str]:
+    """
+    Split a titled post (e.g. Reddit) into its title and body.
+
+    The first non-empty line is the title; a markdown heading marker or a
+    ``Title:`` prefix and surrounding bold/quote marks are removed.
+
+    Returns:
+        The title and the body
+    """
+    lines = text.strip().split("\n", 1)
+    title = _TITLE_PREFIX.sub("", lines[0].strip()).strip("*\"' ").strip()
+    body = lines[1].strip() if len(lines) > 1 else ""
+    return title, body
+
+
+def join_title(title: str, body: str) -> str:
+    """Join a title and body into the stored form of a titled post."""
+    return f"{title}\n\n{body}" if body else title
+
+
+def _text_length(text: str, weighted: bool) -> int:
+    if not weighted:
+        return len(text)
+    length = len(text) + len(_HEAVY_CHAR.findall(text))
+    for match in EMOJI_PATTERN.finditer(text):
+        emoji = match.group(0)
+        length += 2 - len(emoji) - len(_HEAVY_CHAR.findall(emoji))
+    return length
+
+
+def post_length(platform: str, text: str) -> int:
+    """
+    Compute the length of a post as the platform counts it.
+
+    On Twitter the text is NFC-normalized, every URL counts as 23 (t.co),
+    CJK and other wide characters count 2 and an emoji sequence counts 2.
+
+    Args:
+        platform: The platform name
+        text: The post text
+
+    Returns:
+        The platform length
+    """
+    rules = get_rules(platform)
+    if rules.weighted:
+        text = unicodedata.normalize("NFC", text)
+    if rules.url_length is None:
+        return _text_length(text, rules.weighted)
+
+    length = 0
+    position = 0
+    for match in URL_PATTERN.finditer(text):
+        length += _text_length(text[position:match.start()], rules.weighted) + rules.url_length
+        position = match.end()
+    return length + _text_length(text[position:], rules.weighted)
+
+
+def validate_post(platform: str, text: str) -> ValidationResult:
+    """
+    Validate a post's length, hashtags and mentions.
+
+    For platforms with titles, the title is checked separately and the
+    length is that of the body.
+
+    Args:
+        platform: The platform name
+        text: The post text
+
+    Returns:
+        The platform length and a list of human-readable issues
+    """
+    rules = get_rules(platform)
+    if rules.max_title_length is not None:
+        title, text = split_title(text)
+    result = ValidationResult(length=post_length(platform, text), max_length=rules.max_length)
+    if rules.max_title_length is not None:
+        if not title:
+            result.issues.append("Missing title")
+        elif len(title) > rules.max_title_length:
+            result.issues.append(f"Title too long: {len(title)}/{rules.max_title_length} characters")
+    if result.length > rules.max_length:
+        result.issues.append(f"Too long: {result.length}/{rules.max_length} characters")
+
+    without_urls = URL_PATTERN.sub(" ", text)
+    hashtags = HASHTAG_PATTERN.findall(without_urls)
+    for tag in hashtags:
+        if tag.isdigit():
+            result.issues.append(f"Invalid hashtag #{tag}: hashtags need a letter")
+    if rules.max_hashtags is not None and len(hashtags) > rules.max_hashtags:
+        result.issues.append(f"Too many hashtags: {len(hashtags)} (max {rules.max_hashtags})")
+
+    if rules.max_mention_length is not None:
+        for mention in MENTION_PATTERN.findall(without_urls):
+            if len(mention) > rules.max_mention_length or not mention.isascii():
+                result.issues.append(f"Invalid mention @{mention}")
+    return result
+
+
+def _split_trailer(text: str) -> Tuple[str, str]:
+    """Split off a trailing run of hashtags and URLs, which is kept when trimming."""
+    tokens = re.split(r"(\s+)", text.rstrip())
+    index = len(tokens)
+    while index > 0:
+        token = tokens[index - 1]
+        if token.isspace() or HASHTAG_PATTERN.fullmatch(token) or URL_PATTERN.fullmatch(token):
+            index -= 1
+        else:
+            break
+    body = "".join(tokens[:index]).rstrip()
+    trailer = "".join(tokens[index:]).strip()
+    return body, trailer
+
+
+def _is_protected(token: str) -> bool:
+    """Whether a token must never be cut (a URL, hashtag or mention)."""
+    return bool(URL_PATTERN.fullmatch(token) or HASHTAG_PATTERN.fullmatch(token) or MENTION_PATTERN.fullmatch(token))
+
+
+def _trim_graphemes(platform: str, token: str, budget: int) -> str:
+    """Keep the longest leading run of whole characters of ``token`` (plus an ellipsis) within ``budget``."""
+    graphemes = _GRAPHEME.findall(token)
+    low, high = 0, len(graphemes)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if post_length(platform, "".join(graphemes[:middle]) + "…") <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return "".join(graphemes[:low])
+
+
+def _trim_words(platform: str, text: str, budget: int, split_word: bool = True) -> str:
+    """
+    Keep whole leading words of ``text`` (plus an ellipsis) within ``budget``.
+
+    If not even the first word fits, it is cut between characters when
+    ``split_word`` is set and it is not a URL, hashtag or mention; otherwise
+    nothing is kept and "" is returned.
+    """
+    kept = ""
+    for token in re.split(r"(\s+)", text):
+        candidate = kept + token
+        if not token.isspace() and post_length(platform, candidate.rstrip() + "…") > budget:
+            if split_word and not kept.strip() and not _is_protected(token):
+                kept = _trim_graphemes(platform, token, budget)
+            break
+        kept = candidate
+    kept = kept.rstrip()
+    return f"{kept}…" if kept else ""
+
+
+def _fit_text(platform: str, text: str, max_length: int) -> str:
+    """Drop trailing sentences (keeping a hashtag/URL trailer) until text fits."""
+    if post_length(platform, text) <= max_length:
+        return text
+
+    body, trailer = _split_trailer(text)
+    trailer_tokens = trailer.split()
+    while True:
+        trailer = " ".join(trailer_tokens)
+        separator = "\n\n" if trailer else ""
+        budget = max_length - (post_length(platform, separator + trailer) if trailer else 0)
+
+        # Keep as many leading sentences as fit, cutting between sentences
+        pieces = _SENTENCE_END.split(body)
+        separators = [match.group(0) for match in _SENTENCE_END.finditer(body)]
+        kept = ""
+        for index, piece in enumerate(pieces):
+            candidate = kept + (separators[index - 1] if index else "") + piece
+            if post_length(platform, candidate.rstrip()) > budget:
+                break
+            kept = candidate
+        # A word is only split once no trailing hashtags are left to drop
+        kept = kept.rstrip() or _trim_words(
+            platform, pieces[0] if pieces else "", budget, split_word=not trailer_tokens
+        )
+
+        if kept or not trailer_tokens:
+            fitted = f"{kept}{separator}{trailer}" if kept else trailer
+            if fitted and post_length(platform, fitted) <= max_length:
+                return fitted
+        if not trailer_tokens:
+            # Only URLs/hashtags too long to fit on their own are left; they
+            # are not cut, so the post is left to fail validation instead
+            return _trim_words(platform, text, max_length) or text
+        trailer_tokens.pop()
+
+
+def fit_post(platform: str, text: str) -> str:
+    """
+    Shorten a post to the platform's limit without another LLM call.
+
+    Whole sentences are dropped from the end of the body while a trailing
+    block of hashtags/URLs is kept. If not even the first sentence fits, it
+    is cut at a word boundary with an ellipsis, or between characters when
+    its first word alone is too long (e.g. CJK text without spaces). URLs,
+    hashtags and mentions are never split; trailing hashtags are dropped
+    last, from the end. On platforms with titles, an over-long title is cut
+    the same way. The result is never empty and is deterministic for a
+    given input.
+
+    Args:
+        platform: The platform name
+        text: The generated post
+
+    Returns:
+        The post, unchanged if it already fits
+    """
+    rules = get_rules(platform)
+    text = text.strip()
+    if rules.max_title_length is None:
+        fitted = _fit_text(platform, text, rules.max_length)
+    else:
+        title, body = split_title(text)
+        fitted_title = title
+        if len(title) > rules.max_title_length:
+            fitted_title = _trim_words(platform, title, rules.max_title_length) or title
+        fitted_body = _fit_text(platform, body, rules.max_length)
+        if fitted_title == title and fitted_body == body:
+            return text
+        fitted = join_title(fitted_title, fitted_body)
+
+    if fitted != text:
+        metrics.incr("posts_auto_fitted_total", platform=rules.name)
+    return fitted
@@ -0,0 +1,473 @@
+"""SQLite-backed store of generated posts awaiting review or already published."""
+
+import json
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from src.config import settings
+from src.agents.types import GeneratedPost, PostStatus, SocialPlatform
+from src.utils.events import (
+    APPROVED, CLEARED, DELETED, EDITED, FAILED, GENERATED, PUBLISHED, SCHEDULED, UPDATED,
+    EventBus, PostEvent, post_events
+)
+from src.utils.serialization import serializer
+
+# Post fields stored in their own columns; other keyword fields given to
+# ``update`` are kept in the JSON metadata column
+POST_FIELDS = (
+    "platform", "content", "status", "scheduled_time", "style", "source_url", "published_at",
+    "content_hash"
+)
+
+# Column order of SELECTs, matching the positional fields of GeneratedPost
+_COLUMNS = (
+    "platform, content, status, scheduled_time, media_urls, metadata, id, style, source_url, "
+    "version, created_at, updated_at, published_at, content_hash"
+)
+
+# Enum members by value, to share the members instead of allocating strings per row
+_PLATFORMS = {platform.value: platform for platform in SocialPlatform}
+_STATUSES = {status.value: status for status in PostStatus}
+
+# Status labels written by earlier versions of the web app
+_LEGACY_STATUSES = {status.label: status.value for status in PostStatus}
+
+
+# Lifecycle event published when a post is stored with, or changed to, a status
+_STATUS_EVENTS = {
+    PostStatus.DRAFT.value: GENERATED,
+    PostStatus.PENDING_APPROVAL.value: GENERATED,
+    PostStatus.EDITED.value: EDITED,
+    PostStatus.APPROVED.value: APPROVED,
+    PostStatus.SCHEDULED.value: SCHEDULED,
+    PostStatus.PUBLISHED.value: PUBLISHED,
+    PostStatus.FAILED.value: FAILED,
+}
+
+# Per (platform, status) post counts kept up to date by triggers, so counts
+# read a handful of rows instead of scanning the posts table
+_COUNT_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS posts_count_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO post_counts VALUES (NEW.platform, NEW.status, 1)
+            ON CONFLICT (platform, status) DO UPDATE SET n = n + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS posts_count_delete AFTER DELETE ON posts BEGIN
+        UPDATE post_counts SET n = n - 1 WHERE platform = OLD.platform AND status = OLD.status;
+    END;
+    CREATE TRIGGER IF NOT EXISTS posts_count_update AFTER UPDATE OF platform, status ON posts
+    WHEN OLD.platform != NEW.platform OR OLD.status != NEW.status BEGIN
+        UPDATE post_counts SET n = n - 1 WHERE platform = OLD.platform AND status = OLD.status;
+        INSERT INTO post_counts VALUES (NEW.platform, NEW.status, 1)
+            ON CONFLICT (platform, status) DO UPDATE SET n = n + 1;
+    END;
+"""
+
+StatusFilter = Union[PostStatus, str, Iterable[Union[PostStatus, str]], None]
+
+
+def _value(member) -> str:
+    return getattr(member, "value", member)
+
+
+def _filters(
+    status: StatusFilter = None,
+    platform: Optional[Union[SocialPlatform, str]] = None,
+    source_url: Optional[str] = None
+) -> Tuple[str, tuple]:
+    """Build the WHERE clause (possibly empty) and parameters for post filters."""
+    clauses, params = [], []
+    if status is not None:
+        statuses = [status] if isinstance(status, (PostStatus, str)) else list(status)
+        clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+        params.extend(_value(member) for member in statuses)
+    if platform is not None:
+        clauses.append("platform = ?")
+        params.append(_value(platform))
+    if source_url is not None:
+        clauses.append("source_url = ?")
+        params.append(source_url)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", tuple(params)
+
+
+def _decode(value):
+    """Decode a msgpack (or legacy JSON) column value."""
+    return serializer.loads(value) if isinstance(value, bytes) else json.loads(value)
+
+
+class PostStore:
+    """
+    Persistent store of posts keyed by post id.
+
+    Posts are ``GeneratedPost`` records, the same type the graph produces.
+    The store assigns ``id``, ``created_at`` and ``updated_at`` and
+    increments ``version`` on every change. ``metadata`` and ``media_urls``
+    are stored msgpack-encoded (JSON in stores written by earlier versions)
+    and only decoded when they are not empty.
+
+    With an event bus, every change publishes a ``PostEvent`` whose type
+    follows the post's new status (``approved``, ``published``, ...), or
+    ``edited``/``updated``/``deleted``/``cleared`` for other changes.
+    """
+
+    def __init__(self, path: Optional[str] = None, events: Optional[EventBus] = None):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database path, or ":memory:"
+            events: Optional bus to publish post lifecycle events to
+        """
+        self.path = path or settings.post_store_path
+        self.events = events
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS posts (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                id TEXT UNIQUE NOT NULL,
+                platform TEXT NOT NULL,
+                style TEXT,
+                content TEXT NOT NULL,
+                status TEXT NOT NULL,
+                source_url TEXT,
+                metadata TEXT NOT NULL DEFAULT '{}',
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                published_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS posts_published ON posts (published_at)
+                WHERE published_at IS NOT NULL;
+            CREATE INDEX IF NOT EXISTS posts_status ON posts (status, seq);
+            CREATE INDEX IF NOT EXISTS posts_platform_status ON posts (platform, status, seq);
+            CREATE INDEX IF NOT EXISTS posts_source_url ON posts (source_url, seq);
+        """)
+        self._migrate()
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS posts_content_hash ON posts (content_hash) WHERE content_hash IS NOT NULL"
+        )
+        self._db.executescript(_COUNT_TRIGGERS)
+        self._db.commit()
+
+    def _migrate(self):
+        """Add columns and convert status labels of stores created by earlier versions."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(posts)")}
+        for name, definition in (
+            ("version", "INTEGER NOT NULL DEFAULT 1"),
+            ("scheduled_time", "TEXT"),
+            ("media_urls", "TEXT"),
+            ("content_hash", "TEXT"),
+        ):
+            if name not in columns:
+                self._db.execute(f"ALTER TABLE posts ADD COLUMN {name} {definition}")
+        self._db.executemany(
+            "UPDATE posts SET status = ? WHERE status = ?",
+            [(value, label) for label, value in _LEGACY_STATUSES.items() if label != value]
+        )
+        tables = {row[0] for row in self._db.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "post_counts" not in tables:
+            self._db.execute(
+                "CREATE TABLE post_counts (platform TEXT NOT NULL, status TEXT NOT NULL, n INTEGER NOT NULL, "
+                "PRIMARY KEY (platform, status)) WITHOUT ROWID"
+            )
+            self._db.execute(
+                "INSERT INTO post_counts SELECT platform, status, COUNT(*) FROM posts GROUP BY platform, status"
+            )
+
+    @staticmethod
+    def _to_post(row: tuple) -> GeneratedPost:
+        (platform, content, status, scheduled_time, media_urls, metadata, post_id, style,
+         source_url, version, created_at, updated_at, published_at, content_hash) = row
+        return GeneratedPost(
+            _PLATFORMS[platform],
+            content,
+            _STATUSES[status],
+            scheduled_time,
+            tuple(_decode(media_urls)) if media_urls else (),
+            _decode(metadata) if metadata != "{}" else {},
+            post_id,
+            sys.intern(style) if style else style,
+            source_url,
+            version,
+            created_at,
+            updated_at,
+            published_at,
+            content_hash
+        )
+
+    @staticmethod
+    def _to_row(post: GeneratedPost) -> Tuple[Any, ...]:
+        return (
+            post.id, getattr(post.platform, "value", post.platform), post.style, post.content,
+            getattr(post.status, "value", post.status), post.source_url,
+            serializer.dumps(post.metadata) if post.metadata else "{}",
+            serializer.dumps(post.media_urls) if post.media_urls else None,
+            post.scheduled_time, post.version, post.created_at, post.updated_at, post.published_at,
+            post.content_hash
+        )
+
+    def _emit(self, event_type: str, post_id: str, post: Optional[GeneratedPost] = None):
+        if self.events is not None:
+            self.events.publish(PostEvent(event_type, post_id, post))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __contains__(self, post_id: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM posts WHERE id = ?", (post_id,)).fetchone() is not None
+
+    def add(self, post: GeneratedPost) -> str:
+        """
+        Store a new post.
+
+        The post's ``id`` (a UUID unless already set), ``created_at`` and
+        ``updated_at`` are set in place.
+
+        Args:
+            post: The post
+
+        Returns:
+            The post id
+        """
+        post.id = post.id or str(uuid.uuid4())
+        post.created_at = post.updated_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO posts (id, platform, style, content, status, source_url, metadata, "
+                "media_urls, scheduled_time, version, created_at, updated_at, published_at, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._to_row(post)
+            )
+            self._db.commit()
+        self._emit(_STATUS_EVENTS.get(getattr(post.status, "value", post.status), GENERATED), post.id, post)
+        return post.id
+
+    def save(self, post: GeneratedPost) -> str:
+        """
+        Write a whole post, adding it if it is not stored yet.
+
+        Args:
+            post: The post; ``version`` and ``updated_at`` are updated in place
+
+        Returns:
+            The post id
+        """
+        if post.id is None:
+            return self.add(post)
+        with self._lock:
+            row = self._db.execute("SELECT version, status FROM posts WHERE id = ?", (post.id,)).fetchone()
+            if row is not None:
+                post.version = row[0] + 1
+                post.updated_at = time.time()
+                self._db.execute(
+                    "UPDATE posts SET platform = ?, style = ?, content = ?, status = ?, source_url = ?, "
+                    "metadata = ?, media_urls = ?, scheduled_time = ?, version = ?, updated_at = ?, "
+                    "published_at = ?, content_hash = ? WHERE id = ?",
+                    (*self._to_row(post)[1:10], post.updated_at, post.published_at, post.content_hash, post.id)
+                )
+                self._db.commit()
+        if row is not None:
+            status = getattr(post.status, "value", post.status)
+            self._emit(_STATUS_EVENTS.get(status, UPDATED) if status != row[1] else UPDATED, post.id, post)
+            return post.id
+        return self.add(post)
+
+    def get(self, post_id: str) -> Optional[GeneratedPost]:
+        """Return a post by id, or None."""
+        with self._lock:
+            row = self._db.execute(f"SELECT {_COLUMNS} FROM posts WHERE id = ?", (post_id,)).fetchone()
+        return self._to_post(row) if row else None
+
+    def update(self, post_id: str, **fields) -> Optional[GeneratedPost]:
+        """
+        Update fields of a post and increment its version.
+
+        Args:
+            post_id: The post id
+            **fields: Fields to set; fields other than ``POST_FIELDS`` are merged into the metadata
+
+        Returns:
+            The updated post, or None if it does not exist
+        """
+        with self._lock:
+            event_type = self._update_row(post_id, fields)
+            if event_type is not None:
+                self._db.commit()
+        if event_type is None:
+            return None
+        post = self.get(post_id)
+        self._emit(event_type, post_id, post)
+        return post
+
+    def update_many(self, updates: List[Tuple[str, Dict[str, Any]]]) -> List[GeneratedPost]:
+        """
+        Update several posts in a single transaction (e.g. approving the whole review queue).
+
+        Args:
+            updates: Pairs of post id and the fields to set, as for ``update``
+
+        Returns:
+            The updated posts, in the order given; missing posts are skipped
+        """
+        with self._lock:
+            applied = []
+            for post_id, fields in updates:
+                event_type = self._update_row(post_id, fields)
+                if event_type is not None:
+                    applied.append((post_id, event_type))
+            self._db.commit()
+        posts = []
+        for post_id, event_type in applied:
+            post = self.get(post_id)
+            self._emit(event_type, post_id, post)
+            posts.append(post)
+        return posts
+
+    def _update_row(self, post_id: str, fields: Dict[str, Any]) -> Optional[str]:
+        """Apply an update without committing (the lock must be held); returns its event type, or None."""
+        columns = {
+            name: getattr(value, "value", value) for name, value in fields.items() if name in POST_FIELDS
+        }
+        extra = {name: value for name, value in fields.items() if name not in POST_FIELDS}
+        row = self._db.execute("SELECT metadata FROM posts WHERE id = ?", (post_id,)).fetchone()
+        if row is None:
+            return None
+        assignments = "".join(f"{name} = ?, " for name in columns)
+        params: tuple = tuple(columns.values())
+        if extra:
+            assignments += "metadata = ?, "
+            metadata = _decode(row[0]) if row[0] != "{}" else {}
+            params += (serializer.dumps({**metadata, **extra}),)
+        self._db.execute(
+            f"UPDATE posts SET {assignments}version = version + 1, updated_at = ? WHERE id = ?",
+            (*params, time.time(), post_id)
+        )
+        if "status" in columns:
+            return _STATUS_EVENTS.get(columns["status"], UPDATED)
+        return EDITED if "content" in columns else UPDATED
+
+    def delete(self, post_id: str) -> bool:
+        """Delete a post; returns True if it existed."""
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM posts WHERE id = ?", (post_id,))
+            self._db.commit()
+        if cursor.rowcount:
+            self._emit(DELETED, post_id)
+        return cursor.rowcount > 0
+
+    def list(self, status: Optional[PostStatus] = None) -> List[GeneratedPost]:
+        """Return posts in creation order, optionally only those with a status."""
+        query = f"SELECT {_COLUMNS} FROM posts"
+        params: tuple = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (getattr(status, "value", status),)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY seq", params).fetchall()
+        return [self._to_post(row) for row in rows]
+
+    def page(
+        self,
+        status: StatusFilter = None,
+        platform: Optional[Union[SocialPlatform, str]] = None,
+        source_url: Optional[str] = None,
+        after: Optional[int] = None,
+        limit: int = 25
+    ) -> Tuple[List[GeneratedPost], Optional[int]]:
+        """
+        Return one page of posts in creation order, using keyset pagination.
+
+        Pages are read from the status, platform or source URL index starting
+        after a cursor, so every page costs the same however deep it is.
+
+        Args:
+            status: A status or several statuses to include
+            platform: Optional platform filter
+            source_url: Optional source URL filter
+            after: Cursor returned with the previous page
+            limit: Maximum number of posts
+
+        Returns:
+            The posts and the cursor of the next page (None on the last page)
+        """
+        where, params = _filters(status, platform, source_url)
+        if after is not None:
+            where += (" AND " if where else " WHERE ") + "seq > ?"
+            params += (after,)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT seq, {_COLUMNS} FROM posts{where} ORDER BY seq LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+        cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [self._to_post(row[1:]) for row in rows[:limit]], cursor
+
+    def count(
+        self,
+        status: StatusFilter = None,
+        platform: Optional[Union[SocialPlatform, str]] = None,
+        source_url: Optional[str] = None
+    ) -> int:
+        """
+        Count posts matching the filters.
+
+        Counts by status and platform are read from the trigger-maintained
+        count table; a source URL filter counts the matching index entries.
+        """
+        if source_url is not None:
+            where, params = _filters(status, platform, source_url)
+            query = f"SELECT COUNT(*) FROM posts{where}"
+        else:
+            where, params = _filters(status, platform)
+            query = f"SELECT COALESCE(SUM(n), 0) FROM post_counts{where}"
+        with self._lock:
+            return self._db.execute(query, params).fetchone()[0]
+
+    def status_counts(self, platform: Optional[Union[SocialPlatform, str]] = None) -> Dict[PostStatus, int]:
+        """Return the number of posts per status, optionally for one platform."""
+        where, params = _filters(platform=platform)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT status, SUM(n) FROM post_counts{where} GROUP BY status", params
+            ).fetchall()
+        return {_STATUSES[status]: n for status, n in rows if n}
+
+    def published_since(self, since: float, platform: Optional[str] = None) -> Iterator[GeneratedPost]:
+        """
+        Yield posts published at or after a time, oldest first.
+
+        Args:
+            since: Unix time; only posts with this or a later ``published_at`` are returned
+            platform: Optional platform filter
+        """
+        query = f"SELECT {_COLUMNS} FROM posts WHERE published_at >= ?"
+        params: tuple = (since,)
+        if platform is not None:
+            query += " AND platform = ?"
+            params += (getattr(platform, "value", platform),)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY published_at", params).fetchall()
+        for row in rows:
+            yield self._to_post(row)
+
+    def clear(self, include_published: bool = True):
+        """Delete all posts, or only those not yet published."""
+        query = "DELETE FROM posts" if include_published else "DELETE FROM posts WHERE published_at IS NULL"
+        with self._lock:
+            self._db.execute(query)
+            self._db.commit()
+        self._emit(CLEARED, None)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+# Global post store
+post_store = PostStore(events=post_events)
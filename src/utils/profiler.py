@@ -0,0 +1,239 @@
+"""Runtime profiling: sampled stacks as folded text and event-loop slow-callback monitoring."""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.config import settings
+from src.utils.callback_hook import callback_hook
+from src.utils.metrics import metrics
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads from a background thread.
+
+    Stacks are folded ("root;caller;callee count" lines), the input format of
+    flamegraph.pl, speedscope and most other flamegraph viewers.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        """Start sampling."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def folded(self) -> str:
+        """Return the sampled stacks in folded format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def describe_handle(handle: asyncio.Handle) -> str:
+    """Describe an event-loop callback, naming the task and coroutine for task steps."""
+    callback = getattr(handle, "_callback", None)
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        return f"task {task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+    return repr(handle)
+
+
+class SlowCallbackMonitor:
+    """
+    Records event-loop callbacks that run longer than a threshold.
+
+    A callback that runs long blocks every other task on the loop, e.g. a
+    blocking SDK or file call made directly from a coroutine. While started,
+    the monitor is registered on the shared callback hook.
+    """
+
+    def __init__(self, threshold: float, max_records: int = 1000):
+        """
+        Initialize the monitor.
+
+        Args:
+            threshold: Seconds a callback may run before it is recorded
+            max_records: Number of slow callbacks kept
+        """
+        self.threshold = threshold
+        self.records: deque = deque(maxlen=max_records)
+
+    def start(self):
+        """Start timing event-loop callbacks."""
+        callback_hook.add(self)
+
+    def callback_started(self, handle: asyncio.Handle, started: float):
+        pass
+
+    def callback_finished(self, handle: asyncio.Handle, started: float, elapsed: float):
+        if elapsed >= self.threshold:
+            self.record(handle, elapsed)
+
+    def record(self, handle: asyncio.Handle, elapsed: float):
+        """Record a slow callback."""
+        metrics.observe("event_loop_slow_callback_seconds", elapsed)
+        self.records.append({
+            "at": time.time(),
+            "duration_ms": round(elapsed * 1000, 1),
+            "callback": describe_handle(handle),
+        })
+
+    def stop(self):
+        """Stop timing callbacks."""
+        callback_hook.remove(self)
+
+
+def task_snapshot(limit: int = 50) -> Dict[str, Any]:
+    """
+    Summarize the tasks of the running event loop.
+
+    Returns:
+        The number of tasks and the most common awaiting locations
+    """
+    locations = Counter()
+    tasks = asyncio.all_tasks()
+    for task in tasks:
+        frames = task.get_stack(limit=1)
+        coro = task.get_coro()
+        where = _frame_label(frames[-1].f_code) if frames else getattr(coro, "__qualname__", repr(coro))
+        locations[where] += 1
+    return {"count": len(tasks), "awaiting": dict(locations.most_common(limit))}
+
+
+class ProfilingSession:
+    """
+    A time-boxed profiling run started at runtime.
+
+    Runs the sampling profiler and, optionally, the slow-callback monitor
+    until stopped or until the window ends. Only one session runs at a time;
+    the last finished session's results stay available.
+    """
+
+    def __init__(self):
+        """Initialize an idle session."""
+        self.profiler: Optional[SamplingProfiler] = None
+        self.monitor: Optional[SlowCallbackMonitor] = None
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self.tasks: Optional[Dict[str, Any]] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None and self.stopped_at is None
+
+    def start(
+        self,
+        seconds: Optional[float] = None,
+        interval_ms: Optional[float] = None,
+        slow_callback_ms: Optional[float] = None
+    ):
+        """
+        Start profiling for a time window.
+
+        Args:
+            seconds: Window length, capped at ``profiling_max_seconds``
+            interval_ms: Milliseconds between stack samples
+            slow_callback_ms: Report event-loop callbacks slower than this; 0 disables the monitor
+
+        Raises:
+            RuntimeError: If a session is already running
+        """
+        if self.running:
+            raise RuntimeError("A profiling session is already running")
+        seconds = min(seconds or settings.profiling_max_seconds, settings.profiling_max_seconds)
+        interval_ms = interval_ms or settings.profiling_interval_ms
+        slow_callback_ms = settings.profiling_slow_callback_ms if slow_callback_ms is None else slow_callback_ms
+
+        self.profiler = SamplingProfiler(interval=interval_ms / 1000)
+        self.monitor = SlowCallbackMonitor(slow_callback_ms / 1000) if slow_callback_ms > 0 else None
+        self.started_at, self.stopped_at, self.tasks = time.time(), None, None
+        self.profiler.start()
+        if self.monitor is not None:
+            self.monitor.start()
+        self._timer = asyncio.get_running_loop().call_later(seconds, self.stop)
+
+    def stop(self):
+        """Stop profiling; does nothing if no session is running."""
+        if not self.running:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self.profiler.stop()
+        if self.monitor is not None:
+            self.monitor.stop()
+        try:
+            self.tasks = task_snapshot()
+        except RuntimeError:
+            self.tasks = None
+        self.stopped_at = time.time()
+
+    def folded(self) -> str:
+        """Return the sampled stacks of the current or last session in folded format."""
+        return self.profiler.folded() if self.profiler is not None else ""
+
+    def summary(self, top: int = 20) -> Dict[str, Any]:
+        """Summarize the current or last session."""
+        if self.profiler is None:
+            return {"running": False}
+        end = self.stopped_at or time.time()
+        return {
+            "running": self.running,
+            "started_at": self.started_at,
+            "duration_seconds": round(end - self.started_at, 3),
+            "samples": self.profiler.samples,
+            "top_stacks": [
+                {"stack": stack.rsplit(";", 3)[-3:], "samples": count}
+                for stack, count in self.profiler.stacks.most_common(top)
+            ],
+            "slow_callbacks": list(self.monitor.records) if self.monitor is not None else [],
+            "tasks": self.tasks,
+        }
+
+
+# Global profiling session
+profiling_session = ProfilingSession()
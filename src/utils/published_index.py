@@ -0,0 +1,199 @@
+"""Index of recently published posts used to block near-duplicate publishing."""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+from src.config import settings
+from src.agents.types import GeneratedPost, PostStatus
+from src.utils.dedup import MinHashLSH, minhash
+from src.utils.metrics import metrics
+from src.utils.post_store import PostStore, post_store
+
+
+@dataclass
+class PublishedMatch:
+    """A published post similar to a candidate post."""
+    post_id: str
+    similarity: float
+    published_at: float
+
+
+class PublishedPostIndex:
+    """
+    MinHash index of posts published within a time window, per platform.
+
+    The index is loaded from the post store on first use, covering only the
+    window, and afterwards kept current by ``add`` and by ``sync``, which
+    reads just the posts published since the last sync. Entries older than
+    the window are evicted as new posts arrive.
+    """
+
+    def __init__(
+        self,
+        store: Optional[PostStore] = None,
+        window_hours: Optional[float] = None,
+        threshold: Optional[float] = None
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            store: Post store to load published posts from
+            window_hours: How far back a published post counts as a duplicate
+            threshold: Minimum estimated Jaccard similarity of a duplicate
+        """
+        self.store = store if store is not None else post_store
+        self.window = (window_hours or settings.published_duplicate_window_hours) * 3600
+        self.threshold = threshold or settings.published_duplicate_threshold
+        self._indexes: Dict[str, MinHashLSH] = {}
+        self._expiry: Dict[str, Deque[Tuple[float, str]]] = {}
+        self._published_at: Dict[str, float] = {}
+        self._watermark: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _index(self, platform: str) -> MinHashLSH:
+        if platform not in self._indexes:
+            self._indexes[platform] = MinHashLSH(threshold=self.threshold)
+            self._expiry[platform] = deque()
+        return self._indexes[platform]
+
+    def _evict(self, platform: str, now: float):
+        expiry = self._expiry.get(platform)
+        while expiry and expiry[0][0] < now - self.window:
+            _, post_id = expiry.popleft()
+            self._indexes[platform].remove(post_id)
+            self._published_at.pop(post_id, None)
+
+    def _add(self, post_id: str, platform: str, content: str, published_at: float):
+        if post_id in self._published_at:
+            return
+        self._index(platform).add(post_id, minhash(content))
+        self._published_at[post_id] = published_at
+        self._expiry[platform].append((published_at, post_id))
+        self._watermark = max(self._watermark or 0.0, published_at)
+
+    def sync(self, now: Optional[float] = None) -> int:
+        """
+        Load posts published since the last sync (or within the window on first sync).
+
+        Returns:
+            Number of posts added
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            since = self._watermark if self._watermark is not None else now - self.window
+            added = 0
+            for post in self.store.published_since(since):
+                if post.id not in self._published_at:
+                    self._add(post.id, post.platform.value, post.content, post.published_at)
+                    added += 1
+            if self._watermark is None:
+                self._watermark = since
+            return added
+
+    def add(self, post_id: str, platform: str, content: str, published_at: Optional[float] = None):
+        """Index a post that has just been published."""
+        with self._lock:
+            published_at = time.time() if published_at is None else published_at
+            self._add(post_id, platform, content, published_at)
+            self._evict(platform, published_at)
+
+    def find(
+        self,
+        platform: str,
+        content: str,
+        exclude: Optional[str] = None,
+        now: Optional[float] = None
+    ) -> Optional[PublishedMatch]:
+        """
+        Return the most similar post published on a platform within the window.
+
+        Args:
+            platform: Platform of the candidate post
+            content: Text of the candidate post
+            exclude: Post id to ignore (the candidate itself)
+            now: Unix time the window ends at
+
+        Returns:
+            The closest match at or above the threshold, or None
+        """
+        now = time.time() if now is None else now
+        if self._watermark is None:
+            self.sync(now)
+        started = time.perf_counter()
+        with self._lock:
+            self._evict(platform, now)
+            matches = [
+                match for match in self._index(platform).query(minhash(content))
+                if match.key != exclude
+            ]
+        metrics.observe("published_duplicate_lookup_seconds", time.perf_counter() - started)
+        if not matches:
+            return None
+        best = matches[0]
+        return PublishedMatch(
+            post_id=best.key,
+            similarity=best.similarity,
+            published_at=self._published_at[best.key]
+        )
+
+
+# Global index of published posts
+published_index = PublishedPostIndex()
+
+
+def find_published_duplicate(
+    platform: str,
+    content: str,
+    exclude: Optional[str] = None
+) -> Optional[PublishedMatch]:
+    """
+    Check a post against recently published posts on its platform.
+
+    Returns None when duplicate checks are turned off.
+
+    Args:
+        platform: Platform of the post
+        content: Text of the post
+        exclude: Store id of the post itself
+
+    Returns:
+        The closest published near duplicate, or None
+    """
+    if settings.published_duplicate_action == "off":
+        return None
+    match = published_index.find(platform, content, exclude=exclude)
+    if match is not None:
+        metrics.incr("published_duplicates_total", platform=platform, action=settings.published_duplicate_action)
+    return match
+
+
+def record_published(post: GeneratedPost) -> str:
+    """
+    Mark a post as published and record it in the post store and the published index.
+
+    Args:
+        post: The published post; it is added to the store unless already stored
+
+    Returns:
+        The store id of the post
+    """
+    post.status = PostStatus.PUBLISHED
+    post.published_at = time.time()
+    post_id = post_store.save(post)
+    published_index.add(post_id, post.platform.value, post.content, post.published_at)
+    return post_id
+
+
+def record_failed(post: GeneratedPost):
+    """
+    Mark a post as failed to publish, saving the status if the post is stored.
+
+    Args:
+        post: The post that could not be published
+    """
+    post.status = PostStatus.FAILED
+    if post.id is not None and post.id in post_store:
+        post_store.save(post)
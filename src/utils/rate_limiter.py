@@ -0,0 +1,226 @@
+"""Process-wide adaptive concurrency and rate limiting for LLM calls."""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+from src.config import settings
+from src.utils.metrics import metrics
+
+
+def estimate_tokens(*texts: str) -> int:
+    """
+    Roughly estimate the token count of some text (about four characters per token).
+
+    Args:
+        texts: The texts that will be sent
+
+    Returns:
+        Estimated token count
+    """
+    return sum(len(text) for text in texts) // 4 + 1
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Return True if an upstream error is an HTTP 429 rate-limit response."""
+    return getattr(error, "status_code", None) == 429
+
+
+class AdaptiveLimiter:
+    """
+    Limits concurrent calls and requests/tokens per minute, adapting concurrency with AIMD.
+
+    Callers are admitted strictly in arrival order. A call is admitted when
+    there is a free concurrency slot and the sliding window still has room for
+    one more request and its estimated tokens. The concurrency limit grows by
+    roughly one slot per window of successful calls and is cut multiplicatively
+    on rate-limit errors or when latency exceeds the target.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        latency_target: float = 20.0,
+        decrease_factor: float = 0.5,
+        window_seconds: float = 60.0
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Name used to label the limiter's metrics
+            requests_per_minute: Maximum requests started per window
+            tokens_per_minute: Maximum estimated tokens started per window
+            max_concurrency: Upper bound of the adaptive concurrency limit
+            min_concurrency: Lower bound of the adaptive concurrency limit
+            latency_target: Call latency (seconds) above which concurrency is reduced
+            decrease_factor: Multiplier applied to the limit on congestion
+            window_seconds: Length of the rate window (60 for per-minute budgets)
+        """
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.window_seconds = window_seconds
+
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self._waiters = deque()
+        self._window = deque()
+        self._window_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of callers waiting to be admitted."""
+        return sum(1 for future, _ in self._waiters if not future.done())
+
+    @asynccontextmanager
+    async def acquire(self, estimated_tokens: int = 0):
+        """
+        Wait for a slot, run the wrapped call and feed its outcome back.
+
+        Args:
+            estimated_tokens: Estimated tokens the call will consume
+        """
+        queued_at = time.monotonic()
+        await self._wait_turn(estimated_tokens)
+        started_at = time.monotonic()
+        metrics.observe("llm_limiter_wait_seconds", started_at - queued_at, limiter=self.name)
+
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self.on_rate_limited()
+            raise
+        else:
+            self.on_success(time.monotonic() - started_at)
+        finally:
+            self._release()
+
+    def on_success(self, latency: float):
+        """Additively increase the limit, or back off if the call was too slow."""
+        if latency > self.latency_target:
+            self._decrease()
+        else:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        self._publish()
+
+    def on_rate_limited(self):
+        """Multiplicatively decrease the limit after a 429 response."""
+        metrics.incr("llm_limiter_rate_limited_total", limiter=self.name)
+        self._decrease()
+        self._publish()
+
+    def _decrease(self):
+        self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+
+    async def _wait_turn(self, tokens: int):
+        if not self._waiters and self._admission_delay(tokens, time.monotonic()) == 0:
+            self._admit(tokens, time.monotonic())
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((future, tokens))
+        self._publish()
+        self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller was cancelled; give the slot back.
+                self._release()
+            else:
+                self._wake()
+            raise
+
+    def _admission_delay(self, tokens: int, now: float) -> Optional[float]:
+        """
+        Return 0 if a call can start now, the seconds until the window has room,
+        or None if it must wait for a concurrency slot.
+        """
+        if self.in_flight >= max(self.min_concurrency, int(self.limit)):
+            return None
+
+        self._prune(now)
+        if not self._window:
+            return 0
+        over_requests = len(self._window) >= self.requests_per_minute
+        over_tokens = self._window_tokens + tokens > self.tokens_per_minute
+        if not over_requests and not over_tokens:
+            return 0
+
+        # Wait until enough of the window has expired to fit this call
+        needed_tokens = self._window_tokens + tokens - self.tokens_per_minute
+        freed_tokens = 0
+        for index, (started, started_tokens) in enumerate(self._window):
+            freed_tokens += started_tokens
+            if len(self._window) - index - 1 < self.requests_per_minute and freed_tokens >= needed_tokens:
+                return max(0.0, started + self.window_seconds - now)
+        return max(0.0, self._window[-1][0] + self.window_seconds - now)
+
+    def _admit(self, tokens: int, now: float):
+        self.in_flight += 1
+        self._window.append((now, tokens))
+        self._window_tokens += tokens
+        self._publish()
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _prune(self, now: float):
+        while self._window and self._window[0][0] <= now - self.window_seconds:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+
+    def _wake(self):
+        """Admit waiters from the head of the queue while capacity allows."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiters:
+            future, tokens = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+
+            now = time.monotonic()
+            delay = self._admission_delay(tokens, now)
+            if delay is None:
+                break
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+                break
+
+            self._waiters.popleft()
+            self._admit(tokens, now)
+            future.set_result(None)
+
+        self._publish()
+
+    def _publish(self):
+        metrics.set_gauge("llm_limiter_queue_depth", self.queue_depth, limiter=self.name)
+        metrics.set_gauge("llm_limiter_in_flight", self.in_flight, limiter=self.name)
+        metrics.set_gauge("llm_limiter_concurrency_limit", self.limit, limiter=self.name)
+
+
+# Process-wide limiter shared by all LLM calls
+llm_limiter = AdaptiveLimiter(
+    name="anthropic",
+    requests_per_minute=settings.llm_requests_per_minute,
+    tokens_per_minute=settings.llm_tokens_per_minute,
+    max_concurrency=settings.llm_max_concurrency,
+    min_concurrency=settings.llm_min_concurrency,
+    latency_target=settings.llm_latency_target_seconds
+)
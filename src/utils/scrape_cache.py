@@ -0,0 +1,134 @@
+"""Cache of scraped pages with HTTP validators and content-hash keyed outputs."""
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from src.config import settings
+
+
+def content_hash(content: str) -> str:
+    """Return the SHA-256 hex digest of scraped content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A cached scrape result (without its document text) and the validators needed to revalidate it."""
+    url: str
+    result: Dict[str, Any]
+    content_hash: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    expires_at: float = 0.0
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """Return True if the entry can be used without revalidation."""
+        return (now if now is not None else time.monotonic()) < self.expires_at
+
+
+class ScrapeCache:
+    """
+    LRU cache of scrape results keyed by URL, plus downstream outputs keyed by content hash.
+
+    Entries keep the scrape result without its ``content``; the document is
+    kept once in the content store under ``content_hash``. Outputs
+    (condensed content, generated posts) are stored per content hash, so a
+    page that is re-fetched with an unchanged body reuses them directly.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a scrape result is used without revalidation
+            max_entries: Maximum number of URLs and of content hashes kept
+        """
+        self.ttl = settings.scrape_cache_ttl_seconds if ttl is None else ttl
+        self.max_entries = max_entries or settings.scrape_cache_max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._outputs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the entry for a URL, fresh or expired."""
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(
+        self,
+        url: str,
+        result: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> CacheEntry:
+        """
+        Store a freshly scraped result, dropping its document text.
+
+        Args:
+            url: The scraped URL
+            result: The scrape result, with its ``content_hash``
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+
+        Returns:
+            The new cache entry
+        """
+        entry = CacheEntry(
+            url=url,
+            result={key: value for key, value in result.items() if key != "content"},
+            content_hash=result["content_hash"],
+            etag=etag,
+            last_modified=last_modified,
+            expires_at=time.monotonic() + self.ttl
+        )
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def discard(self, url: str):
+        """Drop the entry of a URL, if any."""
+        self._entries.pop(url, None)
+
+    def refresh(self, url: str) -> Optional[CacheEntry]:
+        """Extend the lifetime of an entry after a successful revalidation."""
+        entry = self.get(url)
+        if entry is not None:
+            entry.expires_at = time.monotonic() + self.ttl
+        return entry
+
+    def get_output(self, content_hash: str, key: str) -> Optional[Any]:
+        """Return a stored downstream output for a content hash."""
+        outputs = self._outputs.get(content_hash)
+        if outputs is None:
+            return None
+        self._outputs.move_to_end(content_hash)
+        return outputs.get(key)
+
+    def store_output(self, content_hash: str, key: str, value: Any):
+        """Store a downstream output (e.g. condensed content or a post) for a content hash."""
+        outputs = self._outputs.setdefault(content_hash, {})
+        outputs[key] = value
+        self._outputs.move_to_end(content_hash)
+        while len(self._outputs) > self.max_entries:
+            self._outputs.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results and outputs."""
+        self._entries.clear()
+        self._outputs.clear()
@@ -0,0 +1,229 @@
+"""Scrape engines used by the content scraper."""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+import httpx
+from firecrawl import FirecrawlApp
+from src.config import settings
+from src.utils.hedging import create_hedging_policy
+from src.utils.html_extract import extract_article
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+class ScrapeError(Exception):
+    """Raised when an engine cannot produce content for a URL."""
+
+
+@dataclass(frozen=True)
+class ScrapeOptions:
+    """
+    Controls which formats are requested and kept, and how large a document may be.
+
+    ``markdown`` is always produced (it is the ``content`` of a result);
+    ``html`` is only requested and kept in results when listed in ``formats``.
+    Documents larger than ``max_document_bytes`` are truncated.
+    """
+    formats: Tuple[str, ...] = field(default_factory=lambda: tuple(settings.scrape_formats))
+    max_document_bytes: int = field(default_factory=lambda: settings.scrape_max_document_bytes)
+
+    @property
+    def retain_html(self) -> bool:
+        """Whether raw HTML is kept in results."""
+        return "html" in self.formats
+
+
+def truncate_text(text: str, max_bytes: int) -> Tuple[str, bool]:
+    """
+    Truncate text to at most ``max_bytes`` of UTF-8 without splitting a character.
+
+    Returns:
+        The (possibly) truncated text and whether it was truncated
+    """
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text, False
+    return encoded[:max_bytes].decode("utf-8", errors="ignore"), True
+
+
+def build_result(
+    url: str,
+    markdown: str,
+    title: str,
+    description: str,
+    html: Optional[str],
+    options: ScrapeOptions,
+    truncated: bool = False
+) -> Dict[str, Any]:
+    """Build a scrape result dictionary, keeping only the requested formats."""
+    markdown, markdown_truncated = truncate_text(markdown, options.max_document_bytes)
+    result = {
+        "content": markdown,
+        "metadata": {
+            "title": title,
+            "description": description,
+            "url": url,
+        },
+        "title": title,
+        "description": description,
+    }
+    if options.retain_html:
+        result["html"] = html or ""
+    if truncated or markdown_truncated:
+        result["metadata"]["truncated"] = True
+    return result
+
+
+class FirecrawlEngine:
+    """Scrapes pages through the FireCrawl API."""
+
+    name = "firecrawl"
+
+    def __init__(self, app: Optional[FirecrawlApp] = None):
+        """Initialize the engine with a FireCrawl client."""
+        self.app = app or FirecrawlApp(
+            api_key=settings.firecrawl_api_key,
+            api_url=settings.firecrawl_api_url
+        )
+        self.hedging = create_hedging_policy("firecrawl")
+
+    async def scrape(
+        self,
+        url: str,
+        validators: Optional[Dict[str, str]] = None,
+        options: Optional[ScrapeOptions] = None
+    ) -> Dict[str, Any]:
+        """
+        Scrape a URL with FireCrawl.
+
+        FireCrawl has no conditional requests, so validators are ignored and
+        unchanged pages are detected by content hash instead.
+
+        Args:
+            url: The URL to scrape
+            validators: Conditional request headers (unused)
+            options: Formats to request and the maximum document size
+
+        Returns:
+            Dictionary containing scraped content
+        """
+        options = options or ScrapeOptions()
+        formats = ["markdown", *[fmt for fmt in options.formats if fmt != "markdown"]]
+
+        # The SDK call is blocking, so run it off the event loop; slow
+        # calls may be hedged with a duplicate request.
+        result = await self.hedging.run(
+            lambda: asyncio.to_thread(self.app.scrape, url, formats=formats)
+        )
+
+        # Convert FireCrawl Document object to dictionary
+        return build_result(
+            url,
+            markdown=result.markdown or "",
+            title=result.metadata.title if result.metadata else "",
+            description=result.metadata.description if result.metadata else "",
+            html=result.html if options.retain_html else None,
+            options=options
+        )
+
+
+class LocalEngine:
+    """Fetches pages with a pooled HTTP client and extracts markdown locally."""
+
+    name = "local"
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            client: Optional HTTP client; by default a pooled client is created on first use
+        """
+        self._client = client
+        self._extract_slots = asyncio.Semaphore(settings.scrape_extract_concurrency)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client shared by all local scrapes."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                follow_redirects=True,
+                timeout=settings.scrape_timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.scrape_max_connections,
+                    max_keepalive_connections=settings.scrape_max_connections
+                ),
+                headers={"User-Agent": settings.scrape_user_agent}
+            )
+        return self._client
+
+    async def scrape(
+        self,
+        url: str,
+        validators: Optional[Dict[str, str]] = None,
+        options: Optional[ScrapeOptions] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch a URL and extract its main content as markdown.
+
+        The body is streamed and reading stops at ``max_document_bytes``, so
+        oversized pages never sit in memory in full.
+
+        Args:
+            url: The URL to scrape
+            validators: Conditional request headers (If-None-Match, If-Modified-Since)
+            options: Formats to keep and the maximum document size
+
+        Returns:
+            Dictionary containing scraped content and the response validators,
+            or ``{"not_modified": True}`` if the server answered 304
+        """
+        options = options or ScrapeOptions()
+
+        async with self.client.stream("GET", url, headers=validators or None) as response:
+            if response.status_code == 304:
+                return {"not_modified": True}
+            response.raise_for_status()
+
+            content_type = response.headers.get("content-type", "")
+            if not content_type.startswith(HTML_CONTENT_TYPES):
+                raise ScrapeError(f"Unsupported content type for {url}: {content_type}")
+
+            chunks = []
+            size = 0
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                if size + len(chunk) > options.max_document_bytes:
+                    chunks.append(chunk[:options.max_document_bytes - size])
+                    truncated = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+
+            html = b"".join(chunks).decode(response.encoding or "utf-8", errors="ignore")
+            del chunks
+            headers = response.headers
+            final_url = str(response.url)
+
+        # Parsing is CPU-bound: keep it off the event loop, and bound how many
+        # parse trees are alive at once since they dominate peak memory
+        async with self._extract_slots:
+            article = await asyncio.to_thread(extract_article, html, final_url)
+        result = build_result(
+            url,
+            markdown=article["markdown"],
+            title=article["title"],
+            description=article["description"],
+            html=html if options.retain_html else None,
+            options=options,
+            truncated=truncated
+        )
+        result["etag"] = headers.get("etag")
+        result["last_modified"] = headers.get("last-modified")
+        return result
+
+    async def aclose(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
@@ -1,43 +1,218 @@
 """Web scraping utilities for extracting content from URLs."""
 
-import httpx
-from typing import Optional, Dict, Any
-from firecrawl import FirecrawlApp
+import asyncio
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlparse
 from src.config import settings
+from src.utils.metrics import metrics
+from src.utils.tracing import tracer
+from src.utils.content_store import ContentStore, content_store
+from src.utils.scrape_cache import CacheEntry, ScrapeCache
+from src.utils.scrape_engines import FirecrawlEngine, LocalEngine, ScrapeError, ScrapeOptions
+
+SCRAPE_STRATEGIES = ("single", "fallback", "race")
 
 
 class ContentScraper:
-    """Handles web scraping and content extraction using FireCrawl."""
+    """Handles web scraping and content extraction using FireCrawl or a local engine."""
 
-    def __init__(self):
-        """Initialize the scraper with FireCrawl API."""
-        self.firecrawl = FirecrawlApp(api_key=settings.firecrawl_api_key)
+    def __init__(
+        self,
+        engines: Optional[Dict[str, Any]] = None,
+        engine: Optional[str] = None,
+        strategy: Optional[str] = None,
+        domain_engines: Optional[Dict[str, str]] = None,
+        cache: Optional[ScrapeCache] = None,
+        options: Optional[ScrapeOptions] = None,
+        store: Optional[ContentStore] = None
+    ):
+        """
+        Initialize the scraper and its engines.
 
-    async def scrape_url(self, url: str) -> Optional[Dict[str, Any]]:
+        Args:
+            engines: Optional engines keyed by name (defaults to FireCrawl and local)
+            engine: Default primary engine name
+            strategy: How engines are combined: single, fallback or race
+            domain_engines: Primary engine overrides keyed by domain
+            cache: Optional cache of scrape results and their downstream outputs
+            options: Default formats and document size limit for scrapes
+            store: Content store the scraped documents are kept in
         """
-        Scrape content from a URL using FireCrawl.
+        self.engines = engines or {
+            FirecrawlEngine.name: FirecrawlEngine(),
+            LocalEngine.name: LocalEngine(),
+        }
+        self.engine = engine or settings.scrape_engine
+        self.strategy = strategy or settings.scrape_strategy
+        self.domain_engines = settings.scrape_domain_engines if domain_engines is None else domain_engines
+        self.cache = cache or ScrapeCache()
+        self.options = options or ScrapeOptions()
+        self.store = store or content_store
+
+        if self.strategy not in SCRAPE_STRATEGIES:
+            raise ValueError(f"Unknown scrape strategy: {self.strategy}")
+        for name in [self.engine, *self.domain_engines.values()]:
+            if name not in self.engines:
+                raise ValueError(f"Unknown scrape engine: {name}")
+
+    @property
+    def firecrawl(self):
+        """The FireCrawl client used by the FireCrawl engine."""
+        return self.engines[FirecrawlEngine.name].app
+
+    def select_engines(self, url: str) -> List[str]:
+        """
+        Resolve the engines to use for a URL, primary first.
+
+        A domain rule matches the host or any of its subdomains. With the
+        single strategy only the primary engine is used.
 
         Args:
             url: The URL to scrape
 
+        Returns:
+            Engine names in order of preference
+        """
+        host = (urlparse(url).hostname or "").lower()
+        primary = self.engine
+        for domain, name in self.domain_engines.items():
+            domain = domain.lower()
+            if host == domain or host.endswith(f".{domain}"):
+                primary = name
+                break
+
+        if self.strategy == "single":
+            return [primary]
+        return [primary, *[name for name in self.engines if name != primary]]
+
+    async def _run_engine(
+        self,
+        name: str,
+        url: str,
+        validators: Optional[Dict[str, str]],
+        options: ScrapeOptions
+    ) -> Dict[str, Any]:
+        try:
+            with tracer.span("scrape.engine", engine=name, conditional=bool(validators)):
+                result = await self.engines[name].scrape(url, validators=validators, options=options)
+                if not result.get("not_modified") and not result.get("content"):
+                    raise ScrapeError(f"{name} returned no content for {url}")
+        except Exception:
+            metrics.incr("scrape_engine_failures_total", engine=name)
+            raise
+        metrics.incr("scrape_engine_success_total", engine=name)
+        return result
+
+    async def _race(
+        self,
+        names: List[str],
+        url: str,
+        validators: Optional[Dict[str, str]],
+        options: ScrapeOptions
+    ) -> Dict[str, Any]:
+        tasks = [
+            asyncio.ensure_future(self._run_engine(name, url, validators, options))
+            for name in names
+        ]
+        error = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except Exception as e:
+                    error = e
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch(
+        self,
+        names: List[str],
+        url: str,
+        validators: Optional[Dict[str, str]],
+        options: ScrapeOptions
+    ) -> Dict[str, Any]:
+        if self.strategy == "race":
+            return await self._race(names, url, validators, options)
+
+        error = None
+        for name in names:
+            try:
+                return await self._run_engine(name, url, validators, options)
+            except Exception as e:
+                error = e
+        raise error
+
+    async def scrape_url(self, url: str, options: Optional[ScrapeOptions] = None) -> Optional[Dict[str, Any]]:
+        """
+        Scrape content from a URL using the configured engines.
+
+        Fresh cached results are reused. Expired ones are revalidated with a
+        conditional request (ETag / Last-Modified); on a 304 the cached result
+        is reused. The document text is kept once in the content store and
+        the cache holds only its hash, so reused results are read back from
+        the store. Every result carries a ``content_hash`` so callers can
+        reuse outputs derived from an unchanged body.
+
+        Args:
+            url: The URL to scrape
+            options: Formats and size limit for this scrape (defaults to the scraper's)
+
         Returns:
             Dictionary containing scraped content or None if scraping fails
         """
+        with tracer.span("scrape", url=url) as span:
+            result = await self._scrape_url(url, options or self.options, span)
+            span.set(ok=result is not None)
+            return result
+
+    async def _cached_result(self, entry: CacheEntry) -> Optional[Dict[str, Any]]:
+        """Rebuild a cached result with its document read from the content store."""
         try:
-            result = self.firecrawl.scrape(url)
-            
-            # Convert FireCrawl Document object to dictionary
-            return {
-                "content": result.markdown or "",
-                "html": result.html or "",
-                "metadata": {
-                    "title": result.metadata.title if result.metadata else "",
-                    "description": result.metadata.description if result.metadata else "",
-                    "url": url,
-                },
-                "title": result.metadata.title if result.metadata else "",
-                "description": result.metadata.description if result.metadata else "",
-            }
+            content = await asyncio.to_thread(self.store.get, entry.content_hash)
+        except KeyError:
+            return None
+        return {**entry.result, "content": content}
+
+    async def _scrape_url(self, url: str, options: ScrapeOptions, span) -> Optional[Dict[str, Any]]:
+        entry = self.cache.get(url)
+        if entry is not None and options.retain_html and "html" not in entry.result:
+            # Cached without HTML; fetch again in full
+            entry = None
+
+        if entry is not None and entry.is_fresh():
+            result = await self._cached_result(entry)
+            if result is not None:
+                metrics.incr("scrape_cache_hits_total")
+                span.set(cache="hit")
+                return result
+
+        try:
+            validators = entry.validators if entry is not None else None
+            result = await self._fetch(self.select_engines(url), url, validators, options)
+
+            if result.get("not_modified"):
+                if entry is None:
+                    raise ScrapeError(f"Unexpected 304 for uncached URL {url}")
+                cached = await self._cached_result(entry)
+                if cached is None:
+                    # The document was removed from the store; fetch it again in full
+                    self.cache.discard(url)
+                    return await self._scrape_url(url, options, span)
+                metrics.incr("scrape_not_modified_total")
+                span.set(cache="not_modified")
+                self.cache.refresh(url)
+                return cached
+
+            etag = result.pop("etag", None)
+            last_modified = result.pop("last_modified", None)
+            result["content_hash"] = await asyncio.to_thread(self.store.put, result["content"])
+            if entry is not None and entry.content_hash == result["content_hash"]:
+                metrics.incr("scrape_unchanged_total")
+
+            self.cache.put(url, result, etag=etag, last_modified=last_modified)
+            return result
         except Exception as e:
             print(f"Error scraping URL {url}: {str(e)}")
             return None
@@ -0,0 +1,180 @@
+"""Persistent index of URLs that have already been ingested."""
+
+import hashlib
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+from src.config import settings
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Bit positions come from double hashing of a single SHA-256 digest.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize an empty filter sized for ``capacity`` items.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+        """
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode("utf-8")).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str):
+        """Add an item to the filter."""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class SeenIndex:
+    """
+    Index of seen URLs backed by SQLite, with a Bloom filter in front.
+
+    Most URLs of a poll are either clearly new (not in the filter) or
+    already seen; only filter hits are confirmed against SQLite, so checking
+    a batch costs O(batch) regardless of how many URLs have been seen.
+
+    A new URL is recorded as pending until its ingest succeeds
+    (``mark_ingested``); pending URLs survive restarts and can be queued
+    again with ``pending``. A URL whose ingest failed is removed
+    (``forget``), so the next poll that lists it finds it new again; the
+    caller is given the URL's feed so it can make that poll a full fetch.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None
+    ):
+        """
+        Open (or create) the index and load its Bloom filter.
+
+        Args:
+            path: SQLite database path, or ":memory:"
+            capacity: Expected number of URLs, used to size the Bloom filter
+            error_rate: Bloom filter false positive rate at capacity
+        """
+        self.path = path or settings.feed_seen_db_path
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen_urls ("
+            "url TEXT PRIMARY KEY, source TEXT, first_seen REAL NOT NULL, ingested_at REAL)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(seen_urls)")}
+        if "ingested_at" not in columns:
+            # URLs recorded by earlier versions were ingested (or given up on) already
+            self._db.execute("ALTER TABLE seen_urls ADD COLUMN ingested_at REAL")
+            self._db.execute("UPDATE seen_urls SET ingested_at = first_seen")
+        self._db.commit()
+
+        self.bloom = BloomFilter(
+            capacity or settings.feed_bloom_capacity,
+            error_rate or settings.feed_bloom_error_rate
+        )
+        for (url,) in self._db.execute("SELECT url FROM seen_urls"):
+            self.bloom.add(url)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+
+    def __contains__(self, url: str) -> bool:
+        if url not in self.bloom:
+            return False
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM seen_urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def add_new(self, urls: Iterable[str], source: Optional[str] = None) -> List[str]:
+        """
+        Record a batch of URLs as pending and return those not seen before.
+
+        Args:
+            urls: Candidate URLs (duplicates are ignored)
+            source: Feed the URLs came from
+
+        Returns:
+            The new URLs, in input order
+        """
+        candidates = list(dict.fromkeys(urls))
+        maybe_seen = [url for url in candidates if url in self.bloom]
+
+        with self._lock:
+            confirmed = set()
+            for start in range(0, len(maybe_seen), 500):
+                chunk = maybe_seen[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                confirmed.update(
+                    url for (url,) in self._db.execute(
+                        f"SELECT url FROM seen_urls WHERE url IN ({placeholders})", chunk
+                    )
+                )
+
+            new = [url for url in candidates if url not in confirmed]
+            if new:
+                now = time.time()
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO seen_urls (url, source, first_seen) VALUES (?, ?, ?)",
+                    [(url, source, now) for url in new]
+                )
+                self._db.commit()
+        for url in new:
+            self.bloom.add(url)
+        return new
+
+    def mark_ingested(self, url: str):
+        """Record that a pending URL was ingested successfully."""
+        with self._lock:
+            self._db.execute("UPDATE seen_urls SET ingested_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+    def forget(self, url: str) -> Optional[str]:
+        """
+        Remove a URL, e.g. after a failed ingest, so it is reported as new again.
+
+        Returns:
+            The feed the URL came from, if it was recorded with one
+        """
+        with self._lock:
+            row = self._db.execute("SELECT source FROM seen_urls WHERE url = ?", (url,)).fetchone()
+            self._db.execute("DELETE FROM seen_urls WHERE url = ?", (url,))
+            self._db.commit()
+        return row[0] if row else None
+
+    def pending(self) -> List[str]:
+        """Return the URLs recorded but not yet ingested, oldest first."""
+        with self._lock:
+            return [
+                url for (url,) in self._db.execute(
+                    "SELECT url FROM seen_urls WHERE ingested_at IS NULL ORDER BY first_seen, rowid"
+                )
+            ]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,147 @@
+"""Compact msgpack serialization of graph state, checkpoints and stored post metadata."""
+
+import dataclasses
+from enum import Enum
+from typing import Any, Optional, Tuple
+import ormsgpack
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from src.config import settings
+from src.agents.types import GeneratedPost, PostStatus, PostStyle, SocialPlatform
+
+# Optional zstd compression of large text
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# msgpack extension type codes
+EXT_POST = 1
+EXT_ENUM = 2
+EXT_ZSTD_TEXT = 3
+
+# Enums encoded by index into this tuple; append only
+_ENUMS = (SocialPlatform, PostStatus, PostStyle)
+_ENUM_CODES = {enum: code for code, enum in enumerate(_ENUMS)}
+
+# GeneratedPost fields in positional order; payloads written with fewer
+# fields (before a field was appended) decode with the defaults
+_POST_FIELDS = tuple(field.name for field in dataclasses.fields(GeneratedPost))
+_CONTENT_INDEX = _POST_FIELDS.index("content")
+_MEDIA_URLS_INDEX = _POST_FIELDS.index("media_urls")
+
+_PACK_OPTIONS = (
+    ormsgpack.OPT_PASSTHROUGH_DATACLASS | ormsgpack.OPT_PASSTHROUGH_ENUM | ormsgpack.OPT_NON_STR_KEYS
+)
+
+
+class StateSerializer:
+    """
+    msgpack serializer for graph state and LangGraph checkpoints.
+
+    Posts are encoded as positional field arrays and the known enums as
+    (enum, value) pairs, both as msgpack extension types, so they decode to
+    ``GeneratedPost`` and enum members again. Text of at least
+    ``compress_min_bytes`` characters given directly or as a value of the
+    encoded dict (the scraped ``content`` of the state, a checkpoint channel)
+    or as a post's content is zstd-compressed.
+
+    Implements LangGraph's ``SerializerProtocol``; values msgpack cannot
+    encode are handed to LangGraph's default serializer.
+    """
+
+    type_name = "msgpack-state"
+
+    def __init__(
+        self,
+        compression: Optional[str] = None,
+        compress_min_bytes: Optional[int] = None,
+        level: Optional[int] = None
+    ):
+        """
+        Initialize the serializer.
+
+        Args:
+            compression: zstd or none
+            compress_min_bytes: Minimum text length that is compressed
+            level: zstd compression level
+        """
+        compression = compression or settings.serializer_compression
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            print("zstandard is not installed; serializing without compression")
+            compression = "none"
+        self.compression = compression
+        self.compress_min_bytes = compress_min_bytes or settings.serializer_compress_min_bytes
+        level = settings.serializer_zstd_level if level is None else level
+        self._compressor = zstandard.ZstdCompressor(level=level) if compression == "zstd" else None
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+        self.fallback = JsonPlusSerializer()
+
+    def _compact(self, value: Any) -> Any:
+        if self._compressor is not None and isinstance(value, str) and len(value) >= self.compress_min_bytes:
+            return ormsgpack.Ext(EXT_ZSTD_TEXT, self._compressor.compress(value.encode("utf-8")))
+        return value
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, GeneratedPost):
+            values = [getattr(obj, name) for name in _POST_FIELDS]
+            values[_CONTENT_INDEX] = self._compact(values[_CONTENT_INDEX])
+            return ormsgpack.Ext(EXT_POST, self._pack(values))
+        if isinstance(obj, Enum) and type(obj) in _ENUM_CODES:
+            return ormsgpack.Ext(EXT_ENUM, self._pack([_ENUM_CODES[type(obj)], obj.value]))
+        if isinstance(obj, Enum):
+            return obj.value
+        raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == EXT_POST:
+            values = self.loads(data)
+            if len(values) > _MEDIA_URLS_INDEX:
+                values[_MEDIA_URLS_INDEX] = tuple(values[_MEDIA_URLS_INDEX])
+            return GeneratedPost(*values)
+        if code == EXT_ENUM:
+            enum_code, value = self.loads(data)
+            return _ENUMS[enum_code](value)
+        if code == EXT_ZSTD_TEXT:
+            if self._decompressor is None:
+                raise ValueError("zstandard is required to decode compressed text")
+            return self._decompressor.decompress(data).decode("utf-8")
+        raise ValueError(f"Unknown msgpack extension type {code}")
+
+    def _pack(self, obj: Any) -> bytes:
+        return ormsgpack.packb(obj, default=self._default, option=_PACK_OPTIONS)
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode a value.
+
+        Raises:
+            TypeError: If the value contains types msgpack cannot encode
+        """
+        if isinstance(obj, dict):
+            obj = {key: self._compact(value) for key, value in obj.items()}
+        else:
+            obj = self._compact(obj)
+        return self._pack(obj)
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a value encoded by ``dumps``."""
+        return ormsgpack.unpackb(data, ext_hook=self._ext_hook)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        """Encode a checkpoint value, tagged with the serializer that encoded it."""
+        try:
+            return self.type_name, self.dumps(obj)
+        except TypeError:
+            return self.fallback.dumps_typed(obj)
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        """Decode a checkpoint value encoded by ``dumps_typed``."""
+        type_name, payload = data
+        if type_name == self.type_name:
+            return self.loads(payload)
+        return self.fallback.loads_typed(data)
+
+
+# Global serializer
+serializer = StateSerializer()
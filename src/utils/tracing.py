@@ -0,0 +1,289 @@
+"""Lightweight request tracing with spans kept in memory and optionally written as JSONL."""
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from src.config import settings
+
+# Span of the running code; copied into asyncio tasks and threads started
+# with asyncio.to_thread, so child spans find their parent across awaits
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed operation within a trace."""
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start: float
+    duration_ms: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attributes):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _ActiveSpan:
+    """Context manager that starts a span, makes it current and exports it when done."""
+
+    __slots__ = ("tracer", "span", "_token", "_started")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.span = Span(
+            trace_id=parent.trace_id if parent else f"{random.getrandbits(128):032x}",
+            span_id=f"{random.getrandbits(64):016x}",
+            parent_id=parent.span_id if parent else None,
+            name=name,
+            start=time.time(),
+            attributes=attributes
+        )
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        self._started = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        self.span.duration_ms = (time.perf_counter() - self._started) * 1000
+        if exc is not None:
+            self.span.status = "error"
+            self.span.error = f"{exc_type.__name__}: {exc}"
+        _current_span.reset(self._token)
+        self.tracer.export(self.span)
+        return False
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+class RingBufferExporter:
+    """Keeps the most recent spans in memory, grouped by trace."""
+
+    def __init__(self, max_spans: int):
+        """
+        Initialize the buffer.
+
+        Args:
+            max_spans: Maximum number of spans kept across all traces
+        """
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self._spans: deque = deque()
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+
+    def export(self, span: Span):
+        """Store a finished span, evicting the oldest when full."""
+        with self._lock:
+            self._spans.append(span)
+            self._traces.setdefault(span.trace_id, []).append(span)
+            while len(self._spans) > self.max_spans:
+                oldest = self._spans.popleft()
+                spans = self._traces.get(oldest.trace_id)
+                if spans:
+                    spans.remove(oldest)
+                    if not spans:
+                        del self._traces[oldest.trace_id]
+
+    def traces(self, limit: int = 50) -> List[List[Span]]:
+        """Return the spans of the most recent traces, newest first."""
+        with self._lock:
+            return [list(spans) for spans in reversed(list(self._traces.values())[-limit:])]
+
+    def trace(self, trace_id: str) -> List[Span]:
+        """Return the spans of a trace ordered by start time."""
+        with self._lock:
+            return sorted(self._traces.get(trace_id, []), key=lambda span: span.start)
+
+    def clear(self):
+        """Drop all spans."""
+        with self._lock:
+            self._spans.clear()
+            self._traces.clear()
+
+
+class JsonlExporter:
+    """Appends finished spans to a JSON Lines file, flushed when a trace's root span ends."""
+
+    def __init__(self, path: str):
+        """
+        Open the file for appending.
+
+        Args:
+            path: Path of the JSONL file
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span):
+        """Write a span as one JSON line."""
+        line = json.dumps(asdict(span), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            if span.parent_id is None:
+                self._file.flush()
+
+    def close(self):
+        """Flush and close the file."""
+        with self._lock:
+            self._file.close()
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the exporters.
+
+    While disabled, ``span`` returns a shared no-op context manager and
+    ``traced`` functions call straight through, so instrumentation costs a
+    flag check.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        buffer_size: Optional[int] = None,
+        jsonl_path: Optional[str] = None
+    ):
+        """
+        Initialize the tracer.
+
+        Args:
+            enabled: Record spans
+            buffer_size: Number of spans kept in memory for the debug view
+            jsonl_path: Optional JSONL file spans are also written to
+        """
+        self.enabled = settings.tracing_enabled if enabled is None else enabled
+        self.buffer = RingBufferExporter(buffer_size or settings.tracing_buffer_size)
+        self.exporters: List[Any] = [self.buffer]
+        jsonl_path = jsonl_path or settings.tracing_jsonl_path
+        if self.enabled and jsonl_path:
+            self.exporters.append(JsonlExporter(jsonl_path))
+
+    def span(self, name: str, **attributes):
+        """
+        Start a span as a child of the current span (or as a new trace).
+
+        Usable with ``with`` and ``async with``; yields the ``Span`` so
+        attributes can be added while it runs.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _ActiveSpan(self, name, attributes)
+
+    def export(self, span: Span):
+        """Hand a finished span to every exporter."""
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                print(f"Error exporting span {span.name}: {e}")
+
+
+def current_span() -> Optional[Span]:
+    """Return the span of the running code, if any."""
+    return _current_span.get()
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorate an async function to run in a span.
+
+    Args:
+        name: Span name
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return await fn(*args, **kwargs)
+            with _ActiveSpan(tracer, name, {}):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that runs each HTTP request in a root span.
+
+    The trace id is returned in the ``X-Trace-Id`` response header.
+    """
+
+    def __init__(self, app, exclude: tuple = ()):
+        """
+        Wrap an ASGI app.
+
+        Args:
+            app: The ASGI app
+            exclude: Path prefixes not traced (e.g. long-lived streams)
+        """
+        self.app = app
+        self.exclude = exclude
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled or scope["path"].startswith(self.exclude):
+            return await self.app(scope, receive, send)
+
+        with tracer.span(f"{scope['method']} {scope['path']}") as span:
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    span.set(status_code=message["status"])
+                    message["headers"] = [*message.get("headers", []), (b"x-trace-id", span.trace_id.encode())]
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace_id)
+
+
+def configure_langsmith():
+    """Export the LangSmith settings to the environment LangChain reads them from."""
+    if settings.langsmith_tracing_v2 and settings.langsmith_api_key:
+        os.environ.setdefault("LANGCHAIN_TRACING_V2", "true")
+        os.environ.setdefault("LANGCHAIN_API_KEY", settings.langsmith_api_key)
+
+
+configure_langsmith()
+
+# Global tracer
+tracer = Tracer()